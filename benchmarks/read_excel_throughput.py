@@ -0,0 +1,198 @@
+"""
+Benchmark suite of the whole read: loading the configuration and the workbook and validating all rows.
+
+The workbooks are generated with benchmarks/workbook_generator.py for every combination of the given sizes,
+orientations, dirty-data ratios and reading modes
+('normal', 'read_only' and 'xml', the xml engine). The rows are validated with validate_excel, so dirty rows are
+recorded instead of raised. For each run the phase durations of the plugin's ReadStats, the rows per second and the
+peak memory (tracemalloc, measured in a separate pass because tracing slows the read down) are recorded.
+
+The results are written as JSON together with the git commit, so runs of different commits can be compared:
+
+python -m benchmarks.read_excel_throughput --output before.json
+(check out another commit)
+python -m benchmarks.read_excel_throughput --output after.json --compare before.json
+
+row_based workbooks are limited to 16383 rows by Excel's column limit, larger sizes are skipped for them.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import openpyxl
+
+from benchmarks.workbook_generator import MAX_ROW_BASED_ROWS, generate_workbook, get_config
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.batch import WorkerPlugin
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.excel_validation_pattern import ExcelValidationPlugin
+
+# Results of runs with the same key are compared
+KEY_FIELDS = ('rows', 'columns', 'orientation', 'dirty_ratio', 'mode')
+
+
+def get_meta():
+    """
+    :return: Dictionary describing the code and the environment of the run
+    """
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                         cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'openpyxl': openpyxl.__version__,
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+# Arguments of validate_excel by reading mode
+MODES = {
+    'normal': {'read_only': False, 'engine': 'openpyxl'},
+    'read_only': {'read_only': True, 'engine': 'openpyxl'},
+    'xml': {'read_only': True, 'engine': 'xml'},
+}
+
+
+def read(plugin, config, path, mode):
+    """
+    Reads and validates a workbook.
+
+    :return: Tuple of the ReadStats and the ValidationReport
+    """
+    report = plugin.validate_excel(config, path, **MODES[mode])
+    return plugin.last_stats, report
+
+
+def measure_peak_memory(plugin, config, path, mode):
+    """
+    :return: The peak memory of a read in bytes, as traced by tracemalloc
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        read(plugin, config, path, mode)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(plugin, config, path, rows, mode, repeat, memory):
+    """
+    :return: Dictionary of the measurements of one workbook and mode. The fastest of the repeats is kept.
+    """
+    best_stats, report = None, None
+    for _ in range(repeat):
+        gc.collect()
+        stats, report = read(plugin, config, path, mode)
+        if best_stats is None or stats.duration < best_stats.duration:
+            best_stats = stats
+    return {
+        'durations': dict(best_stats.durations, total=best_stats.duration),
+        'rows_per_second': rows / best_stats.duration,
+        'valid_rows': len(report.data),
+        'error_count': report.error_count,
+        'stats': best_stats.as_dict(),
+        'peak_memory': measure_peak_memory(plugin, config, path, mode) if memory else None,
+    }
+
+
+def get_key(result):
+    return tuple(result[x] for x in KEY_FIELDS)
+
+
+def print_result(result, baseline=None):
+    line = '{rows:>8} x {columns:<3} {orientation:<13} dirty {dirty_ratio:<5} {mode:<10}'.format(**result)
+    if 'skipped' in result:
+        print(line + 'skipped: ' + result['skipped'])
+        return
+    durations = result['durations']
+    line += '{0:8.3f} s ({1}) {2:>10,.0f} rows/s'.format(
+        durations['total'], ', '.join('{0} {1:.3f}'.format(phase, duration) for phase, duration in durations.items()
+                                      if phase != 'total'), result['rows_per_second'])
+    if result['peak_memory'] is not None:
+        line += ' {0:9.1f} MiB'.format(result['peak_memory'] / 2 ** 20)
+    if baseline is not None and 'skipped' not in baseline:
+        line += '  speed x{0:.2f}'.format(result['rows_per_second'] / baseline['rows_per_second'])
+        if result['peak_memory'] and baseline['peak_memory']:
+            line += ', memory x{0:.2f}'.format(result['peak_memory'] / baseline['peak_memory'])
+    print(line)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--columns', type=int, default=6)
+    parser.add_argument('--orientation', nargs='+', default=['column_based', 'row_based'],
+                        choices=['column_based', 'row_based'])
+    parser.add_argument('--dirty', type=float, nargs='+', default=[0.0, 0.1], help='shares of rows with an error')
+    parser.add_argument('--mode', nargs='+', default=['normal', 'read_only', 'xml'], choices=list(MODES))
+    parser.add_argument('--repeat', type=int, default=1, help='number of timed reads, the fastest is kept')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip the tracemalloc pass')
+    parser.add_argument('--workbooks', help='directory to keep the generated workbooks in (reused when present)')
+    parser.add_argument('--output', help='path of the JSON results file')
+    parser.add_argument('--compare', help='path of a JSON results file to compare with')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=logging.ERROR)
+    plugin = ExcelValidationPlugin(WorkerPlugin('benchmark'))
+    plugin.collect_stats = True
+    baselines = {}
+    if args.compare:
+        with open(args.compare) as file_pointer:
+            baselines = {get_key(x): x for x in json.load(file_pointer)['results']}
+
+    temporary_directory = None
+    directory = args.workbooks
+    if directory is None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        directory = temporary_directory.name
+    elif not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    results = []
+    try:
+        for rows in args.rows:
+            for orientation in args.orientation:
+                for dirty_ratio in args.dirty:
+                    path = os.path.join(directory, 'benchmark_{0}_{1}_{2}_{3}.xlsx'.format(
+                        rows, args.columns, orientation, dirty_ratio))
+                    config = None
+                    for mode in args.mode:
+                        result = {'rows': rows, 'columns': args.columns, 'orientation': orientation,
+                                  'dirty_ratio': dirty_ratio, 'mode': mode}
+                        if orientation == 'row_based' and rows > MAX_ROW_BASED_ROWS:
+                            result['skipped'] = 'more rows than Excel columns'
+                        else:
+                            if config is None:
+                                # The workbooks are deterministic, so a kept workbook can be reused
+                                if os.path.exists(path):
+                                    config = get_config(args.columns, orientation)
+                                else:
+                                    config = generate_workbook(path, rows, args.columns, orientation, dirty_ratio)
+                            result.update(run(plugin, config, path, rows, mode, args.repeat, args.memory))
+                        print_result(result, baselines.get(get_key(result)))
+                        results.append(result)
+    finally:
+        if temporary_directory is not None:
+            temporary_directory.cleanup()
+
+    if args.output:
+        with open(args.output, 'w') as file_pointer:
+            json.dump({'meta': get_meta(), 'results': results}, file_pointer, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Micro-benchmark of the per cell validation.
+
+The rows of example/example.xlsx are repeated until 1M cells are reached. The cells are validated with the
+compiled column validators and with the if/elif chain on the raw data_type_config that read_excel used before.
+No workbook is loaded, only the validation is measured.
+
+Usage (from the package root): python -m benchmarks.validation_throughput [cell_count]
+"""
+import datetime
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+import openpyxl
+
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.sheet_readers import transform_coordinates
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.validators import compile_validator
+
+LOG = logging.getLogger('benchmark')
+EXAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example')
+
+
+def load_example(cell_count):
+    with open(os.path.join(EXAMPLE_PATH, 'config.json')) as file_pointer:
+        config = json.load(file_pointer)
+    worksheet = openpyxl.load_workbook(os.path.join(EXAMPLE_PATH, 'example.xlsx'), data_only=True).active
+    lines = list(worksheet.iter_rows(values_only=True))
+    headers, data = lines[0], lines[1:]
+    data_type_configs = {x['header']: x for x in config['data_type_config']}
+    row_count = cell_count // len(headers)
+    rows = [data[index % len(data)] for index in range(row_count)]
+    return [data_type_configs[header] for header in headers], rows
+
+
+def new_msg_queue():
+    return {
+        'fail_on_empty_cell': {'exceptions': [], 'logs': []},
+        'fail_on_type_error': {'exceptions': [], 'logs': []}
+    }
+
+
+def legacy_validate(config_header, value, cell_index_str, msg_queue):
+    """
+    The per cell checks as done inline by read_excel before the validators were compiled (messages shortened).
+    """
+    target = 'exceptions' if config_header['fail_on_type_error'] else 'logs'
+    if value is None:
+        msg_queue['fail_on_empty_cell']['exceptions' if config_header['fail_on_empty_cell'] else 'logs'].append(
+            u"The '{0}' in cell {1} is empty".format(config_header['header'], cell_index_str))
+    elif config_header['type']['base'] == 'automatic':
+        pass
+    elif config_header['type']['base'] == 'date':
+        if not isinstance(value, datetime.datetime):
+            msg_queue['fail_on_type_error'][target].append(u'type {0}'.format(cell_index_str))
+    elif config_header['type']['base'] == 'enum':
+        filtered_enum_values = []
+        if 'filter' in config_header['type']:
+            filtered_enum_values = config_header['type']['filter']['whitelist_values']
+        if not isinstance(value, str):
+            msg_queue['fail_on_type_error'][target].append(u'type {0}'.format(cell_index_str))
+        elif value not in config_header['type']['enum_values']:
+            msg_queue['fail_on_type_error'][target].append(u'enum {0}'.format(cell_index_str))
+        elif filtered_enum_values and value not in filtered_enum_values:
+            LOG.debug(u"The row {0} was excluded due to an exclude filter on cell {1} ({2} not in [{3}]).".format(
+                1, cell_index_str, value, ', '.join(filtered_enum_values)))
+            return value, True
+    elif config_header['type']['base'] == 'float':
+        if not isinstance(value, float):
+            msg_queue['fail_on_type_error'][target].append(u'type {0}'.format(cell_index_str))
+        else:
+            if 'minimum' in config_header['type']:
+                if value < config_header['type']['minimum']:
+                    msg_queue['fail_on_type_error'][target].append(u'minimum {0}'.format(cell_index_str))
+            if 'maximum' in config_header['type']:
+                if value > config_header['type']['maximum']:
+                    msg_queue['fail_on_type_error'][target].append(u'maximum {0}'.format(cell_index_str))
+    elif config_header['type']['base'] == 'integer':
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, int):
+            if 'minimum' in config_header['type']:
+                if value < config_header['type']['minimum']:
+                    msg_queue['fail_on_type_error'][target].append(u'minimum {0}'.format(cell_index_str))
+            if 'maximum' in config_header['type']:
+                if value > config_header['type']['maximum']:
+                    msg_queue['fail_on_type_error'][target].append(u'maximum {0}'.format(cell_index_str))
+        else:
+            msg_queue['fail_on_type_error'][target].append(u'type {0}'.format(cell_index_str))
+    elif config_header['type']['base'] == 'string':
+        if isinstance(value, (int, float)) and config_header['type'].get('convert_numbers', False):
+            value = str(value)
+        if not isinstance(value, str):
+            msg_queue['fail_on_type_error'][target].append(u'type {0}'.format(cell_index_str))
+        elif 'pattern' in config_header['type']:
+            if re.search(config_header['type']['pattern'], value) is None:
+                msg_queue['fail_on_type_error'][target].append(u'pattern {0}'.format(cell_index_str))
+    return value, False
+
+
+def run_legacy(data_type_configs, rows):
+    for row in rows:
+        msg_queue = new_msg_queue()
+        for column, (config_header, value) in enumerate(zip(data_type_configs, row), 1):
+            # The coordinate string was built for every cell
+            legacy_validate(config_header, value, transform_coordinates('column_based', 1, column), msg_queue)
+
+
+def run_compiled(data_type_configs, rows):
+    validators = [compile_validator(x, LOG.log, 'column_based') for x in data_type_configs]
+    errors = []
+    for row in rows:
+        for column, (validator, value) in enumerate(zip(validators, row), 1):
+            validator(value, 1, column, errors)
+        # The messages are only built if the errors are raised or logged
+        del errors[:]
+
+
+def main():
+    cell_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    data_type_configs, rows = load_example(cell_count)
+    cell_count = len(rows) * len(data_type_configs)
+    for name, function in (('if/elif chain', run_legacy), ('compiled validators', run_compiled)):
+        start = time.perf_counter()
+        function(data_type_configs, rows)
+        duration = time.perf_counter() - start
+        print('{0:<20} {1:>10} cells in {2:6.3f} s  {3:>12,.0f} cells/s'.format(name, cell_count, duration,
+                                                                                cell_count / duration))
+
+
+if __name__ == '__main__':
+    main()
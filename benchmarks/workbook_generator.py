@@ -0,0 +1,165 @@
+"""
+Deterministic generator of synthetic workbooks and their configurations for the benchmarks.
+
+The workbook has one column per header, the headers cycle through all base types. The same arguments always give
+the same workbook. Dirty rows contain exactly one cell which fails a check.
+
+Usage (from the package root):
+python -m benchmarks.workbook_generator <path.xlsx> [rows] [columns] [orientation] [dirty_ratio] [seed]
+"""
+import datetime
+import json
+import os
+import random
+import sys
+
+import openpyxl
+
+TYPE_BASES = ['date', 'enum', 'float', 'integer', 'string', 'automatic']
+ENUM_VALUES = ['ape', 'dog', 'cat']
+DATE_START = datetime.datetime(2000, 1, 1)
+
+# Excel worksheets have at most 16384 columns. row_based sheets store the rows in columns, the first holds the headers.
+MAX_ROW_BASED_ROWS = 16383
+
+
+def get_type_config(base):
+    """
+    :return: The 'type' entry of the data_type_config for a base type
+    """
+    type_config = {'base': base}
+    if base == 'enum':
+        type_config['enum_values'] = ENUM_VALUES
+    elif base in ('float', 'integer'):
+        type_config['minimum'] = 0
+        type_config['maximum'] = 1000
+    elif base == 'string':
+        type_config['pattern'] = '^Text [0-9]+$'
+    return type_config
+
+
+def get_headers(columns):
+    """
+    :return: List of (header, base type) tuples
+    """
+    return [('{0} {1}'.format(TYPE_BASES[index % len(TYPE_BASES)].capitalize(), index + 1),
+             TYPE_BASES[index % len(TYPE_BASES)]) for index in range(columns)]
+
+
+def get_config(columns=6, orientation='column_based'):
+    """
+    Returns the configuration of a generated workbook.
+
+    :param columns: The number of columns
+    :param orientation: column_based or row_based
+    :return: The configuration dictionary
+    """
+    def automatic_index():
+        # A new dictionary per entry, so changing one index config does not change the others
+        return {'first': 'automatic', 'last': 'automatic'}
+    return {
+        'sheet_config': 'first',
+        'orientation': orientation,
+        'headers_index_config': {'row_index': automatic_index(), 'column_index': automatic_index()},
+        'data_index_config': {'row_index': automatic_index(), 'column_index': automatic_index()},
+        'data_type_config': [{'header': header, 'type': get_type_config(base)}
+                             for header, base in get_headers(columns)],
+    }
+
+
+def get_value(base, generator):
+    if base == 'date':
+        return DATE_START + datetime.timedelta(days=generator.randrange(10000))
+    if base == 'enum':
+        return generator.choice(ENUM_VALUES)
+    if base == 'float':
+        return generator.uniform(0, 1000)
+    if base == 'integer':
+        return generator.randrange(1000)
+    if base == 'string':
+        return 'Text {0}'.format(generator.randrange(1000))
+    return generator.randrange(100)
+
+
+# A value failing the checks of each base type
+DIRTY_VALUES = {
+    'date': 'no date',
+    'enum': 'cow',
+    'float': -1.5,
+    'integer': 1.5,
+    'string': 'Other text',
+    'automatic': None,
+}
+
+
+def iter_rows(rows, columns=6, dirty_ratio=0.0, seed=0):
+    """
+    Yields the data rows as lists of values.
+
+    :param rows: The number of data rows
+    :param columns: The number of columns
+    :param dirty_ratio: The share of rows (0 to 1) with one failing cell
+    :param seed: The seed of the random values
+    """
+    generator = random.Random(seed)
+    bases = [base for header, base in get_headers(columns)]
+    for _ in range(rows):
+        values = [get_value(base, generator) for base in bases]
+        if generator.random() < dirty_ratio:
+            column = generator.randrange(columns)
+            values[column] = DIRTY_VALUES[bases[column]]
+        yield values
+
+
+def count_dirty_rows(rows, columns=6, dirty_ratio=0.0, seed=0):
+    """
+    :return: The number of dirty rows of a generated workbook
+    """
+    bases = [base for header, base in get_headers(columns)]
+    return sum(1 for values in iter_rows(rows, columns, dirty_ratio, seed)
+               if any(value is DIRTY_VALUES[base] for base, value in zip(bases, values)))
+
+
+def generate_workbook(path, rows, columns=6, orientation='column_based', dirty_ratio=0.0, seed=0):
+    """
+    Writes a synthetic workbook. column_based workbooks are streamed to the file, so any number of rows is possible.
+
+    :param path: The path of the workbook file
+    :param rows: The number of data rows
+    :param columns: The number of columns
+    :param orientation: column_based or row_based
+    :param dirty_ratio: The share of rows (0 to 1) with one failing cell
+    :param seed: The seed of the random values
+    :return: The configuration dictionary of the workbook
+    """
+    if orientation == 'row_based' and rows > MAX_ROW_BASED_ROWS:
+        raise ValueError('row_based workbooks can have at most {0} rows.'.format(MAX_ROW_BASED_ROWS))
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    headers = [header for header, base in get_headers(columns)]
+    if orientation == 'column_based':
+        worksheet.append(headers)
+        for values in iter_rows(rows, columns, dirty_ratio, seed):
+            worksheet.append(values)
+    else:
+        data = list(iter_rows(rows, columns, dirty_ratio, seed))
+        for index, header in enumerate(headers):
+            worksheet.append([header] + [values[index] for values in data])
+    workbook.save(path)
+    return get_config(columns, orientation)
+
+
+def main():
+    path = sys.argv[1]
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    columns = int(sys.argv[3]) if len(sys.argv) > 3 else len(TYPE_BASES)
+    orientation = sys.argv[4] if len(sys.argv) > 4 else 'column_based'
+    dirty_ratio = float(sys.argv[5]) if len(sys.argv) > 5 else 0.0
+    seed = int(sys.argv[6]) if len(sys.argv) > 6 else 0
+    config = generate_workbook(path, rows, columns, orientation, dirty_ratio, seed)
+    with open(os.path.splitext(path)[0] + '.json', 'w') as file_pointer:
+        json.dump(config, file_pointer, indent=4)
+
+
+if __name__ == '__main__':
+    main()
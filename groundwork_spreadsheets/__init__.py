@@ -1,7 +1,17 @@
 """
-Makes ExcelValidationPattern available for the package on root level
+Makes ExcelValidationPattern and its public helper classes available for the package on root level
 """
 # F401 imported but unused - it's needed as an API
 from .patterns.ExcelValidationPattern.excel_validation_pattern import ExcelValidationPattern  # noqa F401
+from .patterns.ExcelValidationPattern.config_cache import ConfigCache  # noqa F401
+from .patterns.ExcelValidationPattern.results import ColumnarResult, RecordResult  # noqa F401
+from .patterns.ExcelValidationPattern.batch import WorkbookError, WorkbookResult  # noqa F401
+from .patterns.ExcelValidationPattern.report import CellError, ValidationReport  # noqa F401
+from .patterns.ExcelValidationPattern.stats import ReadStats  # noqa F401
+from .patterns.ExcelValidationPattern.result_cache import ResultCache  # noqa F401
+from .patterns.ExcelValidationPattern.async_reader import AsyncReader  # noqa F401
+from .patterns.ExcelValidationPattern.sinks import JsonLinesSink, SqliteSink  # noqa F401
 # define importable objects
-__all__ = ['ExcelValidationPattern']
+__all__ = ['ExcelValidationPattern', 'ConfigCache', 'ColumnarResult', 'RecordResult', 'WorkbookError', 'WorkbookResult',
+           'CellError', 'ValidationReport', 'ReadStats', 'ResultCache', 'AsyncReader', 'JsonLinesSink',
+           'SqliteSink']
@@ -0,0 +1,128 @@
+"""
+Asyncio support of the Excel validation pattern: the blocking reads run in an executor
+"""
+import asyncio
+import concurrent.futures
+import threading
+import weakref
+
+# Number of rows handed over to the event loop at once by iter_excel_async
+DEFAULT_BATCH_SIZE = 1000
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor():
+    """
+    :return: The thread pool shared by all AsyncReaders without an own executor; it is created on first use
+    """
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix='excel_validation')
+        return _default_executor
+
+
+class ReadCancelled(Exception):
+    """
+    Raised in the executor to stop a read whose task was cancelled. It never reaches the caller, which gets the
+    asyncio.CancelledError of its task.
+    """
+
+
+def check_cancelled(rows, cancel_event):
+    """
+    Passes the rows through and stops the read as soon as cancel_event is set.
+
+    :param rows: Iterator of (row, values) tuples
+    :param cancel_event: threading.Event
+    """
+    for item in rows:
+        if cancel_event.is_set():
+            raise ReadCancelled()
+        yield item
+
+
+def next_batch(rows, batch_size):
+    """
+    :return: List of the next batch_size items of rows, an empty list at the end
+    """
+    batch = []
+    for item in rows:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            break
+    return batch
+
+
+class AsyncReader(object):
+    """
+    Runs the reads of read_excel_async and iter_excel_async in an executor, so the event loop is not blocked.
+    At most max_reads reads run at the same time per event loop; further reads wait until one has finished.
+
+    The executor must run the reads in threads of the current process, e.g. a ThreadPoolExecutor. Assign the same
+    AsyncReader to several plugins to share the limit.
+    """
+
+    def __init__(self, executor=None, max_reads=4):
+        """
+        :param executor: The concurrent.futures.Executor running the reads. If None, a thread pool shared by all
+                         AsyncReaders is used.
+        :param max_reads: The maximum number of concurrent reads
+        """
+        self.executor = executor
+        self.max_reads = max_reads
+        # asyncio semaphores must not be shared by event loops
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def limit(self):
+        """
+        :return: The asyncio.Semaphore of the current event loop, which limits the concurrent reads to max_reads
+        """
+        # get_event_loop returns the running loop in a coroutine (get_running_loop needs Python 3.7)
+        loop = asyncio.get_event_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_reads)
+        return semaphore
+
+    async def run(self, cancel_event, function, *args):
+        """
+        Calls a function in the executor. If the awaiting task is cancelled, cancel_event is set.
+
+        :param cancel_event: threading.Event checked by the function
+        :return: The return value of the function
+        """
+        future = (self.executor or get_default_executor()).submit(function, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A read which has not started yet is dropped by the executor, a running read stops at the next row
+            cancel_event.set()
+            raise
+
+    async def iter_batches(self, cancel_event, rows, batch_size):
+        """
+        Iterates rows in the executor and yields them in lists of batch_size items.
+        If the iteration ends early, e.g. because the task is cancelled, cancel_event is set and rows is closed.
+
+        :param cancel_event: threading.Event checked by rows
+        :param rows: Generator of (row, data) tuples
+        :param batch_size: The number of items per batch
+        """
+        future = None
+        try:
+            while True:
+                future = (self.executor or get_default_executor()).submit(next_batch, rows, batch_size)
+                batch = await asyncio.wrap_future(future)
+                if not batch:
+                    return
+                yield batch
+        finally:
+            cancel_event.set()
+            if future is None:
+                rows.close()
+            else:
+                # A batch still running in the executor stops at the next row; rows is closed once it has returned
+                future.add_done_callback(lambda _: rows.close())
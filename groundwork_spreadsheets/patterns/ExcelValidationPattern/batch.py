@@ -0,0 +1,124 @@
+"""
+Parallel reading of workbooks and worksheets in worker processes
+"""
+import collections
+import logging
+import traceback
+
+# Result of one workbook of read_excel_many. Either data or error is None.
+WorkbookResult = collections.namedtuple('WorkbookResult', ['path', 'data', 'error'])
+
+# Error of one workbook: the exception class name, its message and the formatted traceback
+WorkbookError = collections.namedtuple('WorkbookError', ['type', 'message', 'traceback'])
+
+# Settings of the tasks of one parallel read. They are sent with each task, since ProcessPoolExecutor has no
+# initializer before Python 3.7.
+WorkerSettings = collections.namedtuple('WorkerSettings', ['plugin_class', 'log_name', 'excel_config', 'read_only',
+                                                           'result_format', 'engine', 'quiet'])
+
+# Plugins of a worker process by (plugin class, log name, quiet), created by the first task which needs one
+_plugins = {}
+
+
+class WorkerPlugin(object):
+    """
+    Stand-in for the groundwork plugin in worker processes. It only provides what the Excel validation needs.
+    """
+
+    def __init__(self, log_name):
+        """
+        :param log_name: Name of the logger of the plugin in the main process
+        """
+        self.name = log_name
+        self.app = None
+        self.log = logging.getLogger(log_name)
+
+
+def workbook_error(exception):
+    """
+    Converts an exception into a picklable WorkbookError.
+
+    :param exception: The exception raised while reading a workbook
+    :return: The WorkbookError
+    """
+    message = exception.args[0] if len(exception.args) == 1 else str(exception)
+    if isinstance(message, bytes):
+        # The plugin raises ValueError with UTF-8 encoded messages
+        message = message.decode('UTF-8', 'ignore')
+    formatted = ''.join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+    return WorkbookError(type(exception).__name__, str(message), formatted)
+
+
+def create_plugin(plugin_class, log_name, quiet=False):
+    """
+    Creates a plugin outside of the groundwork application.
+
+    :param plugin_class: The ExcelValidationPlugin class
+    :param log_name: Name of the logger of the plugin in the main process
+    :param quiet: If True, the plugin does not log anything. Used for partitions, whose messages are logged by the
+                  plugin in the main process when the partitions are merged.
+    :return: The plugin instance
+    """
+    worker_plugin = WorkerPlugin(log_name)
+    if quiet:
+        # A disabled logger outside of the logging hierarchy
+        worker_plugin.log = logging.Logger(log_name)
+        worker_plugin.log.disabled = True
+    return plugin_class(worker_plugin)
+
+
+def get_worker_plugin(settings):
+    """
+    :param settings: The WorkerSettings of the task
+    :return: The plugin of the worker process, which is created on the first call
+    """
+    key = (settings.plugin_class, settings.log_name, settings.quiet)
+    plugin = _plugins.get(key)
+    if plugin is None:
+        plugin = _plugins[key] = create_plugin(*key)
+    return plugin
+
+
+def read_workbook(settings, excel_workbook_path):
+    """
+    Reads one workbook with the configuration of the settings. Errors are returned instead of raised,
+    so one bad workbook does not abort the batch.
+
+    :param settings: The WorkerSettings of the batch
+    :param excel_workbook_path: Path to the Excel workbook
+    :return: The WorkbookResult
+    """
+    try:
+        data = get_worker_plugin(settings).read_excel(settings.excel_config, excel_workbook_path,
+                                                      read_only=settings.read_only,
+                                                      result_format=settings.result_format, engine=settings.engine)
+    except Exception as exception:
+        return WorkbookResult(excel_workbook_path, None, workbook_error(exception))
+    return WorkbookResult(excel_workbook_path, data, None)
+
+
+def read_sheet(settings, excel_config, excel_workbook_path):
+    """
+    Reads one sheet of a workbook. Errors are raised to the caller.
+
+    :param settings: The WorkerSettings of the read; their excel_config is not used
+    :param excel_config: The validated configuration of the sheet
+    :param excel_workbook_path: Path to the Excel workbook
+    :return: The result of read_excel
+    """
+    return get_worker_plugin(settings).read_excel(excel_config, excel_workbook_path, read_only=settings.read_only,
+                                                  result_format=settings.result_format, engine=settings.engine)
+
+
+def read_partition(settings, excel_workbook_path, row_first, row_last):
+    """
+    Reads a range of data rows of the sheet selected by the configuration of the settings.
+
+    :param settings: The WorkerSettings of the partitioned read
+    :param excel_workbook_path: Path to the Excel workbook
+    :param row_first: The first oriented data row of the range
+    :param row_last: The last oriented data row of the range
+    :return: The RowPartition with the rows and the failed checks of the range
+    """
+    return get_worker_plugin(settings)._read_partition(settings.excel_config, excel_workbook_path, settings.engine,
+                                                       row_first, row_last)
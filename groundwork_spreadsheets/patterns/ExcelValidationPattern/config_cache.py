@@ -0,0 +1,120 @@
+"""
+Cache of validated configurations for the Excel validation pattern
+"""
+import collections
+import copy
+import os
+import threading
+
+
+class ValidatedConfig(dict):
+    """
+    A configuration dictionary that was validated against the JSON schema and has all defaults set.
+    Passing it to the plugin again skips the validation.
+    """
+
+
+def file_key(path):
+    """
+    Builds the cache key of a file. A changed file gets a new key, so outdated entries are never returned.
+
+    :param path: Path to the file
+    :return: Tuple of the absolute path, the modification time and the size of the file
+    """
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+class ConfigCache(object):
+    """
+    Bounded LRU cache of schema validators and of validated configurations with all defaults applied.
+
+    The entries are keyed by file path, modification time and size. Configurations are returned as deep copies,
+    so the callers may change them without affecting the cache.
+    """
+
+    def __init__(self, maxsize=32):
+        """
+        :param maxsize: The maximum number of cached configurations. 0 disables the cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._configs = collections.OrderedDict()
+        self._schema_validators = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :param key: The file key of the configuration
+        :return: A copy of the cached configuration or None
+        """
+        with self._lock:
+            config = self._configs.get(key)
+            if config is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._configs.move_to_end(key)
+        return copy.deepcopy(config)
+
+    def put(self, key, config):
+        """
+        Stores a configuration. The least recently used entry is dropped if the cache is full.
+
+        :param key: The file key of the configuration
+        :param config: The validated configuration with all defaults applied
+        """
+        if self.maxsize <= 0:
+            return
+        config = copy.deepcopy(config)
+        with self._lock:
+            # Older versions of the same file are outdated
+            for outdated_key in [x for x in self._configs if x[0] == key[0]]:
+                del self._configs[outdated_key]
+            self._configs[key] = config
+            while len(self._configs) > self.maxsize:
+                self._configs.popitem(last=False)
+
+    def get_schema_validator(self, key, build):
+        """
+        Returns the compiled validator of a JSON schema file.
+
+        :param key: The file key of the schema file
+        :param build: Callable without arguments that compiles the validator on a cache miss
+        :return: The schema validator
+        """
+        with self._lock:
+            cached_key, validator = self._schema_validators.get(key[0], (None, None))
+        if cached_key != key:
+            validator = build()
+            with self._lock:
+                self._schema_validators[key[0]] = (key, validator)
+        return validator
+
+    def invalidate(self, path=None):
+        """
+        Removes cached entries.
+
+        :param path: Path of a configuration or schema file. If None, the whole cache is cleared.
+        """
+        with self._lock:
+            if path is None:
+                self._configs.clear()
+                self._schema_validators.clear()
+                return
+            path = os.path.abspath(path)
+            for key in [x for x in self._configs if x[0] == path]:
+                del self._configs[key]
+            self._schema_validators.pop(path, None)
+
+    def info(self):
+        """
+        :return: Dictionary with the hit and miss counters and the current and maximum size
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._configs), 'maxsize': self.maxsize}
+
+
+# Cache shared by all plugins
+CONFIG_CACHE = ConfigCache()
@@ -0,0 +1,227 @@
+"""
+Streaming access to CSV and TSV files with the interface of read-only openpyxl workbooks
+"""
+import csv
+import datetime
+import itertools
+import math
+import os
+import re
+
+from .sheet_readers import ReadOnlyWorksheetReader
+
+# Delimiters by file extension
+CSV_DELIMITERS = {
+    '.csv': ',',
+    '.tsv': '\t',
+    '.tab': '\t',
+}
+
+# UTF-8, the byte order mark written by Excel is skipped
+CSV_ENCODING = 'utf-8-sig'
+
+# Date formats by the length of the value; a 'T' between date and time is accepted as well
+DATE_FORMATS = {
+    10: '%Y-%m-%d',
+    16: '%Y-%m-%d %H:%M',
+    19: '%Y-%m-%d %H:%M:%S',
+}
+DATE_FORMAT_FRACTION = '%Y-%m-%d %H:%M:%S.%f'
+
+# Decimal numbers as written by spreadsheets. int() and float() accept underscores, non-ASCII digits and
+# nan/inf as well, which are no numbers in a CSV file.
+INTEGER_PATTERN = re.compile(r'\s*[+-]?[0-9]+\s*')
+FLOAT_PATTERN = re.compile(r'\s*[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?\s*')
+
+
+def to_float(value):
+    """
+    :return: The text converted to float or the unchanged value if it is no finite decimal number
+    """
+    if type(value) is not str or FLOAT_PATTERN.fullmatch(value) is None:
+        return value
+    number = float(value)
+    # Exponents out of range give inf
+    return number if math.isfinite(number) else value
+
+
+def to_integer(value):
+    """
+    :return: The text converted to int. Other numbers are converted to float and are checked by the validator.
+    """
+    if type(value) is not str:
+        return value
+    if INTEGER_PATTERN.fullmatch(value) is None:
+        return to_float(value)
+    return int(value)
+
+
+def to_date(value):
+    """
+    :return: The ISO 8601 date (e.g. 2017-08-20 or 2017-08-20 13:45:00) converted to datetime or the unchanged value
+    """
+    if type(value) is not str:
+        return value
+    text = value.strip()
+    if len(text) > 10 and text[10] == 'T':
+        text = text[:10] + ' ' + text[11:]
+    if len(text) in (10, 19) and text[4] == text[7] == '-':
+        # Fast path for the usual formats, strptime is slow
+        fields = [text[:4], text[5:7], text[8:10]]
+        if len(text) == 19:
+            fields += [text[11:13], text[14:16], text[17:]]
+        if (len(text) == 10 or text[13] == text[16] == ':') and ''.join(fields).isdigit():
+            try:
+                return datetime.datetime(*map(int, fields))
+            except ValueError:
+                return value
+    date_format = DATE_FORMATS.get(len(text), DATE_FORMAT_FRACTION if len(text) > 20 else None)
+    if date_format is None:
+        return value
+    try:
+        return datetime.datetime.strptime(text, date_format)
+    except ValueError:
+        return value
+
+
+# Converters of the text values by base type, values of other types stay text
+CONVERTERS = {
+    'integer': to_integer,
+    'float': to_float,
+    'date': to_date,
+}
+
+
+def get_csv_delimiter(path):
+    """
+    :param path: Path to a file as str or os.PathLike object
+    :return: The delimiter if the path is a CSV or TSV file, otherwise None
+    """
+    if isinstance(path, os.PathLike):
+        path = os.fspath(path)
+    if not isinstance(path, str):
+        return None
+    return CSV_DELIMITERS.get(os.path.splitext(path)[1].lower())
+
+
+class CsvWorksheet(object):
+    """
+    A CSV or TSV file as read-only worksheet. Each line is a physical row; empty fields are empty cells.
+    The file is streamed on each iteration, so only the lines in use are kept in memory.
+    """
+
+    def __init__(self, path, delimiter, encoding=CSV_ENCODING):
+        """
+        :param path: Path to the file
+        :param delimiter: The field delimiter
+        :param encoding: The encoding of the file
+        """
+        self.path = path
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.title = os.path.splitext(os.path.basename(path))[0]
+        # The dimensions are only calculated on request, see calculate_dimension
+        self.max_row = None
+        self.max_column = None
+
+    def iter_rows(self, min_row=1, max_row=None, min_col=1, max_col=None, values_only=True):
+        """
+        Yields the lines from min_row to max_row as tuples of the values from min_col to max_col.
+        Like openpyxl's values_only mode; lines shorter than max_col are not padded.
+        """
+        with open(self.path, newline='', encoding=self.encoding) as file_pointer:
+            lines = csv.reader(file_pointer, delimiter=self.delimiter)
+            for line in itertools.islice(lines, min_row - 1, max_row):
+                yield tuple([value or None for value in line[min_col - 1:max_col]])
+
+    def reset_dimensions(self):
+        """
+        Removes the calculated dimensions, like openpyxl's read-only worksheets.
+        """
+        self.max_row = self.max_column = None
+
+    def calculate_dimension(self, force=False):
+        """
+        Reads the whole file to count the lines and find the longest line.
+        """
+        max_row = max_column = 0
+        for max_row, line in enumerate(self.iter_rows(), 1):
+            max_column = max(max_column, len(line))
+        self.max_row = max_row
+        self.max_column = max_column
+        return '{0}:{1}'.format(max_row, max_column)
+
+
+class CsvWorkbook(object):
+    """
+    Workbook with the CSV or TSV file as its only worksheet. It is selected by 'active', 'first', 'last', 1 and
+    'name:' followed by the file name without extension.
+    """
+
+    read_only = True
+
+    def __init__(self, path, delimiter, encoding=CSV_ENCODING):
+        """
+        :param path: Path to the file
+        :param delimiter: The field delimiter
+        :param encoding: The encoding of the file
+        """
+        if not os.path.isfile(path):
+            raise IOError("No such file: '{0}'".format(path))
+        self.worksheets = [CsvWorksheet(path, delimiter, encoding)]
+
+    @property
+    def active(self):
+        return self.worksheets[0]
+
+    @property
+    def sheetnames(self):
+        return [x.title for x in self.worksheets]
+
+    def __getitem__(self, name):
+        for worksheet in self.worksheets:
+            if worksheet.title == name:
+                return worksheet
+        raise KeyError('Worksheet {0} does not exist.'.format(name))
+
+    def close(self):
+        # The file is only open while it is iterated
+        pass
+
+
+class CsvWorksheetReader(ReadOnlyWorksheetReader):
+    """
+    Reads a CsvWorksheet. The text values of the integer, float and date columns are converted to numbers and
+    dates, so they are validated like typed cells of a workbook. Text that cannot be converted is kept and fails
+    the type check.
+
+    column_based files are streamed line by line. For row_based files the lines of the headers are kept in memory.
+    """
+
+    def __init__(self, worksheet, orientation):
+        super(CsvWorksheetReader, self).__init__(worksheet, orientation)
+        self._converters = {}
+
+    def set_column_types(self, column_types):
+        self._converters = {column: CONVERTERS[base] for column, base in column_types.items() if base in CONVERTERS}
+
+    def _convert(self, rows, columns):
+        converters = [(position, self._converters[column]) for position, column in enumerate(columns)
+                      if column in self._converters]
+        if not converters:
+            return rows
+        return self._iter_converted(rows, converters)
+
+    @staticmethod
+    def _iter_converted(rows, converters):
+        for row, values in rows:
+            values = list(values)
+            for position, convert in converters:
+                values[position] = convert(values[position])
+            yield row, tuple(values)
+
+    def iter_rows(self, row_first, row_last, columns):
+        return self._convert(super(CsvWorksheetReader, self).iter_rows(row_first, row_last, columns), columns)
+
+    def iter_populated_rows(self, row_first, columns):
+        return self._convert(super(CsvWorksheetReader, self).iter_populated_rows(row_first, columns), columns)
@@ -1,15 +1,45 @@
 """
 Groundwork Excel read/write routines using openpyxl
 """
-import datetime
+import collections
+import concurrent.futures
+import copy
+import csv
+import itertools
 import json
+import logging
 import os
-import re
+import threading
+import uuid
 
 import openpyxl
 from groundwork.patterns.gw_base_pattern import GwBasePattern
-from jsonschema import validate, ValidationError, SchemaError
-from openpyxl.utils import get_column_letter
+from jsonschema import SchemaError, validators as jsonschema_validators
+from openpyxl.cell import WriteOnlyCell
+from jsonschema.exceptions import best_match
+
+from .async_reader import DEFAULT_BATCH_SIZE, AsyncReader, check_cancelled
+from .batch import WorkbookResult, WorkerSettings, create_plugin, read_partition, read_sheet, read_workbook, \
+    workbook_error
+from .config_cache import CONFIG_CACHE, ValidatedConfig, file_key
+from .csv_reader import CsvWorkbook, CsvWorksheet, CsvWorksheetReader, get_csv_delimiter
+from .partitions import RowPartition, SheetLayout, split_rows
+from .report import CellError, ValidationReport
+from .results import RESULT_FORMATS
+from .stats import ReadStats
+from .sheet_readers import ReadOnlyWorksheetReader, WorksheetReader, transform_coordinates
+from .validators import compile_validator
+from .writer import SheetWriter, get_write_layout, iter_row_dicts
+from .xlsx_reader import XlsxWorkbook
+
+# The checks of the cell values in the order their errors are raised or logged
+ERROR_CHECKS = ('fail_on_empty_cell', 'fail_on_type_error')
+
+# Engines reading the workbooks: openpyxl's workbooks or the sheet XML parsed by XlsxWorkbook
+ENGINES = ('openpyxl', 'xml')
+
+# Number of rows handed over to the sink of read_excel at once
+DEFAULT_CHUNK_SIZE = 10000
 
 JSON_SCHEMA_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'excel_config_schema.json')
 
@@ -38,18 +68,640 @@ class ExcelValidationPlugin:
         self._plugin = plugin
         self._app = plugin.app
         self.excel_config = None
-
-    def read_excel(self, excel_config_json_path, excel_workbook_path):
+        # Validated configurations are shared by all plugins
+        self.config_cache = CONFIG_CACHE
+        # If True, the ReadStats of each read are stored in last_stats
+        self.collect_stats = False
+        # Name of a signal registered by the plugin. If set, the ReadStats are collected and the signal is sent
+        # with the keyword argument stats after each read.
+        self.stats_signal = None
+        self.last_stats = None
+        # Optional ResultCache. If set, read_excel and validate_excel return the stored result of an unchanged
+        # workbook and configuration instead of reading it again.
+        self.result_cache = None
+        # Optional callable getting the level and text of each message logged by _log, e.g. to store the messages
+        # of a read in the result cache
+        self._record_message = None
+        # Executor and concurrency limit of read_excel_async and iter_excel_async
+        self.async_reader = AsyncReader()
+        # threading.Event stopping the read of an asynchronous call, set when its task is cancelled
+        self._cancel_event = None
+
+    def read_excel(self, excel_config_json_path, excel_workbook_path, read_only=None, result_format='dict',
+                   engine=None, use_cache=True, workers=None, sink=None, chunk_size=DEFAULT_CHUNK_SIZE):
         """
         Main routine to read an Excel sheet.
 
-        :param excel_config_json_path: The configuration json file
+        :param excel_config_json_path: The configuration json file or a configuration dictionary
+        :param excel_workbook_path: Relative or absolute path to an Excel workbook or a CSV/TSV file
+                                    (.csv, .tsv or .tab), which is always streamed
+        :param read_only: If True, the workbook is opened in read-only mode and the rows are validated while they
+                          are streamed from the file. If None, the value of 'read_only' in the config is used.
+        :param result_format: 'dict', 'columnar' or 'records'. 'columnar' returns a ColumnarResult with one column per
+                              header, 'records' a RecordResult with compact row records instead of dictionaries.
+        :param engine: 'openpyxl' or 'xml'. 'xml' parses the sheet XML directly without openpyxl's cell objects,
+                       always like in read-only mode. If None, the value of 'engine' in the config is used.
+        :param use_cache: If False, the result_cache is bypassed: the workbook is read and the result is not stored
+        :param workers: If greater than 1, the data rows are split into contiguous ranges, which are read and
+                        validated by this number of worker processes. The result, the errors and the log messages
+                        are the same as without workers. The workbook is read with the 'xml' engine, which skips
+                        the rows before each range without parsing them; engine='openpyxl' raises a ValueError.
+        :param sink: Optional callable getting the validated rows in chunks of chunk_size rows while the sheet is
+                     read. Each chunk is a result of result_format for its rows and is not used after the call, so
+                     only one chunk is kept in memory. The rows are not collected and the result_cache is not used.
+                     If an error is raised, the chunks handed over before only contain valid rows.
+                     If the sink has a set_headers method, it gets the data_type_config entries of the headers
+                     before the first chunk, see SqliteSink and JsonLinesSink.
+        :param chunk_size: The number of rows per chunk handed over to the sink; the last chunk may be smaller
+        :return: Data dictionary with rows/colums as keys and a dictionary of "header": value as items.
+                 With a sink the number of rows handed over.
+        """
+        self._check_options(result_format, engine, workers)
+        if sink is not None:
+            if workers is not None and workers > 1:
+                raise ValueError("A sink cannot be combined with workers.")
+            if type(chunk_size) is not int or chunk_size < 1:
+                raise ValueError("chunk_size must be a positive integer.")
+            return self._read_excel_chunks(excel_config_json_path, excel_workbook_path, read_only, result_format,
+                                           sink, chunk_size, engine=engine)
+        return self._cached_read(
+            excel_config_json_path, excel_workbook_path, use_cache, ('read_excel', result_format), read_only, engine,
+            lambda config: self._read_excel(config, excel_workbook_path, read_only, result_format, engine=engine,
+                                            workers=workers))
+
+    def _cached_read(self, excel_config_json_path, excel_workbook_path, use_cache, variant, read_only, engine, read):
+        """
+        Returns the result of a read from the result_cache or reads it and stores it in the cache.
+        On a cache hit the messages logged by the read (except the ones of raised errors) are logged again and
+        last_stats is set to None.
+        Only workbook files given by a path (str or os.PathLike) are cached.
+
+        :param variant: Tuple of the arguments changing the result, see ResultCache.make_key
+        :param read_only: The read_only argument of the read; None uses the value of the configuration
+        :param engine: The engine argument of the read; None uses the value of the configuration
+        :param read: Callable reading the workbook; it gets the configuration
+        """
+        if self.result_cache is None or not use_cache \
+                or not isinstance(excel_workbook_path, (str, os.PathLike)) \
+                or not os.path.isfile(excel_workbook_path):
+            return read(excel_config_json_path)
+
+        excel_config = self.excel_config = self._load_config(excel_config_json_path)
+        if read_only is None:
+            read_only = excel_config['read_only']
+        if engine is None:
+            engine = excel_config['engine']
+        key = self.result_cache.make_key(excel_workbook_path, excel_config, variant, read_only, engine)
+        entry = self.result_cache.get(key)
+        if entry is not None:
+            # No stats are collected, so the ones of the previous read must not be taken for the ones of this read
+            self.last_stats = None
+            result, messages = entry
+            for level, msg in messages:
+                self._plugin.log.log(level, msg)
+            return result
+
+        messages = []
+        self._record_message = lambda level, msg: messages.append((level, msg))
+        try:
+            result = read(excel_config)
+            self.result_cache.put(key, result, messages)
+        finally:
+            self._record_message = None
+        return result
+
+    def _read_excel(self, excel_config_json_path, excel_workbook_path, read_only, result_format, workbook=None,
+                    report=None, engine=None, workers=None):
+        """
+        Builds the result of read_excel.
+
+        :param workbook: Optional already loaded workbook; excel_workbook_path, read_only and engine are not used then
+        :param report: Optional ValidationReport, see _iter_excel
+        :param workers: The number of worker processes of a partitioned read, see read_excel
+        """
+        if workers is not None and workers > 1 and workbook is None \
+                and isinstance(excel_workbook_path, (str, os.PathLike)):
+            return self._read_excel_partitioned(excel_config_json_path, excel_workbook_path, result_format, report,
+                                                workers)
+
+        if result_format == 'dict':
+            return dict(self._iter_excel(excel_config_json_path, excel_workbook_path, read_only, workbook=workbook,
+                                         report=report, engine=engine))
+
+        result = RESULT_FORMATS[result_format]()
+        for row, row_dict in self._iter_excel(excel_config_json_path, excel_workbook_path, read_only,
+                                              on_headers=result.set_headers, workbook=workbook, report=report,
+                                              engine=engine):
+            result.append(row, row_dict)
+        return result
+
+    def _read_excel_chunks(self, excel_config_json_path, excel_workbook_path, read_only, result_format, sink,
+                           chunk_size, engine=None):
+        """
+        Hands over the rows of read_excel to a sink in chunks of chunk_size rows.
+
+        :return: The number of rows handed over
+        """
+        data_type_configs = []
+        set_sink_headers = getattr(sink, 'set_headers', None)
+
+        def on_headers(headers_data_type_configs):
+            data_type_configs.extend(headers_data_type_configs)
+            if set_sink_headers is not None:
+                # Sinks like SqliteSink prepare their output from the headers
+                set_sink_headers(headers_data_type_configs)
+
+        chunk = None
+        count = 0
+        for row, row_dict in self._iter_excel(excel_config_json_path, excel_workbook_path, read_only,
+                                              on_headers=on_headers, engine=engine):
+            if chunk is None:
+                if result_format == 'dict':
+                    chunk = {}
+                    append = chunk.__setitem__
+                else:
+                    chunk = RESULT_FORMATS[result_format]()
+                    chunk.set_headers(data_type_configs)
+                    append = chunk.append
+            append(row, row_dict)
+            if len(chunk) >= chunk_size:
+                # The chunk belongs to the sink now, the next row starts a new one
+                count += len(chunk)
+                sink(chunk)
+                chunk = None
+        if chunk is not None:
+            count += len(chunk)
+            sink(chunk)
+        return count
+
+    def iter_excel(self, excel_config_json_path, excel_workbook_path, read_only=None, engine=None):
+        """
+        Reads an Excel sheet lazily. Same as read_excel, but each row is yielded as soon as it is validated.
+
+        The configuration and the workbook are read when the iteration starts. Errors are raised when the
+        iteration reaches them, so all rows yielded before are valid.
+
+        :param excel_config_json_path: The configuration json file or a configuration dictionary
         :param excel_workbook_path: Relative or absolute path to an Excel workbook
-        :return: Data dictionary with rows/colums as keys and a dictionary of "header": value as items
+        :param read_only: If True, the workbook is opened in read-only mode and the rows are validated while they
+                          are streamed from the file. If None, the value of 'read_only' in the config is used.
+        :param engine: Same as for read_excel
+        :return: Generator of (row, data) tuples; data is a dictionary of "header": value
+        """
+        self._check_options(engine=engine)
+        return self._iter_excel(excel_config_json_path, excel_workbook_path, read_only, engine=engine)
+
+    async def read_excel_async(self, excel_config_json_path, excel_workbook_path, read_only=None,
+                               result_format='dict', engine=None, use_cache=True):
         """
+        Asyncio version of read_excel. The workbook is read by the executor of async_reader, so the event loop is
+        not blocked, and at most async_reader.max_reads reads run at the same time.
+        If the awaiting task is cancelled, the read stops at the next row.
+
+        The arguments and the result are the same as for read_excel.
+        """
+        self._check_options(result_format, engine)
+        reader = self._async_copy()
+        async with self.async_reader.limit():
+            try:
+                return await self.async_reader.run(reader._cancel_event, reader.read_excel, excel_config_json_path,
+                                                   excel_workbook_path, read_only, result_format, engine, use_cache)
+            finally:
+                self._update_from(reader)
+
+    def iter_excel_async(self, excel_config_json_path, excel_workbook_path, read_only=None, engine=None,
+                         batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Asyncio version of iter_excel. The rows are read by the executor of async_reader and handed over in
+        batches, so the event loop is not blocked. At most async_reader.max_reads reads run at the same time.
+
+        The read stops when the iteration ends early, e.g. because the task is cancelled. Iterations which are left
+        with break should be closed with 'await agen.aclose()' in a finally clause, so the workbook is closed at once.
+
+        :param excel_config_json_path: The configuration json file or a configuration dictionary
+        :param excel_workbook_path: Relative or absolute path to an Excel workbook
+        :param read_only: Same as for iter_excel
+        :param engine: Same as for iter_excel
+        :param batch_size: The maximum number of rows per batch
+        :return: Asynchronous generator of lists of (row, data) tuples
+        """
+        self._check_options(engine=engine)
+        return self._iter_excel_async(excel_config_json_path, excel_workbook_path, read_only, engine, batch_size)
+
+    async def _iter_excel_async(self, excel_config_json_path, excel_workbook_path, read_only, engine, batch_size):
+        reader = self._async_copy()
+        rows = reader._iter_excel(excel_config_json_path, excel_workbook_path, read_only, engine=engine)
+        async with self.async_reader.limit():
+            try:
+                async for batch in self.async_reader.iter_batches(reader._cancel_event, rows, batch_size):
+                    yield batch
+            finally:
+                self._update_from(reader)
+
+    def _async_copy(self):
+        """
+        :return: A shallow copy of the plugin for a read in the executor. Concurrent reads do not share the state of
+                 the current read (excel_config, last_stats) and each one gets its own cancel event.
+        """
+        reader = copy.copy(self)
+        reader._cancel_event = threading.Event()
+        return reader
+
+    def _update_from(self, reader):
+        """
+        Takes over the state of the last read from a copy made by _async_copy.
+        """
+        self.excel_config = reader.excel_config
+        self.last_stats = reader.last_stats
+
+    def validate_excel(self, excel_config_json_path, excel_workbook_path, read_only=None, result_format='dict',
+                       max_errors=None, stop_at_max_errors=False, engine=None, use_cache=True, workers=None):
+        """
+        Reads an Excel sheet and collects all failed checks in a single pass instead of raising on the first one.
+
+        Checks are reported if they would raise a ValueError in read_excel (see the 'fail_on_*' and 'excluded_fail_*'
+        settings); all other messages are logged as usual. Errors in the configuration are still raised.
+
+        :param excel_config_json_path: The configuration json file or a configuration dictionary
+        :param excel_workbook_path: Relative or absolute path to an Excel workbook
+        :param read_only: Same as for read_excel
+        :param result_format: Same as for read_excel
+        :param max_errors: The maximum number of errors kept in the report. None keeps all errors.
+        :param stop_at_max_errors: If True, the validation stops as soon as max_errors errors are found
+        :param engine: Same as for read_excel
+        :param use_cache: Same as for read_excel
+        :param workers: Same as for read_excel
+        :return: ValidationReport with the data of the rows without errors and the list of CellError
+        """
+        self._check_options(result_format, engine, workers)
+        return self._cached_read(
+            excel_config_json_path, excel_workbook_path, use_cache,
+            ('validate_excel', result_format, max_errors, stop_at_max_errors), read_only, engine,
+            lambda config: self._validate_excel(config, excel_workbook_path, read_only, result_format, max_errors,
+                                                stop_at_max_errors, engine, workers))
+
+    def _validate_excel(self, excel_config_json_path, excel_workbook_path, read_only, result_format, max_errors,
+                        stop_at_max_errors, engine, workers):
+        """
+        Builds the result of validate_excel.
+        """
+        report = ValidationReport(max_errors, stop_at_max_errors)
+        report.data = self._read_excel(excel_config_json_path, excel_workbook_path, read_only, result_format,
+                                       report=report, engine=engine, workers=workers)
+        return report
+
+    def write_excel(self, excel_config_json_path, rows, excel_workbook_path):
+        """
+        Writes rows to a new workbook in the layout of a configuration, so it can be read again with read_excel.
+
+        The headers of data_type_config are written in their order at the configured header row and column; the
+        data follows at the first data row. The cells get a number format by the type of their column (dates,
+        integers and text). The workbook is written in openpyxl's write-only mode: column_based sheets are
+        streamed from rows in constant memory, row_based sheets keep the values until all rows are read.
+        A path ending with .csv, .tsv or .tab is written as CSV/TSV file in UTF-8.
+
+        :param excel_config_json_path: The configuration json file or a configuration dictionary
+        :param rows: The rows: a result of read_excel (dictionary, ColumnarResult or RecordResult), an iterable of
+                     (row, data) tuples like iter_excel or an iterable of dictionaries of "header": value.
+                     The rows are numbered anew from the first data row.
+        :param excel_workbook_path: Path of the workbook or CSV/TSV file to write; an existing file is replaced
+        :return: The number of written rows
+        """
+        self.excel_config = self._load_config(excel_config_json_path)
+        layout = get_write_layout(self.excel_config)
+        if layout.data_row_first <= layout.header_row:
+            self._raise_value_error("Config error: The first data {0} must be after the header {0}.".format(
+                'row' if layout.orientation == 'column_based' else 'column'))
+
+        delimiter = get_csv_delimiter(excel_workbook_path)
+        if delimiter is not None:
+            # The rows are written to a new file next to the target, which replaces it once all rows are written.
+            # So a failed write neither leaves a partly written file nor destroys an existing one.
+            directory, name = os.path.split(os.path.abspath(excel_workbook_path))
+            temporary_path = os.path.join(directory, '.{0}.{1}.tmp'.format(name, uuid.uuid4().hex))
+            file_pointer = open(temporary_path, 'x', newline='', encoding='utf-8')
+            try:
+                with file_pointer:
+                    writer = SheetWriter(layout, self.excel_config['data_type_config'],
+                                         csv.writer(file_pointer, delimiter=delimiter).writerow)
+                    count = self._write_rows(writer, rows)
+                os.replace(temporary_path, excel_workbook_path)
+            except BaseException:
+                os.remove(temporary_path)
+                raise
+            return count
+
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = self._create_sheet(workbook)
+
+        def create_cell(number_format):
+            cell = WriteOnlyCell(worksheet)
+            if number_format is not None:
+                cell.number_format = number_format
+            return cell
+        writer = SheetWriter(layout, self.excel_config['data_type_config'], worksheet.append, create_cell)
+        try:
+            count = self._write_rows(writer, rows)
+        except Exception:
+            # The rows are streamed to a temporary file; closing the worksheet releases it without writing the
+            # workbook. openpyxl removes the file when the process ends.
+            worksheet.close()
+            raise
+        workbook.save(excel_workbook_path)
+        return count
+
+    def _write_rows(self, writer, rows):
+        """
+        Writes the rows with a SheetWriter and raises a ValueError if they do not fit the configured data rows.
+
+        :return: The number of written rows
+        """
+        count = writer.write(iter_row_dicts(rows))
+        if writer.max_rows is not None and count > writer.max_rows:
+            self._raise_value_error("Only {0} data {1}s fit the layout of the configuration, more rows are "
+                                    "given.".format(writer.max_rows, 'row' if writer.layout.orientation ==
+                                                    'column_based' else 'column'))
+        return count
+
+    def _create_sheet(self, workbook):
+        """
+        Creates the worksheet selected by the sheet_config in an empty workbook. A sheet index is met by empty
+        worksheets before it.
+
+        :return: The worksheet
+        """
+        sheet_config = self.excel_config['sheet_config']
+        if isinstance(sheet_config, int):
+            for index in range(1, sheet_config):
+                workbook.create_sheet('Sheet{0}'.format(index))
+            return workbook.create_sheet('Sheet{0}'.format(sheet_config))
+        if sheet_config.startswith('name'):
+            return workbook.create_sheet(sheet_config.split(':', 1)[1])
+        return workbook.create_sheet('Sheet1')
+
+    def _read_excel_partitioned(self, excel_config_json_path, excel_workbook_path, result_format, report, workers):
+        """
+        Builds the result of read_excel with row ranges read in parallel by worker processes.
+
+        A first pass reads the configuration and the headers like the serial read, so their log messages and errors
+        are the same, and finds the last data row. The workers validate their ranges of the data rows and record the
+        failed checks and log messages of each row. The partitions are merged in row order: the messages are logged
+        and the failed checks are raised, reported or logged by _handle_errors as in the serial read. The ReadStats
+        of the first pass are completed by the merge.
+        All passes use the 'xml' engine, since openpyxl would parse the sheet from the start in each worker.
+        """
+        excel_config = self._load_config(excel_config_json_path)
+        engine = 'xml'
+        if result_format == 'dict':
+            result, on_headers = {}, None
+        else:
+            result = RESULT_FORMATS[result_format]()
+            on_headers = result.set_headers
+        layout = SheetLayout()
+        for _ in self._iter_excel(excel_config, excel_workbook_path, True, on_headers=on_headers, report=report,
+                                  engine=engine, partition=layout):
+            pass
+        stats = self.last_stats if self.collect_stats or self.stats_signal is not None else None
+        if layout.row_first is None:
+            # The read stopped at the headers because of max_errors
+            self._send_stats(stats)
+            return result
+
+        if stats is not None:
+            stats.start_phase('validation')
+        ranges = split_rows(*layout.row_span, parts=workers)
+        if layout.last_row < layout.row_first:
+            # severalEmptyCells found no data rows
+            partitions = []
+        elif len(ranges) == 1:
+            plugin = create_plugin(self.__class__, self._plugin.log.name, quiet=True)
+            partitions = [plugin._read_partition(excel_config, excel_workbook_path, engine, *ranges[0])]
+        else:
+            settings = WorkerSettings(self.__class__, self._plugin.log.name, excel_config, True, 'dict', engine, True)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(read_partition, settings, excel_workbook_path, first, last)
+                           for first, last in ranges]
+                partitions = [x.result() for x in futures]
+        self._merge_partitions(partitions, layout, result, report, stats)
+        if stats is not None:
+            stats.start_phase(None)
+        self._send_stats(stats)
+        return result
+
+    def _read_partition(self, excel_config, excel_workbook_path, engine, row_first, row_last):
+        """
+        Reads a range of data rows in read-only mode, see read_partition.
+
+        :return: The RowPartition
+        """
+        partition = RowPartition(row_first, row_last)
+        # Checks failing at the headers are handled by the first pass; they are collected here and dropped
+        report = ValidationReport()
+        self._record_message = partition.record_message
+        try:
+            for row, row_dict in self._iter_excel(excel_config, excel_workbook_path, True, report=report,
+                                                  engine=engine, partition=partition):
+                partition.add_row(row, row_dict)
+        finally:
+            self._record_message = None
+        return partition
+
+    def _merge_partitions(self, partitions, layout, result, report, stats=None):
+        """
+        Adds the rows of the partitions to the result, logs their messages and handles their failed checks in row
+        order.
+
+        :param partitions: List of RowPartition in row order
+        :param layout: The SheetLayout of the first pass
+        :param result: Dictionary or object of RESULT_FORMATS to add the rows to
+        :param report: The ValidationReport or None
+        :param stats: The ReadStats of the first pass or None; the counters of the data rows are added
+        """
+        row_last = layout.last_row
+        if type(layout.row_last) is not int:
+            # The serial read logs the last row once all data rows are read, only severalEmptyCells:0 before
+            msg = "Config update: Last data {0} was set to {1} using the '{2}' mechanism.".format(
+                'row' if self.excel_config['orientation'] == 'column_based' else 'column', row_last,
+                layout.row_last.split(':')[0])
+            if layout.row_last == 'severalEmptyCells:0':
+                self._log(logging.DEBUG, msg)
+                msg = None
+        else:
+            msg = None
+        if stats is not None:
+            stats.rows_scanned = max(0, row_last - layout.row_first + 1)
+        for partition in partitions:
+            for row, row_dict, errors, is_row_excluded, messages in partition.entries:
+                if messages:
+                    for level, message in messages:
+                        self._log(level, message)
+                keep_going = True
+                is_row_failed = False
+                if errors:
+                    is_row_failed, keep_going = self._handle_errors(errors, is_row_excluded, report)
+                if stats is not None:
+                    if errors:
+                        stats.violations.update(error.rule for error in errors)
+                    if is_row_excluded:
+                        stats.rows_excluded += 1
+                    elif is_row_failed:
+                        stats.rows_failed += 1
+                if row_dict is not None:
+                    if isinstance(result, dict):
+                        result[row] = row_dict
+                    else:
+                        result.append(row, row_dict)
+                if not keep_going:
+                    report.complete = False
+                    if stats is not None:
+                        stats.rows_scanned = row - layout.row_first + 1
+                    return
+        if msg is not None:
+            self._log(logging.DEBUG, msg)
+
+    def read_excel_many(self, excel_config_json_path, excel_workbook_paths, workers=None, read_only=None,
+                        result_format='dict', engine=None):
+        """
+        Reads many workbooks with the same configuration in parallel worker processes.
+
+        The configuration is validated once and sent with each workbook, since ProcessPoolExecutor has no
+        initializer before Python 3.7. Errors of a workbook do not abort the batch; they are returned as the error
+        of its result.
+
+        :param excel_config_json_path: The configuration json file or a configuration dictionary
+        :param excel_workbook_paths: Iterable of paths to Excel workbooks
+        :param workers: The number of worker processes. If None, the number of CPUs is used.
+                        If 1, the workbooks are read one after another in this process.
+        :param read_only: Same as for read_excel
+        :param result_format: Same as for read_excel
+        :param engine: Same as for read_excel
+        :return: List of WorkbookResult (path, data, error) in the order of excel_workbook_paths.
+                 data is the result of read_excel or None, error is a WorkbookError (type, message, traceback)
+                 or None.
+        """
+        self._check_options(result_format, engine)
+        self.excel_config = self._load_config(excel_config_json_path)
+        excel_workbook_paths = list(excel_workbook_paths)
+
+        if workers == 1 or len(excel_workbook_paths) <= 1:
+            results = []
+            for excel_workbook_path in excel_workbook_paths:
+                try:
+                    data = self.read_excel(self.excel_config, excel_workbook_path, read_only=read_only,
+                                           result_format=result_format, engine=engine)
+                except Exception as exception:
+                    results.append(WorkbookResult(excel_workbook_path, None, workbook_error(exception)))
+                else:
+                    results.append(WorkbookResult(excel_workbook_path, data, None))
+            return results
+
+        settings = WorkerSettings(self.__class__, self._plugin.log.name, self.excel_config, read_only, result_format,
+                                  engine, False)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(read_workbook, settings, x) for x in excel_workbook_paths]
+            results = []
+            for excel_workbook_path, future in zip(excel_workbook_paths, futures):
+                try:
+                    results.append(future.result())
+                except Exception as exception:
+                    # E.g. a worker process died or the result could not be transferred
+                    results.append(WorkbookResult(excel_workbook_path, None, workbook_error(exception)))
+        return results
+
+    def read_excel_sheets(self, excel_config_json_path, excel_workbook_path, sheets=None, read_only=None,
+                          result_format='dict', workers=None, engine=None):
+        """
+        Reads several sheets of a workbook. The workbook is loaded only once.
+
+        :param excel_config_json_path: The configuration json file or a configuration dictionary.
+                                       Its 'sheet_config' is replaced by the selectors given in sheets.
+        :param excel_workbook_path: Relative or absolute path to an Excel workbook
+        :param sheets: List of sheet selectors (same syntax as 'sheet_config'), which are all read with the given
+                       configuration, or dictionary of sheet selector: configuration (json file or dictionary,
+                       None for the given configuration). If None, all sheets are read.
+        :param read_only: Same as for read_excel. If None, the read-only mode is used if all sheet configurations
+                          enable it.
+        :param result_format: Same as for read_excel
+        :param workers: If greater than 1, the sheets are read in parallel by this number of worker processes.
+                        Each worker opens the workbook in read-only mode and reads only its sheets.
+        :param engine: Same as for read_excel. If None, the 'xml' engine is used if all sheet configurations
+                       select it.
+        :return: OrderedDict of sheet name: result of read_excel, in the order of the selectors
+        """
+        self._check_options(result_format, engine)
+        if isinstance(sheets, dict):
+            selectors = [(selector, excel_config_json_path if config is None else config)
+                         for selector, config in sheets.items()]
+        elif sheets is not None:
+            selectors = [(selector, excel_config_json_path) for selector in sheets]
+        parallel = workers is not None and workers > 1
+
+        if sheets is None:
+            excel_config = self._load_config(excel_config_json_path)
+            if read_only is None:
+                read_only = excel_config['read_only']
+            if engine is None:
+                engine = excel_config['engine']
+        else:
+            sheet_configs = [self._load_config(dict(self._load_config(config), sheet_config=selector))
+                             for selector, config in selectors]
+            if read_only is None:
+                read_only = all(x['read_only'] for x in sheet_configs)
+            if engine is None:
+                engine = 'xml' if all(x['engine'] == 'xml' for x in sheet_configs) else 'openpyxl'
+
+        # The worker processes open the workbook themselves, so here it is only needed to find the sheets
+        wb = self._load_workbook(excel_workbook_path, read_only or parallel, engine)
+        read_only = wb.read_only
+        try:
+            if sheets is None:
+                sheet_configs = [ValidatedConfig(excel_config, sheet_config='name:' + x) for x in wb.sheetnames]
+            titles = [self._get_sheet(wb, x['sheet_config']).title for x in sheet_configs]
+            for title in titles:
+                if titles.count(title) > 1:
+                    self._raise_value_error("Sheet '{0}' is selected more than once.".format(title))
+
+            results = collections.OrderedDict()
+            if not parallel or len(sheet_configs) <= 1:
+                for title, sheet_config in zip(titles, sheet_configs):
+                    results[title] = self._read_excel(sheet_config, excel_workbook_path, read_only, result_format,
+                                                      workbook=wb)
+                return results
+        finally:
+            if read_only or parallel:
+                wb.close()
+
+        settings = WorkerSettings(self.__class__, self._plugin.log.name, None, True, result_format, engine, False)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            # The selectors are replaced by the sheet names, so the workers read exactly the sheets found here
+            futures = [executor.submit(read_sheet, settings, ValidatedConfig(x, sheet_config='name:' + title),
+                                       excel_workbook_path) for title, x in zip(titles, sheet_configs)]
+            for title, future in zip(titles, futures):
+                results[title] = future.result()
+        return results
+
+    def _iter_excel(self, excel_config_json_path, excel_workbook_path, read_only, on_headers=None, workbook=None,
+                    report=None, engine=None, partition=None):
+        """
+        Generator behind iter_excel.
+
+        :param on_headers: Optional callable; it gets the data_type_config entries of the headers found in the
+                           worksheet (in worksheet order) before the first row is read
+        :param workbook: Optional already loaded workbook. It is used instead of loading excel_workbook_path
+                         and it is not closed.
+        :param report: Optional ValidationReport. Failed checks, which raise a ValueError otherwise, are added to
+                       the report and the rows having them are skipped.
+        :param partition: Optional SheetLayout or RowPartition of a partitioned read. It selects the data rows once
+                          the headers are found and a RowPartition records the failed checks of the rows.
+        """
+
+        stats = None
+        if self.collect_stats or self.stats_signal is not None:
+            stats = self.last_stats = ReadStats(excel_workbook_path)
+            stats.start_phase('config')
 
         # The exceptions raised in this method shall be raised to the plugin level
-        self.excel_config = self._validate_json(excel_config_json_path)
+        self.excel_config = self._load_config(excel_config_json_path)
 
         #########################
         # Get index configuration
@@ -101,19 +753,19 @@ class ExcelValidationPlugin:
         if type(corr_header_idx_cfg_row_first) is not int:
             # Assume the user wants to use the first row as header row
             corr_header_idx_cfg_row_first = 1
-            self._plugin.log.debug("Config update: Setting headers_index_config -> {0}_index -> first to 1".format(
+            self._log(logging.DEBUG, "Config update: Setting headers_index_config -> {0}_index -> first to 1".format(
                 oriented_row_text))
 
         if type(corr_header_idx_cfg_row_last) is not int:
             # Only 1 header row is supported currently, set last header row to first header row
             corr_header_idx_cfg_row_last = corr_header_idx_cfg_row_first
-            self._plugin.log.debug("Config update: Setting headers_index_config -> {0}_index -> last to {1}".format(
+            self._log(logging.DEBUG, "Config update: Setting headers_index_config -> {0}_index -> last to {1}".format(
                 oriented_row_text, corr_header_idx_cfg_row_first))
 
         if type(corr_header_idx_cfg_col_first) is not int:
             # Assume the user wants to start at the first column
             corr_header_idx_cfg_col_first = 1
-            self._plugin.log.debug("Config update: Setting headers_index_config -> {0}_index -> first to 1".format(
+            self._log(logging.DEBUG, "Config update: Setting headers_index_config -> {0}_index -> first to 1".format(
                 oriented_column_text))
 
         if type(corr_header_idx_cfg_col_last) is not int:
@@ -121,8 +773,8 @@ class ExcelValidationPlugin:
                 # We don't have a last column in the header config,
                 # so we use what we have in the data config
                 corr_header_idx_cfg_col_last = corr_data_idx_cfg_col_last
-                self._plugin.log.debug("Config update: Setting headers_index_config -> {0}_index -> first to "
-                                       "{1}".format(oriented_column_text, corr_header_idx_cfg_col_last))
+                self._log(logging.DEBUG, "Config update: Setting headers_index_config -> {0}_index -> first to "
+                          "{1}".format(oriented_column_text, corr_header_idx_cfg_col_last))
 
         ###################################
         # Set defaults of data_index_config
@@ -130,7 +782,7 @@ class ExcelValidationPlugin:
         if type(corr_data_idx_cfg_row_first) is not int:
             # Assume the first data row is the next after corr_header_idx_cfg_row_last
             corr_data_idx_cfg_row_first = corr_header_idx_cfg_row_last + 1
-            self._plugin.log.debug("Config update: Setting data_index_config -> {0}_index -> first to {1}".format(
+            self._log(logging.DEBUG, "Config update: Setting data_index_config -> {0}_index -> first to {1}".format(
                 oriented_row_text, corr_data_idx_cfg_row_first))
 
         # corr_data_idx_cfg_row_last has no defaults - the user input is master
@@ -138,7 +790,7 @@ class ExcelValidationPlugin:
         if type(corr_data_idx_cfg_col_first) is not int:
             # Assume the first data column is equal to the first header column
             corr_data_idx_cfg_col_first = corr_header_idx_cfg_col_first
-            self._plugin.log.debug("Config update: Setting data_index_config -> {0}_index -> first to {1}".format(
+            self._log(logging.DEBUG, "Config update: Setting data_index_config -> {0}_index -> first to {1}".format(
                 oriented_column_text, corr_data_idx_cfg_col_first))
 
         if type(corr_data_idx_cfg_col_last) is not int:
@@ -146,8 +798,8 @@ class ExcelValidationPlugin:
                 # We don't have a last column in the data config,
                 # so we use what we have in the header config
                 corr_data_idx_cfg_col_last = corr_header_idx_cfg_col_last
-                self._plugin.log.debug("Config update: Setting data_index_config -> {0}_index -> last to "
-                                       "{1}".format(oriented_column_text, corr_data_idx_cfg_col_last))
+                self._log(logging.DEBUG, "Config update: Setting data_index_config -> {0}_index -> last to "
+                          "{1}".format(oriented_column_text, corr_data_idx_cfg_col_last))
 
         ################################
         # Some more logic checks on rows
@@ -202,412 +854,306 @@ class ExcelValidationPlugin:
                         "contain the value 'automatic'.".format(oriented_column_text,
                                                                 corr_data_idx_cfg_col_last))
 
-        #########################################
-        # Set defaults for optional config values
-        #########################################
-        if 'sheet_config' not in self.excel_config:
-            self.excel_config['sheet_config'] = 'active'
-
-        for data_type_config in self.excel_config['data_type_config']:
-            # default for possible problems should be strict if user tells nothing
-            if 'fail_on_type_error' not in data_type_config:
-                data_type_config['fail_on_type_error'] = True
-            if 'fail_on_empty_cell' not in data_type_config:
-                data_type_config['fail_on_empty_cell'] = True
-            if 'fail_on_header_not_found' not in data_type_config:
-                data_type_config['fail_on_header_not_found'] = True
-
-            # default type is automatic
-            if 'type' not in data_type_config:
-                data_type_config['type'] = {'base': 'automatic'}
-
-        # Set global filter properties
-        # Defensive variant is True for all options
-        if 'filter_properties' not in self.excel_config:
-            self.excel_config['filter_properties'] = {}
-        if 'excluded_fail_on_type_error' not in self.excel_config['filter_properties']:
-            self.excel_config['filter_properties']['excluded_fail_on_type_error'] = True
-        if 'excluded_fail_on_empty_cell' not in self.excel_config['filter_properties']:
-            self.excel_config['filter_properties']['excluded_fail_on_empty_cell'] = True
-        if 'excluded_enable_logging' not in self.excel_config['filter_properties']:
-            self.excel_config['filter_properties']['excluded_enable_logging'] = True
+        ##########################################
+        # Compile the data types into validators
+        ##########################################
+        validators = {x['header']: compile_validator(x, self._log, orientation)
+                      for x in self.excel_config['data_type_config']}
 
         ############################
         # Get the workbook and sheet
         ############################
-        wb = openpyxl.load_workbook(excel_workbook_path, data_only=True)
-        ws = self._get_sheet(wb)
-
-        #############################
-        # Determine header row length
-        #############################
-        if type(corr_header_idx_cfg_col_last) == int:
-            # corr_header_idx_cfg_col_last already has the final value
-            pass
-        elif corr_header_idx_cfg_col_last == 'automatic':
-            # automatic: use the length of the header row
-            corr_header_idx_cfg_col_last = len(
-                ws[self._transform_coordinates(row=corr_header_idx_cfg_row_first)])
-            self._plugin.log.debug("Config update: Last header {0} was set to {1} using the 'automatic' "
-                                   "mechanism.".format(oriented_column_text, corr_header_idx_cfg_col_last))
+        if workbook is not None:
+            wb = workbook
+            read_only = workbook.read_only
         else:
-            # severalEmptyCells chosen
-            target_empty_cell_count = int(corr_header_idx_cfg_col_last.split(':')[1])
-            empty_cell_count = 0
-            curr_column = corr_header_idx_cfg_col_first
-            while empty_cell_count < target_empty_cell_count:
-                value = ws[self._transform_coordinates(corr_header_idx_cfg_row_first,
-                                                       curr_column)].value
-                if value is None:
-                    empty_cell_count += 1
-                curr_column += 1
-            corr_header_idx_cfg_col_last = curr_column - target_empty_cell_count - 1
-            self._plugin.log.debug("Config update: Last header {0} was set to {1} using the 'automatic' "
-                                   "mechanism.".format(oriented_column_text, corr_header_idx_cfg_col_last))
-
-        ###################################
-        # Determine header column locations
-        ###################################
-        spreadsheet_headers2columns = {}
-        for column in range(corr_header_idx_cfg_col_first, corr_header_idx_cfg_col_last + 1):
-            value = ws[self._transform_coordinates(corr_header_idx_cfg_row_first, column)].value
-            if value is not None:
-                spreadsheet_headers2columns[value] = column
+            if read_only is None:
+                read_only = self.excel_config['read_only']
+            if engine is None:
+                engine = self.excel_config['engine']
+            if stats is not None:
+                stats.start_phase('load_workbook')
+            wb = self._load_workbook(excel_workbook_path, read_only, engine)
+            read_only = wb.read_only
+        try:
+            ws = self._get_sheet(wb)
+            if stats is not None:
+                stats.start_phase('headers')
+                stats.sheet = ws.title
+                try:
+                    stats.workbook_size = os.path.getsize(excel_workbook_path)
+                except (OSError, TypeError):
+                    # A file-like object or a workbook without file
+                    pass
+            if isinstance(ws, CsvWorksheet):
+                reader = CsvWorksheetReader(ws, orientation)
+            elif read_only:
+                reader = ReadOnlyWorksheetReader(ws, orientation)
             else:
-                # if the value is None we have either
-                # - one or more empty header cell in between 2 filled header cells.
-                # - some empty header cells at the end of the row.
-                #   That might happen because when choosing 'automatic' header row detection, openpyxl functionality
-                #   is used. It always returns the length of the longest row in the whole sheet.
-                #   If that is not the header row, we have empty cells at the end of the header row.
-                #   However, that is not a problem as header values 'None' are not added.
+                reader = WorksheetReader(ws, orientation)
+
+            #############################
+            # Determine header row length
+            #############################
+            header_values = reader.iter_line(corr_header_idx_cfg_row_first, corr_header_idx_cfg_col_first)
+            header_values_read = []
+            if type(corr_header_idx_cfg_col_last) == int:
+                # corr_header_idx_cfg_col_last already has the final value
                 pass
-        spreadsheet_headers = spreadsheet_headers2columns.keys()
-
-        ###############################################################
-        # Check for not existing headers on spreadsheet and config side
-        ###############################################################
-        # Build a data_type_config dictionary with header as key
-        config_header_dict = {x['header']: x for x in self.excel_config['data_type_config']}
-
-        # Check: Are config data_type_config headers unique?
-        if len(config_header_dict.keys()) != len(set(config_header_dict.keys())):
-            self._raise_value_error("Config error: data_type_config -> header duplicate entries found.")
-
-        # Check for configured headers not found in spreadsheet
-        missing_headers_in_spreadsheet = list(set(config_header_dict.keys()) - set(spreadsheet_headers))
-        for header in missing_headers_in_spreadsheet:
-            # Check if the fail_on_header_not_found is true
-            data_type = [x for x in self.excel_config['data_type_config'] if x['header'] == header][0]
-            msg = u"Config error: The header '{0}' could not be found in the spreadsheet.".format(header)
-            if data_type['fail_on_header_not_found']:
-                self._raise_value_error(msg)
+            elif corr_header_idx_cfg_col_last == 'automatic':
+                # automatic: use the length of the header row
+                corr_header_idx_cfg_col_last = reader.last_column(corr_header_idx_cfg_row_first)
+                self._log(logging.DEBUG, "Config update: Last header {0} was set to {1} using the 'automatic' "
+                          "mechanism.".format(oriented_column_text, corr_header_idx_cfg_col_last))
             else:
-                self._plugin.log.error(msg)
-
-        # Check for spreadsheet headers not found in config
-        missing_headers_in_config = list(set(spreadsheet_headers) - set(config_header_dict.keys()))
-        if missing_headers_in_config:
-            self._plugin.log.debug(u"The following spreadsheet headers are not configured for reading: {0}".format(
-                ', '.join([header.replace('\n', ' ') for header in missing_headers_in_config])))
-            for header in missing_headers_in_config:
-                del spreadsheet_headers2columns[header]
-
-        #########################
-        # Determine last data row
-        #########################
-        if type(corr_data_idx_cfg_row_last) == int:
-            # do nothing, the value is already set
-            pass
-        elif corr_data_idx_cfg_row_last == 'automatic':
-            # Take data from library
-            corr_data_idx_cfg_row_last = corr_data_idx_cfg_row_first
-            for curr_column in range(corr_header_idx_cfg_col_first,
-                                     corr_header_idx_cfg_col_last):
-                len_curr_column = len(ws[self._transform_coordinates(column=curr_column)])
-                if len_curr_column > corr_data_idx_cfg_row_last:
-                    corr_data_idx_cfg_row_last = len_curr_column
-            self._plugin.log.debug("Config update: Last data {0} was set to {1} using the 'automatic' "
-                                   "mechanism.".format(oriented_row_text, corr_data_idx_cfg_row_last))
-        else:
-            # severalEmptyCells is chosen
-            target_empty_rows_count = int(corr_data_idx_cfg_row_last.split(':')[1])
-            last_row_detected = False
-            curr_row = corr_data_idx_cfg_row_first
-            empty_rows_count = 0
-            while not last_row_detected:
-                # go through rows
-                all_columns_empty = True
-                for header in spreadsheet_headers2columns:
-                    curr_column = spreadsheet_headers2columns[header]
-                    value = ws[self._transform_coordinates(curr_row, curr_column)].value
-                    if value is not None:
-                        all_columns_empty = False
-                        break
-                if all_columns_empty:
-                    empty_rows_count += 1
-                if empty_rows_count >= target_empty_rows_count:
-                    last_row_detected = True
+                # severalEmptyCells chosen
+                target_empty_cell_count = int(corr_header_idx_cfg_col_last.split(':')[1])
+                empty_cell_count = 0
+                curr_column = corr_header_idx_cfg_col_first
+                while empty_cell_count < target_empty_cell_count:
+                    value = next(header_values)
+                    header_values_read.append(value)
+                    if value is None:
+                        empty_cell_count += 1
+                    curr_column += 1
+                corr_header_idx_cfg_col_last = curr_column - target_empty_cell_count - 1
+                self._log(logging.DEBUG, "Config update: Last header {0} was set to {1} using the 'automatic' "
+                          "mechanism.".format(oriented_column_text, corr_header_idx_cfg_col_last))
+
+            ###################################
+            # Determine header column locations
+            ###################################
+            header_values = itertools.chain(header_values_read, header_values)
+            spreadsheet_headers2columns = {}
+            for column in range(corr_header_idx_cfg_col_first, corr_header_idx_cfg_col_last + 1):
+                value = next(header_values)
+                if value is not None:
+                    spreadsheet_headers2columns[value] = column
                 else:
-                    curr_row += 1
-            corr_data_idx_cfg_row_last = curr_row - target_empty_rows_count
-            self._plugin.log.debug("Config update: Last data {0} was set to {1} using the 'severalEmptyCells' "
-                                   "mechanism.".format(oriented_row_text, corr_data_idx_cfg_row_last))
-
-        #################################################
-        # Go through the rows, read and validate the data
-        #################################################
-        final_dict = {}
-        for curr_row in range(corr_data_idx_cfg_row_first, corr_data_idx_cfg_row_last + 1):
-            # Go through rows
-            final_dict[curr_row] = {}
-
-            msg_queue = {
-                'fail_on_empty_cell': {
-                    'exceptions': [],
-                    'logs': []
-                },
-                'fail_on_type_error': {
-                    'exceptions': [],
-                    'logs': []
-                }
-            }
-            is_row_excluded = False
-
-            for header in spreadsheet_headers2columns:
-                # Go through columns
-                curr_column = spreadsheet_headers2columns[header]
-                cell_index_str = self._transform_coordinates(curr_row, curr_column)
-                value = ws[cell_index_str].value
-
-                # Start the validation
-                config_header = config_header_dict[header]
-
-                if value is None:
-                    msg = u"The '{0}' in cell {1} is empty".format(header, cell_index_str)
-                    if config_header['fail_on_empty_cell']:
-                        msg_queue['fail_on_empty_cell']['exceptions'].append(msg)
-                    else:
-                        msg_queue['fail_on_empty_cell']['logs'].append(msg)
+                    # if the value is None we have either
+                    # - one or more empty header cell in between 2 filled header cells.
+                    # - some empty header cells at the end of the row.
+                    #   That might happen because when choosing 'automatic' header row detection, openpyxl functionality
+                    #   is used. It always returns the length of the longest row in the whole sheet.
+                    #   If that is not the header row, we have empty cells at the end of the header row.
+                    #   However, that is not a problem as header values 'None' are not added.
+                    pass
+            spreadsheet_headers = spreadsheet_headers2columns.keys()
+
+            ###############################################################
+            # Check for not existing headers on spreadsheet and config side
+            ###############################################################
+            # Build a data_type_config dictionary with header as key
+            config_header_dict = {x['header']: x for x in self.excel_config['data_type_config']}
+
+            # Check: Are config data_type_config headers unique?
+            if len(config_header_dict.keys()) != len(set(config_header_dict.keys())):
+                self._raise_value_error("Config error: data_type_config -> header duplicate entries found.")
+
+            # Check for configured headers not found in spreadsheet
+            missing_headers_in_spreadsheet = list(set(config_header_dict.keys()) - set(spreadsheet_headers))
+            for header in missing_headers_in_spreadsheet:
+                # Check if the fail_on_header_not_found is true
+                data_type = [x for x in self.excel_config['data_type_config'] if x['header'] == header][0]
+                msg = u"Config error: The header '{0}' could not be found in the spreadsheet.".format(header)
+                if stats is not None:
+                    stats.violations['header_not_found'] += 1
+                if data_type['fail_on_header_not_found']:
+                    error = CellError(None, None, header, 'header_not_found', None, 'fail_on_header_not_found',
+                                      message=msg)
+                    if not self._fail(error, report):
+                        report.complete = False
+                        return
                 else:
-                    if config_header['type']['base'] == 'automatic':
-                        pass
-                    elif config_header['type']['base'] == 'date':
-                        if not isinstance(value, datetime.datetime):
-                            msg = u'The value {0} in cell {1} is of type {2}; required by ' \
-                                  u'specification is datetime'.format(value, cell_index_str, type(value))
-                            if config_header['fail_on_type_error']:
-                                msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                            else:
-                                msg_queue['fail_on_type_error']['logs'].append(msg)
-                    elif config_header['type']['base'] == 'enum':
-                        filtered_enum_values = []
-                        if 'filter' in config_header['type']:
-                            filtered_enum_values = config_header['type']['filter']['whitelist_values']
-                        if not self._is_string(value):
-                            msg = u'The value {0} in cell {1} is of type {2}; required by ' \
-                                  u'specification is a string type (enum)'.format(value, cell_index_str, type(value))
-                            if config_header['fail_on_type_error']:
-                                msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                            else:
-                                msg_queue['fail_on_type_error']['logs'].append(msg)
-                            if filtered_enum_values:
-                                msg = 'Cannot apply enum filter to cell {1} because the type check failed.'
-                                self._plugin.log.error(msg)
-                        else:
-                            valid_values = config_header['type']['enum_values']
-                            if value not in valid_values:
-                                msg = u'The value {0} in cell {1} is not contained in the given enum ' \
-                                      u'[{2}]'.format(value, cell_index_str, ', '.join(valid_values))
-                                if config_header['fail_on_type_error']:
-                                    msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                                else:
-                                    msg_queue['fail_on_type_error']['logs'].append(msg)
-                                if filtered_enum_values:
-                                    msg = 'Cannot apply enum filter to cell {1} because the enum values check failed.'
-                                    self._plugin.log.error(msg)
-                            else:
-                                if filtered_enum_values and value not in filtered_enum_values:
-                                    is_row_excluded = True
-                                    self._plugin.log.debug(u"The {0} {1} was excluded due to an exclude filter on "
-                                                           u"cell {2} ({3} not in [{4}]).".format(
-                                                               oriented_row_text,
-                                                               curr_row,
-                                                               cell_index_str,
-                                                               value,
-                                                               ', '.join(filtered_enum_values)))
-
-                    elif config_header['type']['base'] == 'float':
-                        # TODO Allow int, too
-                        if not isinstance(value, float):
-                            msg = u'The value {0} in cell {1} is of type {2}; required by ' \
-                                  u'specification is float'.format(value, cell_index_str, type(value))
-                            if config_header['fail_on_type_error']:
-                                msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                            else:
-                                msg_queue['fail_on_type_error']['logs'].append(msg)
-                        else:
-                            if 'minimum' in config_header['type']:
-                                if value < config_header['type']['minimum']:
-                                    msg = u'The value {0} in cell {1} is smaller than the given minimum ' \
-                                          u'of {2}'.format(value, cell_index_str, config_header['type']['minimum'])
-                                    if config_header['fail_on_type_error']:
-                                        msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                                    else:
-                                        msg_queue['fail_on_type_error']['logs'].append(msg)
-                            if 'maximum' in config_header['type']:
-                                if value > config_header['type']['maximum']:
-                                    msg = u'The value {0} in cell {1} is greater than the given maximum ' \
-                                          u'of {2}'.format(value, cell_index_str, config_header['type']['maximum'])
-                                    if config_header['fail_on_type_error']:
-                                        msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                                    else:
-                                        msg_queue['fail_on_type_error']['logs'].append(msg)
-                    elif config_header['type']['base'] == 'integer':
-                        # Integer values stored by Excel are returned as float (e.g. 3465.0)
-                        # So we have to check if the float can be converted to int without precision loss
-                        if isinstance(value, float):
-                            if value.is_integer():
-                                # the typecast to int may return int or long, depending on the size of value
-                                value = int(value)
-                        if self._is_type_int_long(value):
-                            if 'minimum' in config_header['type']:
-                                if value < config_header['type']['minimum']:
-                                    msg = u'The value {0} in cell {1} is smaller than the given minimum ' \
-                                          u'of {2}'.format(value, cell_index_str, config_header['type']['minimum'])
-                                    if config_header['fail_on_type_error']:
-                                        msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                                    else:
-                                        msg_queue['fail_on_type_error']['logs'].append(msg)
-                            if 'maximum' in config_header['type']:
-                                if value > config_header['type']['maximum']:
-                                    msg = u'The value {0} in cell {1} is greater than the given maximum ' \
-                                          u'of {2}'.format(value, cell_index_str, config_header['type']['maximum'])
-                                    if config_header['fail_on_type_error']:
-                                        msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                                    else:
-                                        msg_queue['fail_on_type_error']['logs'].append(msg)
-                        else:
-                            msg = u'The value {0} in cell {1} is of type {2}; required by ' \
-                                  u'specification is int'.format(value, cell_index_str, type(value))
-                            if config_header['fail_on_type_error']:
-                                msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                            else:
-                                msg_queue['fail_on_type_error']['logs'].append(msg)
-
-                    elif config_header['type']['base'] == 'string':
-                        if self._is_type_numeric(value):
-                            convert_numbers = False
-                            if 'convert_numbers' in config_header['type']:
-                                convert_numbers = config_header['type']['convert_numbers']
-                            if convert_numbers:
-                                value = str(value)
-                        if not self._is_string(value):
-                            msg = u'The value {0} in cell {1} is of type {2}; required by ' \
-                                  u'specification is string'.format(value, cell_index_str, type(value))
-                            if config_header['fail_on_type_error']:
-                                msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                            else:
-                                msg_queue['fail_on_type_error']['logs'].append(msg)
-                        else:
-                            if 'pattern' in config_header['type']:
-                                if re.search(config_header['type']['pattern'], value) is None:
-                                    msg = u'The value {0} in cell {1} does not follow the ' \
-                                          u'given pattern {2}'.format(value, cell_index_str,
-                                                                      config_header['type']['pattern'])
-                                    if config_header['fail_on_type_error']:
-                                        msg_queue['fail_on_type_error']['exceptions'].append(msg)
-                                    else:
-                                        msg_queue['fail_on_type_error']['logs'].append(msg)
-
-                final_dict[curr_row][header] = value
-
-            if is_row_excluded:
-                # All messages are either raised as exception or logged
-                # If at all depends on the settings in self.excel_config['filter_properties']
-
-                for msg_type, messages in msg_queue.items():
-                    for msg in messages['exceptions']:
-                        if self.excel_config['filter_properties']['excluded_' + msg_type]:
-                            # This ends the program on the first exception message
-                            self._raise_value_error(msg)
-                        elif self.excel_config['filter_properties']['excluded_enable_logging']:
-                            # In case we don't want to raise type errors as exception
-                            # we log them in case the user configured so
-                            self._plugin.log.warn(msg)
-                    for msg in messages['logs']:
-                        if self.excel_config['filter_properties']['excluded_enable_logging']:
-                            self._plugin.log.warn(msg)
-                del final_dict[curr_row]
+                    self._log(logging.ERROR, msg)
+
+            # Check for spreadsheet headers not found in config
+            missing_headers_in_config = list(set(spreadsheet_headers) - set(config_header_dict.keys()))
+            if missing_headers_in_config:
+                self._log(logging.DEBUG, u"The following spreadsheet headers are not configured for reading: "
+                                         u"{0}".format(', '.join([header.replace('\n', ' ')
+                                                                  for header in missing_headers_in_config])))
+                for header in missing_headers_in_config:
+                    del spreadsheet_headers2columns[header]
+
+            data_headers = list(spreadsheet_headers2columns.keys())
+            data_columns = list(spreadsheet_headers2columns.values())
+            data_validators = [validators[header] for header in data_headers]
+            reader.set_column_types({column: config_header_dict[header]['type']['base']
+                                     for header, column in zip(data_headers, data_columns)})
+            if on_headers is not None:
+                on_headers([config_header_dict[header] for header in data_headers])
+
+            #########################
+            # Determine last data row
+            #########################
+            if stats is not None:
+                stats.start_phase('last_row')
+                stats.columns = len(data_columns)
+            if partition is not None:
+                rows = partition.start(reader, corr_data_idx_cfg_row_first, corr_data_idx_cfg_row_last, data_columns)
+                if rows is None:
+                    # Only the layout of the worksheet was needed
+                    return
+            elif type(corr_data_idx_cfg_row_last) is int:
+                rows = reader.iter_rows(corr_data_idx_cfg_row_first, corr_data_idx_cfg_row_last, data_columns)
+            elif corr_data_idx_cfg_row_last == 'automatic':
+                # The last row having a value in one of the configured columns.
+                # Formatted but empty cells, which extend the worksheet dimensions, are not taken into account.
+                rows = self._iter_rows_logging_last(reader.iter_populated_rows(corr_data_idx_cfg_row_first,
+                                                                               data_columns), oriented_row_text)
             else:
-                for msg_type, messages in msg_queue.items():
-                    for msg in messages['exceptions']:
-                        # This ends the program on the first exception message
-                        self._raise_value_error(msg)
-                    for msg in messages['logs']:
-                        self._plugin.log.warn(msg)
-
-        return final_dict
-
-    @staticmethod
-    def _is_string(value):
+                # severalEmptyCells is chosen
+                # The last row is detected while the rows are read, so the worksheet is only passed once
+                target_empty_rows_count = int(corr_data_idx_cfg_row_last.split(':')[1])
+                rows = self._iter_rows_until_empty(reader.iter_rows(corr_data_idx_cfg_row_first, None, data_columns),
+                                                   target_empty_rows_count, oriented_row_text)
+
+            #################################################
+            # Go through the rows, read and validate the data
+            #################################################
+            if stats is not None:
+                stats.start_phase('validation')
+                rows = stats.count_rows(rows)
+            if self._cancel_event is not None:
+                rows = check_cancelled(rows, self._cancel_event)
+            # The errors of a row; the list is reused for all rows
+            errors = []
+            for curr_row, values in rows:
+                # Go through rows
+                row_dict = {}
+                is_row_excluded = False
+
+                for header, curr_column, validator, value in zip(data_headers, data_columns, data_validators,
+                                                                 values):
+                    # Go through columns
+                    value, is_excluded = validator(value, curr_row, curr_column, errors)
+                    if is_excluded:
+                        is_row_excluded = True
+                    row_dict[header] = value
+
+                if not errors:
+                    if not is_row_excluded:
+                        yield curr_row, row_dict
+                    else:
+                        if stats is not None:
+                            stats.rows_excluded += 1
+                        if partition is not None:
+                            partition.exclude_row(curr_row)
+                    continue
+
+                if stats is not None:
+                    stats.violations.update(error.rule for error in errors)
+                    if is_row_excluded:
+                        stats.rows_excluded += 1
+                if partition is not None:
+                    is_row_failed, keep_going = partition.handle_errors(curr_row, errors, is_row_excluded)
+                else:
+                    is_row_failed, keep_going = self._handle_errors(errors, is_row_excluded, report)
+                del errors[:]
+                if is_row_failed and stats is not None:
+                    stats.rows_failed += 1
+                if not is_row_excluded and not is_row_failed:
+                    yield curr_row, row_dict
+                if not keep_going:
+                    report.complete = False
+                    return
+        finally:
+            if read_only and workbook is None:
+                # read-only workbooks keep the file open until they are closed
+                wb.close()
+            if stats is not None:
+                stats.start_phase(None)
+                if not isinstance(partition, SheetLayout):
+                    # The partitioned read sends the stats once the partitions are merged
+                    self._send_stats(stats)
+
+    def _send_stats(self, stats):
         """
-        Tests if a value is of a string type
-        Python2: unicode, str
-        Python3: str
+        Sends the ReadStats of a read with the stats_signal, if one is set.
 
-        :param value: Variable of any type
-        :return: True if value is of string type else false
+        :param stats: The ReadStats or None
         """
-        try:
-            str_type = basestring
-        except NameError:
-            str_type = str
-        return isinstance(value, str_type)
+        if stats is not None and self.stats_signal is not None:
+            self._plugin.signals.send(self.stats_signal, stats=stats)
 
-    @staticmethod
-    def _is_type_numeric(value):
+    def _load_config(self, excel_config_json_path):
         """
-        Tests if a value is of an numeric type.
-        Python2: int, long, float
-        Python3: int, float
+        Returns the validated configuration with all defaults set.
+        The configuration is taken from the config cache if the file did not change since it was validated.
 
-        :param value: Variable of any type
-        :return: True if value is of integer type else false
+        :param excel_config_json_path: The configuration json file or a configuration dictionary
+        :return: The configuration dictionary (a ValidatedConfig)
         """
-        numeric_types = (int, float)
-        try:
-            long
-            numeric_types = (int, long, float)
-        except NameError:
-            pass
+        if isinstance(excel_config_json_path, ValidatedConfig):
+            return copy.deepcopy(excel_config_json_path)
+        if isinstance(excel_config_json_path, dict):
+            excel_config = self._validate_json(excel_config_json_path)
+            self._set_config_defaults(excel_config)
+            return excel_config
 
-        return isinstance(value, numeric_types)
+        try:
+            key = file_key(excel_config_json_path)
+        except (IOError, OSError):
+            # _validate_json reports the error
+            key = None
+        if key is not None:
+            excel_config = self.config_cache.get(key)
+            if excel_config is not None:
+                return excel_config
+
+        excel_config = self._validate_json(excel_config_json_path)
+        self._set_config_defaults(excel_config)
+        if key is not None:
+            self.config_cache.put(key, excel_config)
+        return excel_config
 
     @staticmethod
-    def _is_type_int_long(value):
+    def _set_config_defaults(excel_config):
         """
-        Tests if a value is of an integer type.
-        Python2: int, long
-        Python3: int
+        Sets the defaults for optional config values.
 
-        :param value: Variable of any type
-        :return: True if value is of integer type else false
+        :param excel_config: The validated configuration dictionary, it is changed in place
         """
-        numeric_types = (int)
-        try:
-            long
-            numeric_types = (int, long)
-        except NameError:
-            pass
+        if 'sheet_config' not in excel_config:
+            excel_config['sheet_config'] = 'active'
+        if 'read_only' not in excel_config:
+            excel_config['read_only'] = False
+        if 'engine' not in excel_config:
+            excel_config['engine'] = 'openpyxl'
+
+        for data_type_config in excel_config['data_type_config']:
+            # default for possible problems should be strict if user tells nothing
+            if 'fail_on_type_error' not in data_type_config:
+                data_type_config['fail_on_type_error'] = True
+            if 'fail_on_empty_cell' not in data_type_config:
+                data_type_config['fail_on_empty_cell'] = True
+            if 'fail_on_header_not_found' not in data_type_config:
+                data_type_config['fail_on_header_not_found'] = True
+
+            # default type is automatic
+            if 'type' not in data_type_config:
+                data_type_config['type'] = {'base': 'automatic'}
 
-        return isinstance(value, numeric_types)
+        # Set global filter properties
+        # Defensive variant is True for all options
+        if 'filter_properties' not in excel_config:
+            excel_config['filter_properties'] = {}
+        if 'excluded_fail_on_type_error' not in excel_config['filter_properties']:
+            excel_config['filter_properties']['excluded_fail_on_type_error'] = True
+        if 'excluded_fail_on_empty_cell' not in excel_config['filter_properties']:
+            excel_config['filter_properties']['excluded_fail_on_empty_cell'] = True
+        if 'excluded_enable_logging' not in excel_config['filter_properties']:
+            excel_config['filter_properties']['excluded_enable_logging'] = True
 
     def _validate_json(self, excel_config_json_path):
 
         try:
-            with open(excel_config_json_path, encoding='utf-8') as file_pointer:
-                json_obj = json.load(file_pointer)
+            if isinstance(excel_config_json_path, dict):
+                json_obj = copy.deepcopy(excel_config_json_path)
+            else:
+                with open(excel_config_json_path, encoding='utf-8') as file_pointer:
+                    json_obj = json.load(file_pointer)
         # the file is not deserializable as a json object
         except ValueError as exc:
             self._plugin.log.error('Malformed JSON file: {0} \n {1}'.format(excel_config_json_path, exc))
@@ -620,9 +1166,10 @@ class ExcelValidationPlugin:
             raise OSError()
 
         # validate json object if schema file path is there; otherwise throw warning
+        # the compiled schema validator is cached
         try:
-            with open(JSON_SCHEMA_FILE_PATH) as file_pointer:
-                schema_obj = json.load(file_pointer)
+            schema_validator = self.config_cache.get_schema_validator(file_key(JSON_SCHEMA_FILE_PATH),
+                                                                      self._load_schema_validator)
         # the file is not deserializable as a json object
         except ValueError as exc:
             self._plugin.log.error('Malformed JSON schema file: {0} \n {1}'.format(JSON_SCHEMA_FILE_PATH, exc))
@@ -633,54 +1180,189 @@ class ExcelValidationPlugin:
             self._plugin.log.error(exc)
             # raise only OSError to make error handling in caller easier
             raise OSError()
-
-        # do the validation
-        try:
-            validate(json_obj, schema_obj)
-        except ValidationError as error:
-            self._plugin.log.error("Validation failed: {0}".format(error.message))
-            raise
         except SchemaError:
             self._plugin.log.error("Invalid schema file: {0}".format(JSON_SCHEMA_FILE_PATH))
             raise
 
-        return json_obj
+        # do the validation
+        error = best_match(schema_validator.iter_errors(json_obj))
+        if error is not None:
+            self._plugin.log.error("Validation failed: {0}".format(error.message))
+            raise error
+
+        return ValidatedConfig(json_obj)
+
+    @staticmethod
+    def _load_schema_validator():
+        """
+        Loads the JSON schema file and compiles the validator for it.
+
+        :return: The jsonschema validator instance
+        """
+        with open(JSON_SCHEMA_FILE_PATH) as file_pointer:
+            schema_obj = json.load(file_pointer)
+        validator_class = jsonschema_validators.validator_for(schema_obj)
+        validator_class.check_schema(schema_obj)
+        return validator_class(schema_obj)
+
+    @staticmethod
+    def _check_options(result_format='dict', engine=None, workers=None):
+        """
+        Raises a ValueError for an unknown result_format or engine argument of the read functions or an engine
+        which cannot be used by a partitioned read.
+        """
+        if result_format != 'dict' and result_format not in RESULT_FORMATS:
+            raise ValueError("Unknown result format '{0}'.".format(result_format))
+        if engine is not None and engine not in ENGINES:
+            raise ValueError("Unknown engine '{0}'.".format(engine))
+        if workers is not None and workers > 1 and engine not in (None, 'xml'):
+            raise ValueError("workers can only be used with the 'xml' engine; openpyxl would parse the sheet from "
+                             "the start in each worker.")
+
+    @staticmethod
+    def _load_workbook(excel_workbook_path, read_only, engine='openpyxl'):
+        """
+        Opens an Excel workbook or a CSV/TSV file (by its extension .csv, .tsv or .tab).
+        CSV/TSV files and workbooks opened with the 'xml' engine are always read like in read-only mode.
+        """
+        delimiter = get_csv_delimiter(excel_workbook_path)
+        if delimiter is not None:
+            return CsvWorkbook(excel_workbook_path, delimiter)
+        if engine == 'xml':
+            return XlsxWorkbook(excel_workbook_path)
+        return openpyxl.load_workbook(excel_workbook_path, read_only=read_only, data_only=True)
+
+    def _get_sheet(self, workbook, sheet_config=None):
 
-    def _get_sheet(self, workbook):
+        if sheet_config is None:
+            sheet_config = self.excel_config['sheet_config']
 
         # get sheet
         worksheet = None
-        if type(self.excel_config['sheet_config']) == int:
-            worksheet = workbook.worksheets[self.excel_config['sheet_config'] - 1]
-        elif self.excel_config['sheet_config'] == 'active':
+        if type(sheet_config) == int:
+            worksheet = workbook.worksheets[sheet_config - 1]
+        elif sheet_config == 'active':
             worksheet = workbook.active
-        elif self.excel_config['sheet_config'].startswith('name'):
-            worksheet = workbook[self.excel_config['sheet_config'].split(':')[1]]
-        elif self.excel_config['sheet_config'] == 'first':
+        elif sheet_config.startswith('name'):
+            worksheet = workbook[sheet_config.split(':')[1]]
+        elif sheet_config == 'first':
             worksheet = workbook.worksheets[0]
-        elif self.excel_config['sheet_config'] == 'last':
-            worksheet = workbook.worksheets[len(workbook.get_sheet_names()) - 1]
+        elif sheet_config == 'last':
+            worksheet = workbook.worksheets[len(workbook.sheetnames) - 1]
         else:
             # This cannot happen if json validation was ok
             pass
         return worksheet
 
+    def _handle_errors(self, errors, is_row_excluded, report):
+        """
+        Raises or logs the errors of a row.
+        The errors are handled in the order of ERROR_CHECKS; the errors to raise come before the ones to log.
+
+        :param errors: List of CellError
+        :param is_row_excluded: True if the row is excluded by a filter
+        :param report: The ValidationReport or None
+        :return: Tuple (is_row_failed, keep_going). keep_going is False if the validation shall stop.
+        """
+        filter_properties = self.excel_config['filter_properties']
+        is_row_failed = False
+        keep_going = True
+        for check in ERROR_CHECKS:
+            for error in errors:
+                if error.check != check or not error.fatal:
+                    continue
+                if not is_row_excluded:
+                    is_row_failed = True
+                    keep_going = self._fail(error, report) and keep_going
+                # All messages of excluded rows are either raised as exception or logged
+                # If at all depends on the settings in self.excel_config['filter_properties']
+                elif filter_properties['excluded_' + check]:
+                    keep_going = self._fail(error, report) and keep_going
+                elif filter_properties['excluded_enable_logging']:
+                    # In case we don't want to raise type errors as exception
+                    # we log them in case the user configured so
+                    self._warn(error.message)
+            if is_row_excluded and not filter_properties['excluded_enable_logging']:
+                continue
+            for error in errors:
+                if error.check == check and not error.fatal:
+                    self._warn(error.message)
+        return is_row_failed, keep_going
+
+    def _fail(self, error, report):
+        """
+        Raises a ValueError for a failed check or adds it to the report in report mode.
+
+        :param error: The CellError
+        :param report: The ValidationReport or None
+        :return: False if the validation shall stop
+        """
+        if report is None:
+            # This ends the program on the first exception message
+            self._raise_value_error(error.message)
+        return report.add(error)
+
+    def _log(self, level, msg, *args):
+        """
+        Logs a message of a read, which is not raised. All these messages are passed to _record_message.
+        Like with Logger.log, msg is only formatted with the %-format args if it is logged or recorded.
+        """
+        if self._record_message is None:
+            self._plugin.log.log(level, msg, *args)
+            return
+        if args:
+            msg = msg % args
+        self._plugin.log.log(level, msg)
+        self._record_message(level, msg)
+
+    def _warn(self, msg):
+        self._log(logging.WARNING, msg)
+
     def _raise_value_error(self, msg):
         self._plugin.log.error(msg)
         raise ValueError(msg.encode('UTF-8', 'ignore'))
 
     def _transform_coordinates(self, row=None, column=None):
-        if row is None and column is None:
-            raise ValueError("_transform_coordinates: row and column cannot both be None.")
-        target_str = ''
-        if self.excel_config['orientation'] == 'column_based':
-            if column is not None:
-                target_str = get_column_letter(column)
-            if row is not None:
-                target_str += str(row)
-        else:
-            if row is not None:
-                target_str = get_column_letter(row)
-            if column is not None:
-                target_str += str(column)
-        return target_str
+        return transform_coordinates(self.excel_config['orientation'], row, column)
+
+    def _iter_rows_logging_last(self, rows, oriented_row_text):
+        """
+        Passes the rows through and logs the last row once the rows are exhausted.
+        """
+        last_row = None
+        for last_row, values in rows:
+            yield last_row, values
+        self._log(logging.DEBUG, "Config update: Last data {0} was set to {1} using the 'automatic' "
+                  "mechanism.".format(oriented_row_text, last_row))
+
+    def _iter_rows_until_empty(self, rows, target_empty_rows_count, oriented_row_text):
+        """
+        Implements the severalEmptyCells mechanism for the last data row on an endless row iterator.
+        The last row is reached if target_empty_rows_count empty rows were found. The rows are buffered until it is
+        clear that they are not beyond the last row, so each row is read only once.
+
+        :param rows: Endless iterator of (row, values) tuples
+        :param target_empty_rows_count: The number of empty rows that ends the data
+        :param oriented_row_text: 'row' or 'column', used for log messages
+        :return: Generator of (row, values) tuples up to the last data row
+        """
+        pending_rows = collections.deque()
+        empty_rows_count = 0
+        for curr_row, values in rows:
+            if all(value is None for value in values):
+                empty_rows_count += 1
+            if empty_rows_count >= target_empty_rows_count:
+                last_row = curr_row - target_empty_rows_count
+                self._log(logging.DEBUG, "Config update: Last data {0} was set to {1} using the 'severalEmptyCells' "
+                          "mechanism.".format(oriented_row_text, last_row))
+                for pending_row, pending_values in pending_rows:
+                    if pending_row <= last_row:
+                        yield pending_row, pending_values
+                if curr_row <= last_row:
+                    # Only possible for severalEmptyCells:0
+                    yield curr_row, values
+                return
+            pending_rows.append((curr_row, values))
+            while len(pending_rows) >= target_empty_rows_count:
+                # This row is before the last row in any case
+                yield pending_rows.popleft()
@@ -0,0 +1,162 @@
+"""
+Row-range partitioning of a single worksheet for parallel validation
+"""
+
+# Partitions get at least this number of data rows, smaller sheets are read by fewer workers
+MIN_PARTITION_ROWS = 10000
+
+
+class SheetLayout(object):
+    """
+    Collects the layout of a worksheet from a first pass: the first data row and the configured and the real last
+    data row. Only the data columns are read to find an 'automatic' or 'severalEmptyCells' last data row like the
+    serial read does; the pass ends before the data rows are validated.
+    """
+
+    def __init__(self):
+        self.row_first = None
+        #: The configured last data row: an integer, 'automatic' or 'severalEmptyCells:<n>'
+        self.row_last = None
+        #: The last data row found by the configured mechanism
+        self.last_row = None
+
+    def start(self, reader, row_first, row_last, columns):
+        """
+        Called by the plugin once the headers are found.
+
+        :return: None, no rows are validated
+        """
+        self.row_first = row_first
+        self.row_last = row_last
+        if type(row_last) is int:
+            self.last_row = row_last
+        elif row_last == 'automatic':
+            # At least the first row is yielded
+            for self.last_row, _ in reader.iter_populated_rows(row_first, columns):
+                pass
+        else:
+            self.last_row = self._find_several_empty_cells(reader.iter_rows(row_first, None, columns),
+                                                           int(row_last.split(':')[1]))
+        return None
+
+    @staticmethod
+    def _find_several_empty_cells(rows, target_empty_rows_count):
+        """
+        :param rows: Endless iterator of (row, values) tuples
+        :param target_empty_rows_count: The number of empty rows that ends the data
+        :return: The row before the row with the n-th empty row, see _iter_rows_until_empty of the plugin
+        """
+        empty_rows_count = 0
+        for curr_row, values in rows:
+            if all(value is None for value in values):
+                empty_rows_count += 1
+            if empty_rows_count >= target_empty_rows_count:
+                return curr_row - target_empty_rows_count
+
+    @property
+    def row_span(self):
+        """
+        :return: Tuple of the first and last data row
+        """
+        return self.row_first, self.last_row
+
+
+class RowPartition(object):
+    """
+    Reads a range of data rows in a worker. The rows are validated as usual, but the failed checks and the log
+    messages of the rows are recorded instead of raised or logged, so the plugin can handle them in row order when
+    the partitions are merged.
+    """
+
+    def __init__(self, row_first, row_last):
+        """
+        :param row_first: The first oriented row of the range
+        :param row_last: The last oriented row of the range
+        """
+        self.row_first = row_first
+        self.row_last = row_last
+        #: Lists [row, data or None, errors or None, is_row_excluded, messages or None] of the rows with data,
+        #: errors, log messages or an exclusion, in row order. messages are (level, message) tuples.
+        self.entries = []
+        # The row being validated; None while the headers are read
+        self._row = None
+
+    def start(self, reader, row_first, row_last, columns):
+        """
+        Called by the plugin once the headers are found.
+
+        :return: Iterator of the (row, values) tuples of the range
+        """
+        return self._watch(reader.iter_rows(self.row_first, self.row_last, columns))
+
+    def _watch(self, rows):
+        for row, values in rows:
+            self._row = row
+            yield row, values
+
+    def _entry(self, row):
+        """
+        :return: The entry of the row, which is added if it does not exist yet
+        """
+        entries = self.entries
+        if not entries or entries[-1][0] != row:
+            entries.append([row, None, None, False, None])
+        return entries[-1]
+
+    def record_message(self, level, msg):
+        """
+        Records a log message of the current row. Messages logged while the headers are read are dropped, the first
+        pass of the partitioned read logs them.
+
+        :param level: The logging level
+        :param msg: The message
+        """
+        if self._row is None:
+            return
+        entry = self._entry(self._row)
+        if entry[4] is None:
+            entry[4] = []
+        entry[4].append((level, msg))
+
+    def handle_errors(self, row, errors, is_row_excluded):
+        """
+        Records the errors of a row. Same signature and result as the plugin's _handle_errors.
+
+        :return: Tuple (is_row_failed, keep_going)
+        """
+        entry = self._entry(row)
+        entry[2] = list(errors)
+        entry[3] = is_row_excluded
+        return not is_row_excluded and any(error.fatal for error in errors), True
+
+    def exclude_row(self, row):
+        """
+        Records a row without failed checks, which is excluded by a filter.
+        """
+        self._entry(row)[3] = True
+
+    def add_row(self, row, row_dict):
+        """
+        Records a validated row.
+        """
+        self._entry(row)[1] = row_dict
+
+
+def split_rows(row_first, row_last, parts, min_rows=None):
+    """
+    Splits rows into contiguous ranges of about the same size.
+
+    :param row_first: The first row
+    :param row_last: The last row
+    :param parts: The maximum number of ranges
+    :param min_rows: The minimum number of rows per range, MIN_PARTITION_ROWS if None
+    :return: List of (first, last) tuples in row order
+    """
+    if min_rows is None:
+        min_rows = MIN_PARTITION_ROWS
+    count = row_last - row_first + 1
+    if count <= 1:
+        return [(row_first, row_last)]
+    parts = max(1, min(parts, count // max(min_rows, 1)))
+    size = -(-count // parts)
+    return [(first, min(first + size - 1, row_last)) for first in range(row_first, row_last + 1, size)]
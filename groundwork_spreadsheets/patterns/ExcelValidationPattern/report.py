@@ -0,0 +1,128 @@
+"""
+Validation errors and the validation report of the Excel validation pattern
+"""
+
+
+class CellError(object):
+    """
+    A failed check. The Excel coordinate and the message are only built when they are accessed, e.g. when the error
+    is raised or logged.
+
+    rule is one of 'empty_cell', 'type', 'enum', 'minimum', 'maximum', 'pattern' and 'header_not_found'.
+    row, column and coordinate are None for headers, which are not found in the worksheet.
+    """
+
+    __slots__ = ('row', 'column', 'header', 'rule', 'value', 'check', 'fatal', '_validator', '_coordinate',
+                 '_message')
+
+    def __init__(self, row, column, header, rule, value, check=None, fatal=True, validator=None, message=None):
+        """
+        :param row: The oriented row index
+        :param column: The oriented column index
+        :param header: The header of the column
+        :param rule: The failed rule
+        :param value: The cell value
+        :param check: The setting which decides about raising or logging: 'fail_on_empty_cell', 'fail_on_type_error'
+                      or 'fail_on_header_not_found'
+        :param fatal: True if the error is raised, False if it is logged
+        :param validator: The column validator, which builds the coordinate and the message
+        :param message: The message, if it is not built by the validator
+        """
+        self.row = row
+        self.column = column
+        self.header = header
+        self.rule = rule
+        self.value = value
+        self.check = check
+        self.fatal = fatal
+        self._validator = validator
+        self._coordinate = None
+        self._message = message
+
+    @property
+    def coordinate(self):
+        """
+        :return: The Excel coordinate of the cell (e.g. 'B3') or None
+        """
+        if self.row is None:
+            return None
+        if self._coordinate is None:
+            self._coordinate = self._validator.coordinate(self.row, self.column)
+        return self._coordinate
+
+    @property
+    def message(self):
+        """
+        :return: The message of the error
+        """
+        if self._message is None:
+            self._message = self._validator.format_message(self)
+        return self._message
+
+    def __getstate__(self):
+        # The validator is not picklable; the coordinate and the message are built before
+        return (self.row, self.column, self.header, self.rule, self.value, self.check, self.fatal, self.coordinate,
+                self.message)
+
+    def __setstate__(self, state):
+        (self.row, self.column, self.header, self.rule, self.value, self.check, self.fatal, self._coordinate,
+         self._message) = state
+        self._validator = None
+
+    def _astuple(self):
+        return self.row, self.column, self.coordinate, self.header, self.rule, self.value, self.message
+
+    def __eq__(self, other):
+        if not isinstance(other, CellError):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return ('CellError(row={0!r}, column={1!r}, coordinate={2!r}, header={3!r}, rule={4!r}, value={5!r}, '
+                'message={6!r})'.format(*self._astuple()))
+
+
+class ValidationReport(object):
+    """
+    Result of validate_excel: the data of the valid rows and the errors found in the worksheet.
+    """
+
+    def __init__(self, max_errors=None, stop_at_max_errors=False):
+        """
+        :param max_errors: The maximum number of errors kept in the report. None keeps all errors.
+        :param stop_at_max_errors: If True, the validation stops as soon as max_errors errors are found
+        """
+        self.max_errors = max_errors
+        self.stop_at_max_errors = stop_at_max_errors
+        # The result of read_excel without the rows having errors
+        self.data = None
+        self.errors = []
+        # The number of errors found, including the ones not kept because of max_errors
+        self.error_count = 0
+        # False if the validation stopped before the end of the worksheet
+        self.complete = True
+
+    @property
+    def is_valid(self):
+        """
+        :return: True if no errors were found
+        """
+        return self.error_count == 0
+
+    def add(self, error):
+        """
+        Adds an error.
+
+        :param error: The CellError
+        :return: False if the validation shall stop
+        """
+        self.error_count += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append(error)
+        return not (self.stop_at_max_errors and self.max_errors is not None and self.error_count >= self.max_errors)
@@ -0,0 +1,154 @@
+"""
+Persistent cache of read results for the Excel validation pattern
+"""
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+
+# Part of every key; a new version invalidates the entries written by older versions of the package
+CACHE_VERSION = 4
+
+# The entries are ordered by a counter of their last use instead of a timestamp, which might not be unique
+NEXT_USE = 'SELECT COALESCE(MAX(last_used), 0) + 1 FROM results'
+
+# Size of the blocks in which the workbook files are hashed
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    """
+    :param path: Path to a file
+    :return: The SHA-256 hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file_pointer:
+        for block in iter(lambda: file_pointer.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def config_hash(excel_config):
+    """
+    :param excel_config: The validated configuration with all defaults applied
+    :return: The SHA-256 hex digest of the configuration in a normalized JSON form
+    """
+    normalized = json.dumps(excel_config, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ResultCache(object):
+    """
+    Size bounded LRU cache of read results in an SQLite file, shared by all processes using the same file.
+
+    The entries are keyed by a hash of the workbook content, a hash of the validated configuration, the arguments
+    changing the result (e.g. the result format) and the read_only mode and engine of the read. A changed workbook
+    or configuration gets a new key, so outdated entries are never returned; they are evicted when the cache grows
+    beyond max_size.
+    The results are stored together with the messages logged while reading.
+    """
+
+    def __init__(self, path, max_size=256 * 2 ** 20):
+        """
+        :param path: Path of the SQLite file; it is created if it does not exist
+        :param max_size: The maximum total size of the stored results in bytes. 0 disables the cache.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with self._transaction() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS results '
+                               '(key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, '
+                               'last_used INTEGER NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # A connection per operation, so the cache can be used by several threads and processes
+        with self._lock:
+            connection = sqlite3.connect(self.path, timeout=30)
+            try:
+                with connection:
+                    yield connection
+            finally:
+                connection.close()
+
+    @staticmethod
+    def make_key(excel_workbook_path, excel_config, variant, read_only, engine):
+        """
+        Builds the key of a read.
+
+        :param excel_workbook_path: Path to the workbook as str or os.PathLike object
+        :param excel_config: The validated configuration with all defaults applied
+        :param variant: Tuple of the arguments changing the result, e.g. ('read_excel', 'dict')
+        :param read_only: The read_only mode the workbook is read in, after applying the configuration
+        :param engine: The engine the workbook is read with, after applying the configuration
+        :return: The key as hex string
+        """
+        key = json.dumps([CACHE_VERSION, file_hash(os.fspath(excel_workbook_path)), config_hash(excel_config),
+                          variant, bool(read_only), engine], default=str)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        :param key: The key of the read, see make_key
+        :return: Tuple (result, list of (level, message) tuples of the logged messages) or None
+        """
+        with self._transaction() as connection:
+            row = connection.execute('SELECT data FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                connection.execute('UPDATE results SET last_used = ({0}) WHERE key = ?'.format(NEXT_USE), (key,))
+        if row is None:
+            return None
+        return pickle.loads(row[0])
+
+    def put(self, key, result, messages):
+        """
+        Stores a result. The least recently used entries are dropped while the cache is larger than max_size.
+
+        :param key: The key of the read, see make_key
+        :param result: The result of the read
+        :param messages: List of (level, message) tuples of the messages logged while reading
+        """
+        data = pickle.dumps((result, list(messages)), pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_size:
+            return
+        with self._transaction() as connection:
+            connection.execute('INSERT OR REPLACE INTO results (key, data, size, last_used) '
+                               'VALUES (?, ?, ?, ({0}))'.format(NEXT_USE), (key, sqlite3.Binary(data), len(data)))
+            total_size = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            if total_size > self.max_size:
+                for old_key, size in connection.execute('SELECT key, size FROM results WHERE key != ? '
+                                                        'ORDER BY last_used', (key,)).fetchall():
+                    connection.execute('DELETE FROM results WHERE key = ?', (old_key,))
+                    total_size -= size
+                    if total_size <= self.max_size:
+                        break
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM results')
+
+    def info(self):
+        """
+        :return: Dictionary with the hit and miss counters of this instance, the number of entries and the current
+                 and maximum size in bytes
+        """
+        with self._transaction() as connection:
+            entries, size = connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'size': size,
+                'max_size': self.max_size}
+
+    def __repr__(self):
+        return '{0}({1!r}, max_size={2})'.format(self.__class__.__name__, os.path.abspath(self.path), self.max_size)
@@ -0,0 +1,305 @@
+"""
+Alternative result formats of read_excel
+"""
+import collections
+import collections.abc
+import datetime
+import functools
+import operator
+import sys
+from array import array
+
+# Dates are stored as microseconds since this epoch
+DATE_EPOCH = datetime.datetime(1900, 1, 1)
+ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Marker for values that cannot be stored in the typed storage of a column
+NOT_ENCODABLE = object()
+
+
+class Column(object):
+    """
+    The values of one header in the order of the included rows, stored in a list.
+    """
+
+    # Type code of the array used as storage, None for a list
+    typecode = None
+
+    def __init__(self):
+        self.data = [] if self.typecode is None else array(self.typecode)
+
+    @property
+    def is_typed(self):
+        """
+        :return: True if the values are stored in a typed array
+        """
+        return isinstance(self.data, array)
+
+    def encode(self, value):
+        """
+        :return: The value as stored in the typed array or NOT_ENCODABLE
+        """
+        return NOT_ENCODABLE
+
+    def decode(self, value):
+        """
+        :return: The value as stored in the typed array converted back
+        """
+        return value
+
+    def append(self, value):
+        """
+        Appends a value. If the value does not fit the typed storage (e.g. an empty cell or a type error that was
+        only logged), the column falls back to a list.
+        """
+        if isinstance(self.data, array):
+            encoded = self.encode(value)
+            if encoded is not NOT_ENCODABLE:
+                try:
+                    self.data.append(encoded)
+                    return
+                except OverflowError:
+                    pass
+            self.data = [self.decode(x) for x in self.data]
+        self.data.append(value)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        if isinstance(self.data, array):
+            return (self.decode(x) for x in self.data)
+        return iter(self.data)
+
+    def __getitem__(self, index):
+        if not isinstance(self.data, array):
+            return self.data[index]
+        if isinstance(index, slice):
+            return [self.decode(x) for x in self.data[index]]
+        return self.decode(self.data[index])
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, list(self))
+
+
+class IntegerColumn(Column):
+    """
+    Column of the 'integer' base type, stored in a 64 bit integer array.
+    """
+
+    typecode = 'q'
+
+    def encode(self, value):
+        return value if type(value) is int else NOT_ENCODABLE
+
+
+class FloatColumn(Column):
+    """
+    Column of the 'float' base type, stored in a double array.
+    """
+
+    typecode = 'd'
+
+    def encode(self, value):
+        return value if type(value) is float else NOT_ENCODABLE
+
+
+class DateColumn(Column):
+    """
+    Column of the 'date' base type, stored as microseconds since 1900-01-01 in a 64 bit integer array.
+    """
+
+    typecode = 'q'
+
+    def encode(self, value):
+        if type(value) is not datetime.datetime or value.tzinfo is not None:
+            return NOT_ENCODABLE
+        return (value - DATE_EPOCH) // ONE_MICROSECOND
+
+    def decode(self, value):
+        return DATE_EPOCH + datetime.timedelta(microseconds=value)
+
+
+COLUMN_CLASSES = {
+    'integer': IntegerColumn,
+    'float': FloatColumn,
+    'date': DateColumn,
+}
+
+
+class ColumnarResult(object):
+    """
+    Columnar result of read_excel: one column per header and a parallel array of the row indices.
+    The column values are in the order of the included rows.
+    """
+
+    def __init__(self):
+        self.row_indices = array('l')
+        self.columns = collections.OrderedDict()
+
+    def set_headers(self, data_type_configs):
+        """
+        Creates the columns. Called by the plugin once the headers are found in the worksheet.
+
+        :param data_type_configs: The data_type_config entries of the headers in worksheet order
+        """
+        for data_type_config in data_type_configs:
+            column_class = COLUMN_CLASSES.get(data_type_config['type']['base'], Column)
+            self.columns[data_type_config['header']] = column_class()
+
+    def append(self, row, row_dict):
+        """
+        Adds a validated row.
+
+        :param row: The row index
+        :param row_dict: Dictionary of "header": value
+        """
+        self.row_indices.append(row)
+        for header, column in self.columns.items():
+            column.append(row_dict[header])
+
+    @property
+    def headers(self):
+        """
+        :return: List of the headers
+        """
+        return list(self.columns.keys())
+
+    def __len__(self):
+        return len(self.row_indices)
+
+    def __getitem__(self, header):
+        return self.columns[header]
+
+    def iter_rows(self):
+        """
+        :return: Generator of (row, data) tuples like iter_excel
+        """
+        columns = list(self.columns.items())
+        for position, row in enumerate(self.row_indices):
+            yield row, {header: column[position] for header, column in columns}
+
+    def to_dict(self):
+        """
+        :return: The data in the format returned by read_excel
+        """
+        return dict(self.iter_rows())
+
+
+class RowRecord(collections.abc.Mapping):
+    """
+    Base class of the compact row records of RecordResult. A record class with one slot per header is generated
+    for each list of headers (see get_record_class), so a record has no per-row dictionary.
+    Records are read-only mappings of "header": value and compare equal to the row dictionaries of read_excel.
+    """
+
+    __slots__ = ()
+
+    #: Tuple of the headers in worksheet order
+    headers = ()
+    # Dictionary of header: getter of the slot
+    _getters = {}
+
+    def __init__(self, values):
+        """
+        :param values: The values in the order of the headers
+        """
+        for slot, value in zip(self.__slots__, values):
+            object.__setattr__(self, slot, value)
+
+    def __getitem__(self, header):
+        return self._getters[header](self)
+
+    def __iter__(self):
+        return iter(self.headers)
+
+    def __len__(self):
+        return len(self.headers)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{0} is read-only.'.format(self.__class__.__name__))
+
+    def __reduce__(self):
+        return make_record, (self.headers, tuple(self.values()))
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, dict(self.items()))
+
+
+@functools.lru_cache(maxsize=None)
+def get_record_class(headers):
+    """
+    Returns the record class of a tuple of headers. The class is only generated once per headers.
+
+    :param headers: Tuple of the headers in worksheet order
+    :return: Subclass of RowRecord
+    """
+    slots = tuple('_{0}'.format(position) for position in range(len(headers)))
+    return type('RowRecord', (RowRecord,), {
+        '__slots__': slots,
+        'headers': headers,
+        '_getters': {header: operator.attrgetter(slot) for header, slot in zip(headers, slots)},
+    })
+
+
+def make_record(headers, values):
+    """
+    :return: A record of the given headers and values, used for pickling
+    """
+    return get_record_class(headers)(values)
+
+
+class RecordResult(dict):
+    """
+    Result of read_excel with compact rows: a dictionary of row: RowRecord.
+    Strings are interned, so repeated values like the values of enum columns are stored once.
+    """
+
+    def __init__(self, headers=()):
+        """
+        :param headers: The headers in worksheet order, usually set by set_headers
+        """
+        super(RecordResult, self).__init__()
+        self._set_record_class(tuple(headers))
+
+    def _set_record_class(self, headers):
+        self.headers = headers
+        self._record_class = get_record_class(headers)
+
+    def set_headers(self, data_type_configs):
+        """
+        Generates the record class. Called by the plugin once the headers are found in the worksheet.
+
+        :param data_type_configs: The data_type_config entries of the headers in worksheet order
+        """
+        self._set_record_class(tuple(x['header'] for x in data_type_configs))
+
+    def append(self, row, row_dict):
+        """
+        Adds a validated row.
+
+        :param row: The row index
+        :param row_dict: Dictionary of "header": value
+        """
+        intern = sys.intern
+        self[row] = self._record_class([intern(value) if type(value) is str else value
+                                        for value in map(row_dict.__getitem__, self.headers)])
+
+    def to_dict(self):
+        """
+        :return: The data in the format returned by read_excel
+        """
+        return {row: dict(record) for row, record in self.items()}
+
+    def __getstate__(self):
+        # The generated record class is not picklable, it is generated again from the headers
+        return {'headers': self.headers}
+
+    def __setstate__(self, state):
+        self._set_record_class(state['headers'])
+
+
+RESULT_FORMATS = {
+    'columnar': ColumnarResult,
+    'records': RecordResult,
+}
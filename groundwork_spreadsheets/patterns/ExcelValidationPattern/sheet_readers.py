@@ -0,0 +1,375 @@
+"""
+Oriented cell access on openpyxl worksheets for the Excel validation pattern
+"""
+import itertools
+
+from openpyxl.utils import get_column_letter
+
+# Number of oriented rows of a row_based worksheet which are transposed at once, see ReadOnlyWorksheetReader
+TRANSPOSE_BLOCK_ROWS = 1024
+
+
+def transform_coordinates(orientation, row=None, column=None):
+    """
+    Builds the Excel coordinate string (e.g. 'B3') of an oriented cell position.
+
+    :param orientation: column_based or row_based
+    :param row: The oriented row index (1-based)
+    :param column: The oriented column index (1-based)
+    :return: Excel coordinate string of the cell, row or column
+    """
+    if row is None and column is None:
+        raise ValueError("_transform_coordinates: row and column cannot both be None.")
+    target_str = ''
+    if orientation == 'column_based':
+        if column is not None:
+            target_str = get_column_letter(column)
+        if row is not None:
+            target_str += str(row)
+    else:
+        if row is not None:
+            target_str = get_column_letter(row)
+        if column is not None:
+            target_str += str(column)
+    return target_str
+
+
+def _iter_empty_rows(row_first, row_last, count):
+    """
+    Yields tuples (row, values) of empty oriented rows. Used to continue the rows after the end of a sheet.
+
+    :param row_first: The first oriented row index
+    :param row_last: The last oriented row index or None for an endless generator
+    :param count: The number of values per row
+    """
+    empty_values = (None,) * count
+    rows = itertools.count(row_first) if row_last is None else range(row_first, row_last + 1)
+    for row in rows:
+        yield row, empty_values
+
+
+class WorksheetReader(object):
+    """
+    Reads cell values of a fully loaded openpyxl worksheet.
+
+    All row and column indices are oriented: for row_based worksheets rows and columns are swapped,
+    so the caller can work column based all the time.
+    """
+
+    def __init__(self, worksheet, orientation):
+        """
+        :param worksheet: The openpyxl worksheet to read from
+        :param orientation: column_based or row_based
+        """
+        self.worksheet = worksheet
+        self.orientation = orientation
+
+    def coordinate(self, row=None, column=None):
+        """
+        :return: Excel coordinate string of an oriented cell position
+        """
+        return transform_coordinates(self.orientation, row, column)
+
+    @property
+    def max_row(self):
+        """
+        :return: The greatest oriented row index of the worksheet dimensions
+        """
+        if self.orientation == 'column_based':
+            return self.worksheet.max_row
+        return self.worksheet.max_column
+
+    @property
+    def max_column(self):
+        """
+        :return: The greatest oriented column index of the worksheet dimensions
+        """
+        if self.orientation == 'column_based':
+            return self.worksheet.max_column
+        return self.worksheet.max_row
+
+    def last_column(self, row):
+        """
+        Returns the last oriented column to search for headers in an oriented row, the worksheet dimensions.
+
+        :param row: The oriented row index
+        """
+        return self.max_column
+
+    def set_column_types(self, column_types):
+        """
+        Tells the reader the base types of the data columns. Workbook cells are typed, so they are not used.
+
+        :param column_types: Dictionary of oriented column index: base type of the data_type_config
+        """
+        pass
+
+    def _keys(self, row, columns):
+        """
+        :return: The keys of the worksheet's cell dictionary for an oriented row and the given oriented columns
+        """
+        if self.orientation == 'column_based':
+            return [(row, column) for column in columns]
+        return [(column, row) for column in columns]
+
+    def _values(self, row, columns):
+        # Cells are looked up in the worksheet's cell dictionary. Accessing a missing cell through the worksheet API
+        # would create and store an empty cell, which grows the worksheet and its dimensions.
+        get_cell = self.worksheet._cells.get
+        return tuple([None if cell is None else cell.value for cell in map(get_cell, self._keys(row, columns))])
+
+    def iter_line(self, row, column_first):
+        """
+        Returns the values of an oriented row, starting at column_first.
+        The iterator is endless; after the last cell of the worksheet None is returned.
+        No cells are created.
+
+        :param row: The oriented row index
+        :param column_first: The oriented column index to start with
+        """
+        values = self._values(row, range(column_first, self.max_column + 1))
+        return itertools.chain(values, itertools.repeat(None))
+
+    def iter_rows(self, row_first, row_last, columns):
+        """
+        Yields tuples (row, values) for the oriented rows row_first to row_last.
+        The values are ordered like the given columns.
+        If row_last is None, the generator is endless and yields empty rows after the last row of the worksheet.
+        No cells are created.
+
+        :param row_first: The first oriented row index
+        :param row_last: The last oriented row index or None
+        :param columns: List of oriented column indices to read
+        """
+        row = row_first
+        stored_row_last = self.max_row if row_last is None else min(row_last, self.max_row)
+        if columns:
+            for row in range(row_first, stored_row_last + 1):
+                yield row, self._values(row, columns)
+            row = max(row_first, stored_row_last + 1)
+
+        # The sheet ended before row_last (or row_last is open): continue with empty rows
+        for item in _iter_empty_rows(row, row_last, len(columns)):
+            yield item
+
+    def _last_row(self, columns):
+        """
+        Returns the last oriented row with a value in one of the given oriented columns, see iter_populated_rows.
+        Only the cells stored in the worksheet are visited and no cells are created, so the result does not depend
+        on the worksheet dimensions (which include formatted but empty cells).
+
+        :param columns: List of oriented column indices
+        :return: The oriented row index or 0 if the columns are empty
+        """
+        columns = set(columns)
+        column_based = self.orientation == 'column_based'
+        last_row = 0
+        for (row, column), cell in self.worksheet._cells.items():
+            if not column_based:
+                row, column = column, row
+            if row > last_row and column in columns and cell.value is not None:
+                last_row = row
+        return last_row
+
+    def iter_populated_rows(self, row_first, columns):
+        """
+        Same as iter_rows, but the rows end with the last oriented row having a value in one of the columns.
+        At least row_first is yielded. Without columns the worksheet dimensions are used.
+
+        :param row_first: The first oriented row index
+        :param columns: List of oriented column indices to read
+        """
+        row_last = self._last_row(columns) if columns else self.max_row
+        return self.iter_rows(row_first, max(row_first, row_last), columns)
+
+
+class ReadOnlyWorksheetReader(WorksheetReader):
+    """
+    Reads cell values of an openpyxl worksheet opened in read-only mode.
+
+    Random cell access on read-only worksheets parses the sheet XML from the start, so all values are streamed
+    in physical row order. The dimensions stored in the sheet XML may be wrong (e.g. 'A1' for a sheet with data),
+    so they are reset and only calculated by a full pass if they are needed.
+
+    The oriented rows of row_based worksheets are physical columns. Their physical rows are read in a single pass
+    when the header row is requested, starting at the header cell, and kept until the data rows are read. Then
+    only the physical rows of the data columns are kept and blocks of TRANSPOSE_BLOCK_ROWS oriented rows are
+    transposed at once. So row_based worksheets are not streamed: the memory usage grows with the number of
+    oriented rows. Reading the physical rows again for each block would parse the whole sheet once per block.
+    """
+
+    def __init__(self, worksheet, orientation):
+        super(ReadOnlyWorksheetReader, self).__init__(worksheet, orientation)
+        # Without dimensions the rows are not cut off at a wrong stored size
+        worksheet.reset_dimensions()
+        # Tuple (oriented row of the first values, oriented column of the first line, lines) of row_based sheets
+        self._lines = None
+
+    def _dimensions(self):
+        if self.worksheet.max_row is None or self.worksheet.max_column is None:
+            self.worksheet.calculate_dimension(force=True)
+        return self.worksheet.max_row, self.worksheet.max_column
+
+    @property
+    def max_row(self):
+        if self.orientation == 'row_based' and self._lines is not None and self.worksheet.max_column is None:
+            # The buffered lines hold all data rows, so the dimensions are not calculated by another pass
+            line_row_first, column_first, lines = self._lines
+            return line_row_first + max([len(line) for line in lines] or [0]) - 1
+        max_row, max_column = self._dimensions()
+        return max_row if self.orientation == 'column_based' else max_column
+
+    def last_column(self, row):
+        if self.orientation == 'column_based' and self.worksheet.max_column is None:
+            # Only the header row is read instead of calculating the dimensions of the whole sheet
+            return len(next(self.worksheet.iter_rows(min_row=row, max_row=row, values_only=True), ()))
+        if self.orientation == 'row_based' and self._lines is not None and self._lines[0] == row:
+            # The lines read for the header row end with the last stored physical row
+            line_row_first, column_first, lines = self._lines
+            return column_first + len(lines) - 1
+        return self.max_column
+
+    @property
+    def max_column(self):
+        max_row, max_column = self._dimensions()
+        return max_column if self.orientation == 'column_based' else max_row
+
+    def iter_line(self, row, column_first):
+        if self.orientation == 'column_based':
+            values = next(self.worksheet.iter_rows(min_row=row, max_row=row, min_col=column_first,
+                                                   values_only=True), ())
+        else:
+            # The physical rows are read once from the header cell on; their first values are the headers
+            lines = self.worksheet.iter_rows(min_row=column_first, min_col=row, values_only=True)
+            self._lines = (row, column_first, [tuple(line) for line in lines])
+            values = [line[0] if line else None for line in self._lines[2]]
+        return itertools.chain(values, itertools.repeat(None))
+
+    def _iter_physical_rows(self, row_first, row_last, columns):
+        """
+        Streams the physical rows of a column_based worksheet and yields tuples (row, values) ordered like columns.
+        The generator ends with the last row stored in the sheet or with row_last.
+        """
+        min_col = min(columns)
+        positions = [column - min_col for column in columns]
+        row = row_first
+        for line in self.worksheet.iter_rows(min_row=row_first, max_row=row_last, min_col=min_col,
+                                             max_col=max(columns), values_only=True):
+            yield row, tuple(line[position] if position < len(line) else None for position in positions)
+            row += 1
+            if row_last is not None and row > row_last:
+                return
+
+    def _read_physical_rows(self, row_first, row_last, columns):
+        """
+        Returns the physical rows of a row_based worksheet that hold the given oriented columns, each limited to
+        the oriented rows row_first to row_last. Only these physical rows are kept in memory.
+        """
+        wanted = set(columns)
+        buffered = {}
+        physical_row = min(columns)
+        for line in self.worksheet.iter_rows(min_row=min(columns), max_row=max(columns), min_col=row_first,
+                                             max_col=row_last, values_only=True):
+            if physical_row in wanted:
+                buffered[physical_row] = line
+            physical_row += 1
+        return [buffered.get(column, ()) for column in columns]
+
+    def _take_lines(self, row_first, row_last, columns):
+        """
+        Returns the physical rows of a row_based worksheet that hold the given oriented columns. The lines read
+        for the header row are used and released; only if they do not hold the rows the worksheet is read again.
+
+        :return: Tuple (oriented row of the first values, list of lines ordered like columns)
+        """
+        buffered, self._lines = self._lines, None
+        if buffered is not None:
+            line_row_first, column_first, lines = buffered
+            if line_row_first <= row_first and column_first <= min(columns):
+                return line_row_first, [lines[column - column_first] if column - column_first < len(lines) else ()
+                                        for column in columns]
+        return row_first, self._read_physical_rows(row_first, row_last, columns)
+
+    @staticmethod
+    def _transpose(lines, line_row_first, row_first, row_last):
+        """
+        Yields tuples (row, values) of the oriented rows row_first to row_last from the physical lines of a
+        row_based worksheet. If row_last is None, the generator is endless and yields empty rows after the lines.
+        Blocks of rows are sliced from the lines, padded to the same length and transposed by zip.
+
+        :param lines: The physical rows ordered like the oriented columns
+        :param line_row_first: The oriented row of the first value of each line
+        """
+        stored_row_last = line_row_first + max(len(line) for line in lines) - 1
+        end = stored_row_last if row_last is None else min(row_last, stored_row_last)
+        row = row_first
+        while row <= end:
+            block_last = min(row + TRANSPOSE_BLOCK_ROWS - 1, end)
+            start = row - line_row_first
+            stop = block_last - line_row_first + 1
+            block = []
+            for line in lines:
+                values = line[start:stop]
+                if len(values) < stop - start:
+                    values += (None,) * (stop - start - len(values))
+                block.append(values)
+            for item in zip(range(row, block_last + 1), zip(*block)):
+                yield item
+            row = block_last + 1
+
+        # The lines ended before row_last (or row_last is open): continue with empty rows
+        for item in _iter_empty_rows(row, row_last, len(lines)):
+            yield item
+
+    def iter_rows(self, row_first, row_last, columns):
+        if not columns:
+            for row in super(ReadOnlyWorksheetReader, self).iter_rows(row_first, row_last, columns):
+                yield row
+            return
+
+        if self.orientation == 'row_based':
+            # The oriented rows are physical columns, so the physical rows are buffered and transposed
+            line_row_first, lines = self._take_lines(row_first, row_last, columns)
+            for row in self._transpose(lines, line_row_first, row_first, row_last):
+                yield row
+            return
+
+        row = row_first
+        for row, values in self._iter_physical_rows(row_first, row_last, columns):
+            yield row, values
+            row += 1
+
+        # The sheet ended before row_last (or row_last is open): continue with empty rows
+        for item in _iter_empty_rows(row, row_last, len(columns)):
+            yield item
+
+    def iter_populated_rows(self, row_first, columns):
+        if not columns:
+            return super(ReadOnlyWorksheetReader, self).iter_populated_rows(row_first, columns)
+        if self.orientation == 'column_based':
+            return self._iter_rows_until_last_value(row_first, columns)
+
+        line_row_first, lines = self._take_lines(row_first, None, columns)
+        row_last = row_first
+        for line in lines:
+            populated = [position for position, value in enumerate(line) if value is not None]
+            if populated:
+                row_last = max(row_last, line_row_first + populated[-1])
+        return self._transpose(lines, line_row_first, row_first, row_last)
+
+    def _iter_rows_until_last_value(self, row_first, columns):
+        # Empty rows are held back until a row with a value follows, so trailing empty rows are dropped
+        # without knowing the last row in advance
+        empty_values = (None,) * len(columns)
+        first_empty_row = row_first + 1
+        is_first_row = True
+        for row, values in self._iter_physical_rows(row_first, None, columns):
+            if is_first_row or values != empty_values:
+                # At least the first row is yielded
+                for empty_row in range(first_empty_row, row):
+                    yield empty_row, empty_values
+                first_empty_row = row + 1
+                is_first_row = False
+                yield row, values
+        if is_first_row:
+            yield row_first, empty_values
@@ -0,0 +1,229 @@
+"""
+Sinks of read_excel writing the validated rows to an SQLite table or a JSON Lines file while the sheet is read
+"""
+import abc
+import datetime
+import json
+import os
+import sqlite3
+
+from .results import ColumnarResult
+
+# Declared SQLite column types by base type; 'automatic' columns get no type.
+# TIMESTAMP columns are converted back to datetimes by sqlite3 connections with detect_types=PARSE_DECLTYPES.
+SQLITE_TYPES = {'date': 'TIMESTAMP', 'enum': 'TEXT', 'float': 'REAL', 'integer': 'INTEGER', 'string': 'TEXT'}
+
+# Values stored by SQLite as they are
+SQLITE_NATIVE_TYPES = (type(None), int, float, str, bytes, bool)
+
+# Handling of an existing table by SqliteSink
+IF_EXISTS = ('fail', 'replace', 'append')
+
+
+def iter_chunk_rows(chunk, headers):
+    """
+    :param chunk: A chunk handed over by read_excel: dictionary of row: data, ColumnarResult or RecordResult
+    :param headers: The headers to take the values of
+    :return: Iterator of (row, values) tuples; the values are ordered like headers
+    """
+    if isinstance(chunk, ColumnarResult):
+        return zip(chunk.row_indices, zip(*[chunk[header] for header in headers]))
+    return ((row, tuple(map(data.__getitem__, headers))) for row, data in chunk.items())
+
+
+def to_text(value):
+    """
+    :return: Dates and times in ISO format, other values as string
+    """
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(' ')
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def quote_identifier(name):
+    """
+    :return: The name quoted as SQL identifier
+    """
+    return '"{0}"'.format(str(name).replace('"', '""'))
+
+
+class _Sink(abc.ABC):
+    """
+    Abstract base class of the sinks. A sink is passed to read_excel as sink; it gets the headers by set_headers and
+    then the chunks of rows. It is used as context manager: the output is completed when the block ends and
+    discarded if it ends with an exception. Several reads with the same headers can be written to one sink.
+    Subclasses implement _open, _write and close.
+    """
+
+    def __init__(self, row_key=None):
+        """
+        :param row_key: Optional name under which the row index is written in front of the headers
+        """
+        self.row_key = row_key
+        #: The headers in worksheet order, set by set_headers
+        self.headers = None
+        #: The number of rows written
+        self.count = 0
+
+    def set_headers(self, data_type_configs):
+        """
+        Opens the output. Called by the plugin once the headers are found in the worksheet.
+
+        :param data_type_configs: The data_type_config entries of the headers in worksheet order
+        """
+        headers = [x['header'] for x in data_type_configs]
+        if self.headers is None:
+            self.headers = headers
+            self._open(data_type_configs)
+        elif headers != self.headers:
+            raise ValueError("The headers {0} differ from the headers {1} of the sink.".format(headers, self.headers))
+
+    @abc.abstractmethod
+    def _open(self, data_type_configs):
+        """
+        Creates the output for the headers of data_type_configs.
+        """
+
+    def __call__(self, chunk):
+        """
+        Writes a chunk of rows.
+
+        :param chunk: Dictionary of row: data, ColumnarResult or RecordResult
+        """
+        if self.headers is None:
+            raise ValueError("The headers of the sink are not set, it must be passed to read_excel.")
+        self._write(iter_chunk_rows(chunk, self.headers))
+        self.count += len(chunk)
+
+    @abc.abstractmethod
+    def _write(self, rows):
+        """
+        Writes the rows of a chunk.
+
+        :param rows: Iterator of (row, values) tuples; the values are ordered like the headers
+        """
+
+    @abc.abstractmethod
+    def close(self, discard=False):
+        """
+        Completes the output.
+
+        :param discard: If True, the rows written so far are discarded instead
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(discard=exc_type is not None)
+
+
+class SqliteSink(_Sink):
+    """
+    Writes the rows to a table of an SQLite database. The column types are derived from the base types of the
+    data_type_config (see SQLITE_TYPES); dates are stored as ISO text.
+
+    Each chunk is inserted by executemany. All chunks are written in one transaction, which is committed by close,
+    so a read failing with an error leaves the database unchanged.
+    """
+
+    def __init__(self, path, table, if_exists='fail', row_column=None):
+        """
+        :param path: Path of the SQLite database; it is created if it does not exist
+        :param table: Name of the table
+        :param if_exists: 'fail' raises an sqlite3.OperationalError if the table exists, 'replace' drops it first and
+                          'append' inserts the rows into it
+        :param row_column: Optional name of an INTEGER column getting the row index
+        """
+        if if_exists not in IF_EXISTS:
+            raise ValueError("if_exists must be one of {0}.".format(', '.join(IF_EXISTS)))
+        super(SqliteSink, self).__init__(row_column)
+        self.path = path
+        self.table = table
+        self.if_exists = if_exists
+        self._connection = None
+        self._insert = None
+
+    def _open(self, data_type_configs):
+        columns = [(x['header'], SQLITE_TYPES.get(x['type']['base'], '')) for x in data_type_configs]
+        if self.row_key is not None:
+            columns.insert(0, (self.row_key, 'INTEGER'))
+        table = quote_identifier(self.table)
+        names = [quote_identifier(name) for name, _ in columns]
+
+        # Autocommit mode, so the transaction also covers creating the table
+        connection = self._connection = sqlite3.connect(self.path, isolation_level=None)
+        connection.execute('BEGIN')
+        if self.if_exists == 'replace':
+            connection.execute('DROP TABLE IF EXISTS {0}'.format(table))
+        connection.execute('CREATE TABLE {0}{1} ({2})'.format(
+            'IF NOT EXISTS ' if self.if_exists == 'append' else '', table,
+            ', '.join('{0} {1}'.format(name, column_type).rstrip()
+                      for name, (_, column_type) in zip(names, columns))))
+        self._insert = 'INSERT INTO {0} ({1}) VALUES ({2})'.format(table, ', '.join(names),
+                                                                   ', '.join('?' * len(names)))
+
+    def _write(self, rows):
+        with_row = self.row_key is not None
+        native_types = SQLITE_NATIVE_TYPES
+        self._connection.executemany(self._insert, (
+            ((row,) if with_row else ()) + tuple([value if type(value) in native_types else to_text(value)
+                                                  for value in values])
+            for row, values in rows))
+
+    def close(self, discard=False):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK' if discard else 'COMMIT')
+        finally:
+            connection.close()
+
+    def __repr__(self):
+        return '{0}({1!r}, {2!r})'.format(self.__class__.__name__, os.path.abspath(self.path), self.table)
+
+
+class JsonLinesSink(_Sink):
+    """
+    Writes each row as JSON object of "header": value in a line of a UTF-8 text file (JSON Lines).
+    Dates are written as ISO strings. The lines of a chunk are written at once.
+    """
+
+    def __init__(self, path, row_key=None):
+        """
+        :param path: Path of the file; an existing file is overwritten
+        :param row_key: Optional key of the row index, written in front of the headers
+        """
+        super(JsonLinesSink, self).__init__(row_key)
+        self.path = path
+        self._file = None
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=to_text).encode
+
+    def _open(self, data_type_configs):
+        self._file = open(self.path, 'w', encoding='utf-8', newline='\n')
+
+    def _write(self, rows):
+        encode = self._encode
+        headers = self.headers
+        if self.row_key is None:
+            lines = [encode(dict(zip(headers, values))) for row, values in rows]
+        else:
+            keys = [self.row_key] + headers
+            lines = [encode(dict(zip(keys, (row,) + values))) for row, values in rows]
+        lines.append('')
+        self._file.write('\n'.join(lines))
+
+    def close(self, discard=False):
+        file_pointer, self._file = self._file, None
+        if file_pointer is None:
+            return
+        file_pointer.close()
+        if discard:
+            os.remove(self.path)
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, os.path.abspath(self.path))
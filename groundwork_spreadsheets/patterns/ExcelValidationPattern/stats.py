@@ -0,0 +1,105 @@
+"""
+Timings and counters of the reads of the Excel validation pattern
+"""
+import collections
+import time
+
+
+class ReadStats(object):
+    """
+    Timings and counters of one read of a worksheet.
+
+    The phases are 'config' (loading the configuration and compiling the validators), 'load_workbook' (missing if
+    an already loaded workbook is read), 'headers' (finding the header row and columns), 'last_row' (finding the
+    last data row, if that needs an extra pass) and 'validation' (reading and validating the data rows).
+    In read-only mode and with 'severalEmptyCells' the last row is found while the rows are validated.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: The path of the workbook
+        """
+        self.path = path
+        #: Title of the read worksheet
+        self.sheet = None
+        #: Size of the workbook file in bytes, None if unknown
+        self.workbook_size = None
+        #: Dictionary of phase: duration in seconds, in the order of the phases
+        self.durations = collections.OrderedDict()
+        #: Number of data rows read from the worksheet
+        self.rows_scanned = 0
+        #: Number of rows excluded by a filter
+        self.rows_excluded = 0
+        #: Number of rows with a failed check, which are not in the result
+        self.rows_failed = 0
+        #: Number of validated columns per row
+        self.columns = 0
+        #: Counter of the failed checks by rule, including the logged ones
+        self.violations = collections.Counter()
+        self._phase = None
+        self._phase_start = None
+
+    def start_phase(self, phase):
+        """
+        Ends the current phase and starts the next one.
+
+        :param phase: Name of the next phase or None to end the current one only
+        """
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.durations[self._phase] = self.durations.get(self._phase, 0.0) + now - self._phase_start
+        self._phase = phase
+        self._phase_start = now
+
+    def count_rows(self, rows):
+        """
+        Passes the rows through and counts them.
+
+        :param rows: Iterator of (row, values) tuples
+        """
+        for row in rows:
+            self.rows_scanned += 1
+            yield row
+
+    @property
+    def rows_included(self):
+        """
+        :return: Number of rows in the result
+        """
+        return self.rows_scanned - self.rows_excluded - self.rows_failed
+
+    @property
+    def cells_validated(self):
+        """
+        :return: Number of validated cells
+        """
+        return self.rows_scanned * self.columns
+
+    @property
+    def duration(self):
+        """
+        :return: The sum of the phase durations in seconds
+        """
+        return sum(self.durations.values())
+
+    def as_dict(self):
+        """
+        :return: The stats as JSON serializable dictionary
+        """
+        return {
+            'path': self.path,
+            'sheet': self.sheet,
+            'workbook_size': self.workbook_size,
+            'durations': dict(self.durations),
+            'duration': self.duration,
+            'rows_scanned': self.rows_scanned,
+            'rows_included': self.rows_included,
+            'rows_excluded': self.rows_excluded,
+            'rows_failed': self.rows_failed,
+            'cells_validated': self.cells_validated,
+            'violations': dict(self.violations),
+        }
+
+    def __repr__(self):
+        return '{0}(sheet={1!r}, duration={2:.3f}, rows_scanned={3})'.format(
+            self.__class__.__name__, self.sheet, self.duration, self.rows_scanned)
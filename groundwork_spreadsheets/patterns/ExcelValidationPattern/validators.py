@@ -0,0 +1,374 @@
+"""
+Per-column validators of the Excel validation pattern.
+
+Each entry of data_type_config is compiled once per read into a validator object. The validator holds everything
+that is needed for the per cell checks (enum sets, minimum and maximum, error routing), so validating a cell is a
+single call. Cells are addressed by integer indices; the Excel coordinate string and the messages are only built
+if an error is raised or logged.
+"""
+import datetime
+import functools
+import logging
+import re
+
+from .report import CellError
+from .sheet_readers import transform_coordinates
+
+# Numeric types that are converted to strings for string types with 'convert_numbers'
+NUMERIC_TYPES = (int, float)
+
+# Characters with a special meaning in regular expressions (outside of character classes)
+REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+REGEX_QUANTIFIERS = frozenset('*+?{')
+
+
+def split_literal_prefix(pattern):
+    """
+    Splits a regular expression anchored with '^' into its literal prefix and the rest of the pattern.
+    For example '^Text [0-9]$' is split into 'Text ' and '[0-9]$'.
+
+    :param pattern: The regular expression
+    :return: Tuple (prefix, rest); prefix is None if the pattern has no usable literal prefix
+    """
+    if not pattern.startswith('^') or '|' in pattern or '(?' in pattern:
+        # Alternations and inline flags may change the meaning of the prefix
+        return None, pattern
+    prefix = []
+    index = 1
+    while index < len(pattern):
+        char = pattern[index]
+        length = 1
+        if char == '\\':
+            if index + 1 >= len(pattern) or pattern[index + 1].isalnum():
+                # Character class escapes like \d or references like \1
+                break
+            char = pattern[index + 1]
+            length = 2
+        elif char in REGEX_SPECIAL_CHARACTERS:
+            break
+        if index + length < len(pattern) and pattern[index + length] in REGEX_QUANTIFIERS:
+            # The character is repeated or optional, so it is not part of the prefix
+            break
+        prefix.append(char)
+        index += length
+    return ''.join(prefix), pattern[index:]
+
+
+class PatternMatcher(object):
+    """
+    A compiled regular expression with a fast path for patterns starting with an anchored literal prefix.
+    Calling the matcher returns the same result as 're.search(pattern, value) is not None'.
+    """
+
+    def __init__(self, pattern):
+        """
+        :param pattern: The regular expression
+        """
+        self.pattern = pattern
+        self._regex = re.compile(pattern)
+        self._prefix, rest = split_literal_prefix(pattern)
+        if self._prefix is None or (not self._prefix and rest):
+            self.match = self._match_regex
+        elif rest == '':
+            self.match = self._match_prefix
+        elif rest == '$':
+            # '$' also matches in front of a trailing newline
+            self._values = frozenset([self._prefix, self._prefix + '\n'])
+            self.match = self._match_literal
+        else:
+            self.match = self._match_prefix_regex
+
+    def __call__(self, value):
+        return self.match(value)
+
+    def _match_regex(self, value):
+        return self._regex.search(value) is not None
+
+    def _match_prefix(self, value):
+        return value.startswith(self._prefix)
+
+    def _match_literal(self, value):
+        return value in self._values
+
+    def _match_prefix_regex(self, value):
+        return value.startswith(self._prefix) and self._regex.search(value) is not None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern):
+    """
+    Returns the PatternMatcher of a regular expression.
+    The matchers are cached, so each pattern is compiled only once.
+    """
+    return PatternMatcher(pattern)
+
+
+class CellCoordinate(object):
+    """
+    The Excel coordinate of an oriented cell position as log message argument. The coordinate string is only built
+    if the message is formatted.
+    """
+
+    __slots__ = ('orientation', 'row', 'column')
+
+    def __init__(self, orientation, row, column):
+        self.orientation = orientation
+        self.row = row
+        self.column = column
+
+    def __str__(self):
+        return transform_coordinates(self.orientation, self.row, self.column)
+
+
+class ColumnValidator(object):
+    """
+    Base class of all column validators. It does no validation, so it is used for the 'automatic' base type.
+
+    Failed checks are recorded as CellError objects. Their messages are built from the templates in MESSAGES
+    only if they are raised or logged.
+    """
+
+    # Message templates by rule
+    MESSAGES = {
+        'empty_cell': u"The '{header}' in cell {cell} is empty",
+    }
+
+    def __init__(self, data_type_config, log, orientation):
+        """
+        :param data_type_config: The data_type_config entry of the header with all defaults set
+        :param log: Callable logging a message with its level and %-format arguments, e.g. Logger.log
+        :param orientation: column_based or row_based, used for log messages
+        """
+        self.header = data_type_config['header']
+        self.type_config = data_type_config['type']
+        self._log = log
+        self._orientation = orientation
+        self._oriented_row_text = 'row' if orientation == 'column_based' else 'column'
+        # Pre-selected error routing: the errors are either raised as exceptions or logged
+        self._fail_on_empty_cell = data_type_config['fail_on_empty_cell']
+        self._fail_on_type_error = data_type_config['fail_on_type_error']
+
+    def __call__(self, value, row, column, errors):
+        """
+        Validates the value of a cell.
+
+        :param value: The cell value
+        :param row: The oriented row index of the cell
+        :param column: The oriented column index of the cell
+        :param errors: List of the errors of the row; a CellError is appended for each failed check
+        :return: Tuple of the (possibly converted) value and a flag telling if a filter excludes the row
+        """
+        if value is None:
+            return self._empty_cell(row, column, errors)
+        return value, False
+
+    def coordinate(self, row, column):
+        """
+        :return: Excel coordinate string of an oriented cell position
+        """
+        return transform_coordinates(self._orientation, row, column)
+
+    def format_message(self, error):
+        """
+        Builds the message of a failed check.
+
+        :param error: The CellError
+        :return: The message
+        """
+        return self.MESSAGES[error.rule].format(value=error.value, cell=error.coordinate, type=type(error.value),
+                                                header=self.header, **self._message_arguments())
+
+    def _message_arguments(self):
+        return {}
+
+    def _empty_cell(self, row, column, errors):
+        errors.append(CellError(row, column, self.header, 'empty_cell', None, 'fail_on_empty_cell',
+                                self._fail_on_empty_cell, self))
+        return None, False
+
+    def _type_error(self, rule, value, row, column, errors):
+        errors.append(CellError(row, column, self.header, rule, value, 'fail_on_type_error',
+                                self._fail_on_type_error, self))
+
+
+class DateValidator(ColumnValidator):
+    """
+    Validator of the 'date' base type.
+    """
+
+    MESSAGES = dict(ColumnValidator.MESSAGES, type=u'The value {value} in cell {cell} is of type {type}; required by '
+                                                   u'specification is datetime')
+
+    def __call__(self, value, row, column, errors):
+        if value is None:
+            return self._empty_cell(row, column, errors)
+        if not isinstance(value, datetime.datetime):
+            self._type_error('type', value, row, column, errors)
+        return value, False
+
+
+class EnumValidator(ColumnValidator):
+    """
+    Validator of the 'enum' base type including the whitelist filter.
+    """
+
+    MESSAGES = dict(ColumnValidator.MESSAGES,
+                    type=u'The value {value} in cell {cell} is of type {type}; required by specification is a string '
+                         u'type (enum)',
+                    enum=u'The value {value} in cell {cell} is not contained in the given enum [{enum_values}]')
+
+    def __init__(self, data_type_config, log, orientation):
+        super(EnumValidator, self).__init__(data_type_config, log, orientation)
+        self.enum_values = frozenset(self.type_config['enum_values'])
+        self.whitelist_values = None
+        if 'filter' in self.type_config:
+            self.whitelist_values = frozenset(self.type_config['filter']['whitelist_values'])
+            self._whitelist_text = ', '.join(self.type_config['filter']['whitelist_values'])
+
+    def __call__(self, value, row, column, errors):
+        if value is None:
+            return self._empty_cell(row, column, errors)
+        if not isinstance(value, str):
+            self._type_error('type', value, row, column, errors)
+            if self.whitelist_values:
+                self._log(logging.ERROR, 'Cannot apply enum filter to cell {0} because the type check '
+                                         'failed.'.format(self.coordinate(row, column)))
+        elif value not in self.enum_values:
+            self._type_error('enum', value, row, column, errors)
+            if self.whitelist_values:
+                self._log(logging.ERROR, 'Cannot apply enum filter to cell {0} because the enum values check '
+                                         'failed.'.format(self.coordinate(row, column)))
+        elif self.whitelist_values and value not in self.whitelist_values:
+            self._log(logging.DEBUG, u"The %s %s was excluded due to an exclude filter on cell %s (%s not in [%s]).",
+                      self._oriented_row_text, row, CellCoordinate(self._orientation, row, column), value,
+                      self._whitelist_text)
+            return value, True
+        return value, False
+
+    def _message_arguments(self):
+        return {'enum_values': ', '.join(self.type_config['enum_values'])}
+
+
+class FloatValidator(ColumnValidator):
+    """
+    Validator of the 'float' base type.
+    """
+
+    MESSAGES = dict(ColumnValidator.MESSAGES,
+                    type=u'The value {value} in cell {cell} is of type {type}; required by specification is float',
+                    minimum=u'The value {value} in cell {cell} is smaller than the given minimum of {minimum}',
+                    maximum=u'The value {value} in cell {cell} is greater than the given maximum of {maximum}')
+
+    def __init__(self, data_type_config, log, orientation):
+        super(FloatValidator, self).__init__(data_type_config, log, orientation)
+        # Missing limits are replaced by infinity, so the checks never fail
+        self.minimum = self.type_config.get('minimum', float('-inf'))
+        self.maximum = self.type_config.get('maximum', float('inf'))
+
+    def __call__(self, value, row, column, errors):
+        if value is None:
+            return self._empty_cell(row, column, errors)
+        # TODO Allow int, too
+        if not isinstance(value, float):
+            self._type_error('type', value, row, column, errors)
+        else:
+            self._check_limits(value, row, column, errors)
+        return value, False
+
+    def _check_limits(self, value, row, column, errors):
+        if value < self.minimum:
+            self._type_error('minimum', value, row, column, errors)
+        if value > self.maximum:
+            self._type_error('maximum', value, row, column, errors)
+
+    def _message_arguments(self):
+        return {'minimum': self.minimum, 'maximum': self.maximum}
+
+
+class IntegerValidator(FloatValidator):
+    """
+    Validator of the 'integer' base type.
+    """
+
+    MESSAGES = dict(FloatValidator.MESSAGES,
+                    type=u'The value {value} in cell {cell} is of type {type}; required by specification is int')
+
+    def __call__(self, value, row, column, errors):
+        if value is None:
+            return self._empty_cell(row, column, errors)
+        # Integer values stored by Excel are returned as float (e.g. 3465.0)
+        # So we have to check if the float can be converted to int without precision loss
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, int):
+            self._check_limits(value, row, column, errors)
+        else:
+            self._type_error('type', value, row, column, errors)
+        return value, False
+
+
+class StringValidator(ColumnValidator):
+    """
+    Validator of the 'string' base type.
+    """
+
+    MESSAGES = dict(ColumnValidator.MESSAGES,
+                    type=u'The value {value} in cell {cell} is of type {type}; required by specification is string',
+                    pattern=u'The value {value} in cell {cell} does not follow the given pattern {pattern}')
+
+    def __init__(self, data_type_config, log, orientation):
+        super(StringValidator, self).__init__(data_type_config, log, orientation)
+        self.convert_numbers = self.type_config.get('convert_numbers', False)
+        self.pattern = None
+        if 'pattern' in self.type_config:
+            self.pattern = compile_pattern(self.type_config['pattern'])
+        self.filter_pattern = None
+        if 'filter_pattern' in self.type_config:
+            self.filter_pattern = compile_pattern(self.type_config['filter_pattern'])
+
+    def __call__(self, value, row, column, errors):
+        if value is None:
+            return self._empty_cell(row, column, errors)
+        if self.convert_numbers and isinstance(value, NUMERIC_TYPES):
+            value = str(value)
+        if not isinstance(value, str):
+            self._type_error('type', value, row, column, errors)
+            if self.filter_pattern:
+                self._log(logging.ERROR, 'Cannot apply string filter to cell {0} because the type check '
+                                         'failed.'.format(self.coordinate(row, column)))
+        elif self.pattern is not None and not self.pattern.match(value):
+            self._type_error('pattern', value, row, column, errors)
+            if self.filter_pattern:
+                self._log(logging.ERROR, 'Cannot apply string filter to cell {0} because the pattern check '
+                                         'failed.'.format(self.coordinate(row, column)))
+        elif self.filter_pattern is not None and not self.filter_pattern.match(value):
+            self._log(logging.DEBUG, u"The %s %s was excluded due to an exclude filter on cell %s (%s does not "
+                                     u"follow %s).", self._oriented_row_text, row,
+                      CellCoordinate(self._orientation, row, column), value, self.filter_pattern.pattern)
+            return value, True
+        return value, False
+
+    def _message_arguments(self):
+        return {'pattern': self.pattern.pattern if self.pattern is not None else None}
+
+
+VALIDATOR_CLASSES = {
+    'automatic': ColumnValidator,
+    'date': DateValidator,
+    'enum': EnumValidator,
+    'float': FloatValidator,
+    'integer': IntegerValidator,
+    'string': StringValidator,
+}
+
+
+def compile_validator(data_type_config, log, orientation):
+    """
+    Compiles a data_type_config entry into its validator.
+
+    :param data_type_config: The data_type_config entry of the header with all defaults set
+    :param log: Callable logging a message with its level and %-format arguments, e.g. Logger.log
+    :param orientation: column_based or row_based, used for log messages
+    :return: The validator instance
+    """
+    return VALIDATOR_CLASSES[data_type_config['type']['base']](data_type_config, log, orientation)
@@ -0,0 +1,192 @@
+"""
+Streaming writer of worksheets in the layout of an Excel validation configuration
+"""
+import collections
+import collections.abc
+import datetime
+import itertools
+import math
+
+from openpyxl.styles.numbers import FORMAT_GENERAL, is_date_format
+from openpyxl.utils.datetime import to_excel
+
+# Number formats of the written cells by base type; the other types keep the general format
+NUMBER_FORMATS = {'date': 'yyyy-mm-dd h:mm:ss', 'enum': '@', 'integer': '0', 'string': '@'}
+
+# Excel's column limit, which limits the number of rows of row_based sheets
+MAX_COLUMNS = 16384
+
+# The oriented positions of the headers and data, see get_write_layout
+WriteLayout = collections.namedtuple('WriteLayout', 'orientation header_row header_column data_row_first data_row_last')
+
+
+def get_write_layout(excel_config):
+    """
+    Finds the positions of the headers and the data in a configuration. The indices are oriented like in
+    _iter_excel: for row_based sheets rows are physical columns and vice versa. 'automatic' positions get the
+    defaults of the reader: the headers start in the first row and column and the data follows the header row.
+
+    :param excel_config: The validated configuration
+    :return: WriteLayout; data_row_last is None unless it is configured as number
+    """
+    orientation = excel_config['orientation']
+    if orientation == 'column_based':
+        rows_key, columns_key = 'row_index', 'column_index'
+    else:
+        rows_key, columns_key = 'column_index', 'row_index'
+    header_row = excel_config['headers_index_config'][rows_key]['first']
+    if type(header_row) is not int:
+        header_row = 1
+    header_column = excel_config['headers_index_config'][columns_key]['first']
+    if type(header_column) is not int:
+        header_column = 1
+    data_row_first = excel_config['data_index_config'][rows_key]['first']
+    if type(data_row_first) is not int:
+        data_row_first = header_row + 1
+    data_row_last = excel_config['data_index_config'][rows_key]['last']
+    if type(data_row_last) is not int:
+        data_row_last = None
+    return WriteLayout(orientation, header_row, header_column, data_row_first, data_row_last)
+
+
+def iter_row_dicts(rows):
+    """
+    :param rows: A result of read_excel (dictionary, ColumnarResult or RecordResult), an iterable of (row, data)
+                 tuples like iter_excel or an iterable of data mappings
+    :return: Iterator of the data mappings of the rows
+    """
+    if hasattr(rows, 'iter_rows'):
+        rows = rows.iter_rows()
+    elif isinstance(rows, collections.abc.Mapping):
+        rows = rows.values()
+    for item in rows:
+        yield item if isinstance(item, collections.abc.Mapping) else item[1]
+
+
+def _apply_formats(values, cells):
+    # Each value is put into the cell with its number format just before it is written, so the cells are reused.
+    # cells holds a tuple (cell, number format of the column) or None per value.
+    for column_cell, value in zip(cells, values):
+        if column_cell is None or value is None:
+            yield value
+            continue
+        cell, number_format = column_cell
+        # openpyxl sets a date format when a date or time is assigned, which must not stay for the next values
+        cell.number_format = number_format
+        if type(value) is float and math.isfinite(value):
+            # openpyxl writes numbers with 16 significant digits and whole floats without decimal point, which
+            # would be read back as int. The text of a numeric cell is written as it is, so repr keeps the float.
+            cell.value = repr(value)
+            cell.data_type = 'n'
+        elif isinstance(value, datetime.datetime):
+            # Same for the serial number of a date: openpyxl < 3.1 rounds it, so 13:45 would be read as 13:44:59.999999
+            cell.value = repr(to_excel(value))
+            cell.data_type = 'n'
+            if not is_date_format(number_format):
+                # A date in a column of another type, which would be read back as number otherwise
+                cell.number_format = NUMBER_FORMATS['date']
+        else:
+            cell.value = value
+        yield cell
+
+
+class SheetWriter(object):
+    """
+    Writes the headers and the data rows of a configuration to a sheet, whose physical rows are written one after
+    another (a write-only worksheet or a CSV file).
+
+    column_based sheets are streamed in constant memory. The physical rows of row_based sheets hold one header
+    each, so their values are collected before the first physical row is written.
+    """
+
+    def __init__(self, layout, data_type_configs, append, create_cell=None):
+        """
+        :param layout: The WriteLayout
+        :param data_type_configs: The data_type_config entries of the columns
+        :param append: Callable appending a physical row; it gets a list or generator of values
+        :param create_cell: Optional callable creating a cell with a number format or None. If given, the values
+                            are written in cells with the number format of their type (see NUMBER_FORMATS).
+        """
+        self.layout = layout
+        self.headers = [x['header'] for x in data_type_configs]
+        self._append = append
+        self._has_formats = create_cell is not None
+        if create_cell is None:
+            self._cells = [None] * len(self.headers)
+        else:
+            self._cells = []
+            for data_type_config in data_type_configs:
+                number_format = NUMBER_FORMATS.get(data_type_config['type']['base'])
+                self._cells.append((create_cell(number_format), number_format or FORMAT_GENERAL))
+
+    @property
+    def max_rows(self):
+        """
+        :return: The number of data rows the sheet can take
+        """
+        layout = self.layout
+        row_last = layout.data_row_last
+        if layout.orientation == 'row_based':
+            row_last = MAX_COLUMNS if row_last is None else min(row_last, MAX_COLUMNS)
+        return None if row_last is None else row_last - layout.data_row_first + 1
+
+    def write(self, row_dicts):
+        """
+        Writes the headers and the rows. The rows are written up to max_rows; one more row is taken from row_dicts
+        to find out if there are too many.
+
+        :param row_dicts: Iterable of mappings of "header": value
+        :return: The number of rows taken from row_dicts
+        """
+        max_rows = self.max_rows
+        if max_rows is not None:
+            row_dicts = itertools.islice(row_dicts, max_rows + 1)
+        if self.layout.orientation == 'column_based':
+            return self._write_column_based(row_dicts, max_rows)
+        return self._write_row_based(row_dicts, max_rows)
+
+    def _write_column_based(self, row_dicts, max_rows):
+        layout = self.layout
+        append = self._append
+        for _ in range(1, layout.header_row):
+            append([])
+        prefix = [None] * (layout.header_column - 1)
+        append(prefix + self.headers)
+        for _ in range(layout.header_row + 1, layout.data_row_first):
+            append([])
+
+        headers = self.headers
+        cells = prefix + self._cells
+        count = 0
+        for row_dict in row_dicts:
+            count += 1
+            if max_rows is not None and count > max_rows:
+                break
+            values = prefix + [row_dict.get(header) for header in headers]
+            append(_apply_formats(values, cells) if self._has_formats else values)
+        return count
+
+    def _write_row_based(self, row_dicts, max_rows):
+        layout = self.layout
+        columns = [[] for _ in self.headers]
+        count = 0
+        for row_dict in row_dicts:
+            count += 1
+            if max_rows is not None and count > max_rows:
+                break
+            for header, column in zip(self.headers, columns):
+                column.append(row_dict.get(header))
+
+        append = self._append
+        for _ in range(1, layout.header_column):
+            append([])
+        prefix = [None] * (layout.header_row - 1)
+        gap = [None] * (layout.data_row_first - layout.header_row - 1)
+        for header, column, cell in zip(self.headers, columns, self._cells):
+            values = prefix + [header] + gap + column
+            if cell is None:
+                append(values)
+            else:
+                cells = itertools.chain([None] * (len(prefix) + 1 + len(gap)), itertools.repeat(cell))
+                append(_apply_formats(values, cells))
+        return count
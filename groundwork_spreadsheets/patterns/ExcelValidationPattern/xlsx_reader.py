@@ -0,0 +1,399 @@
+"""
+Reading of xlsx workbooks from the sheet XML, without openpyxl's workbook and cell objects
+
+The 'xml' engine of the Excel validation pattern. The workbook and sheet classes provide the interface of read-only
+openpyxl workbooks, which is used by the ReadOnlyWorksheetReader. Cell values are converted like openpyxl does with
+data_only=True: shared and inline strings, numbers, booleans, errors and dates by the number format of the cell style.
+"""
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import XMLPullParser, fromstring
+
+import openpyxl
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.cell import column_index_from_string, get_column_letter, range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+
+try:
+    from openpyxl.styles.numbers import is_timedelta_format
+except ImportError:  # openpyxl < 3.0.6
+    is_timedelta_format = None
+
+SHEET_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+ROW_TAG = '{%s}row' % SHEET_MAIN_NS
+CELL_TAG = '{%s}c' % SHEET_MAIN_NS
+VALUE_TAG = '{%s}v' % SHEET_MAIN_NS
+TEXT_TAG = '{%s}t' % SHEET_MAIN_NS
+RICH_TEXT_TAG = '{%s}r' % SHEET_MAIN_NS
+INLINE_STRING_TAG = '{%s}is' % SHEET_MAIN_NS
+SHARED_STRING_TAG = '{%s}si' % SHEET_MAIN_NS
+SHEET_DATA_TAG = '{%s}sheetData' % SHEET_MAIN_NS
+
+# Start tags in the head of the sheet XML, with an optional namespace prefix
+XML_DECLARATION = re.compile(br'<\?xml[^>]*\?>')
+WORKSHEET_START = re.compile(br'<([\w.-]+:)?worksheet\b[^>]*>')
+SHEET_DATA_START = re.compile(br'<([\w.-]+:)?sheetData\b[^>]*?(/?)>')
+DIMENSION = re.compile(br'<(?:[\w.-]+:)?dimension\b[^>]*\bref="([^"]*)"')
+ROW_START = re.compile(br'<(?:[\w.-]+:)?row\b[^>]*?\sr="(\d+)"')
+CELL_START = re.compile(br'<(?:[\w.-]+:)?c[\s/>]')
+CELL_COLUMN = re.compile(br'<(?:[\w.-]+:)?c\b[^>]*?\sr="([A-Z]+)\d+"')
+
+# Size of the decompressed chunks of the sheet XML. Parsing a chunk holds the GIL, so small chunks keep other
+# threads (e.g. an event loop next to read_excel_async) responsive; they are not slower to parse.
+CHUNK_SIZE = 1 << 16
+
+# Read-only openpyxl workbooks convert cells with duration number formats (e.g. [h]:mm) to timedelta from openpyxl
+# 3.1 on. Older versions convert them to dates like the cells with any other date format.
+TIMEDELTA_DURATIONS = (is_timedelta_format is not None and
+                       tuple(int(x) for x in re.findall(r'\d+', openpyxl.__version__)[:2]) >= (3, 1))
+
+
+def _text_content(element):
+    """
+    :return: The text of a shared or inline string element without formatting and phonetic runs, like openpyxl
+    """
+    snippets = []
+    for child in element:
+        if child.tag == TEXT_TAG:
+            snippets.append(child.text or '')
+        elif child.tag == RICH_TEXT_TAG:
+            text = child.find(TEXT_TAG)
+            if text is not None:
+                snippets.append(text.text or '')
+    return ''.join(snippets)
+
+
+def _cast_number(text):
+    if '.' in text or 'E' in text or 'e' in text:
+        return float(text)
+    return int(text)
+
+
+def _read_relationships(archive, part):
+    """
+    :return: Dictionary of relationship id: (type, archive path of the target) of a package part
+    """
+    folder, name = posixpath.split(part)
+    path = posixpath.join(folder, '_rels', name + '.rels')
+    if path not in archive.namelist():
+        return {}
+    relationships = {}
+    for element in fromstring(archive.read(path)).iter('{%s}Relationship' % PKG_REL_NS):
+        target = element.get('Target')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        relationships[element.get('Id')] = (element.get('Type', '').rsplit('/', 1)[-1], target)
+    return relationships
+
+
+class XlsxWorksheet(object):
+    """
+    A worksheet, which is parsed incrementally from the sheet XML each time it is iterated.
+    No cell objects are created.
+
+    The sheet data is decompressed in chunks. The complete rows of a chunk are parsed at once, which is faster than
+    handling a parser event for each XML element.
+    """
+
+    def __init__(self, parent, title, path):
+        """
+        :param parent: The XlsxWorkbook
+        :param title: The title of the worksheet
+        :param path: The path of the sheet XML in the archive
+        """
+        self.parent = parent
+        self.title = title
+        self.path = path
+        self.max_row, self.max_column = self._read_dimension()
+
+    def _iter_chunks(self):
+        """
+        Yields the head of the sheet XML up to the start of the sheet data and then the chunks of complete rows.
+        Each chunk is a complete XML document with the rows in a sheetData element.
+        The items are tuples (chunk, index of the last row in the chunk or None if it is not stored).
+        """
+        with self.parent.archive.open(self.path) as source:
+            buffer = b''
+            match = None
+            while match is None:
+                chunk = source.read(CHUNK_SIZE)
+                buffer += chunk
+                match = SHEET_DATA_START.search(buffer)
+                if not chunk:
+                    break
+            if match is None:
+                # The sheet has no sheet data
+                yield buffer, None
+                return
+            head = buffer[:match.end()]
+            yield head, None
+            if match.group(2):
+                # <sheetData/>
+                return
+
+            prefix = match.group(1) or b''
+            declaration = XML_DECLARATION.match(head)
+            root = WORKSHEET_START.search(head)
+            document_start = (declaration.group(0) if declaration else b'') + \
+                (root.group(0) if root else b'') + match.group(0)
+            row_start = b'<' + prefix + b'row'
+            row_end = b'</' + prefix + b'row>'
+            sheet_data_end = b'</' + prefix + b'sheetData>'
+            document_end = sheet_data_end
+            if root is not None:
+                document_end += b'</' + (root.group(1) or b'') + b'worksheet>'
+            buffer = buffer[match.end():]
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                buffer += chunk
+                end = buffer.find(sheet_data_end)
+                if not chunk or end >= 0:
+                    rows = buffer if end < 0 else buffer[:end]
+                    yield document_start + rows + document_end, self._last_row_index(rows, row_start)
+                    return
+                end = buffer.rfind(row_end)
+                if end >= 0:
+                    end += len(row_end)
+                    rows = buffer[:end]
+                    yield document_start + rows + document_end, self._last_row_index(rows, row_start)
+                    buffer = buffer[end:]
+
+    @staticmethod
+    def _last_row_index(rows, row_start):
+        position = rows.rfind(row_start)
+        match = ROW_START.match(rows, position) if position >= 0 else None
+        return int(match.group(1)) if match is not None else None
+
+    def _read_dimension(self):
+        # The dimension is stored before the sheet data, so only the head is read
+        head = next(self._iter_chunks(), (b'', None))[0]
+        match = DIMENSION.search(head)
+        if match is not None and b':' in match.group(1):
+            min_col, min_row, max_col, max_row = range_boundaries(match.group(1).decode('ascii'))
+            return max_row, max_col
+        return None, None
+
+    def _iter_lines(self, min_row=1, min_col=1, max_col=None):
+        """
+        Yields tuples (physical row index, {column index: value}, last stored column index) of the stored rows.
+        Only the values of the cells from min_col to max_col are converted; empty values are left out.
+        Chunks which end before min_row are skipped without parsing them.
+        """
+        shared_strings = self.parent.shared_strings
+        date_styles = self.parent.date_styles
+        timedelta_styles = self.parent.timedelta_styles
+        epoch = self.parent.epoch
+        row = 0
+        chunks = self._iter_chunks()
+        next(chunks, None)
+        for chunk, last_row in chunks:
+            if last_row is not None and last_row < min_row:
+                row = last_row
+                continue
+            sheet_data = fromstring(chunk)
+            if sheet_data.tag != SHEET_DATA_TAG:
+                sheet_data = sheet_data.find(SHEET_DATA_TAG)
+            for row_element in sheet_data:
+                index = row_element.get('r')
+                row = int(index) if index else row + 1
+                column = 0
+                cells = {}
+                for cell in row_element:
+                    coordinate = cell.get('r')
+                    if coordinate:
+                        column = column_index_from_string(coordinate.rstrip('0123456789'))
+                    else:
+                        column += 1
+                    if column < min_col or (max_col is not None and column > max_col):
+                        continue
+                    data_type = cell.get('t', 'n')
+                    if data_type == 'inlineStr':
+                        inline_string = cell.find(INLINE_STRING_TAG)
+                        value = None if inline_string is None else _text_content(inline_string)
+                    else:
+                        value = cell.findtext(VALUE_TAG) or None
+                        if value is not None:
+                            if data_type == 'n':
+                                value = _cast_number(value)
+                                style = cell.get('s')
+                                if style and int(style) in date_styles:
+                                    try:
+                                        if int(style) in timedelta_styles:
+                                            value = from_excel(value, epoch, timedelta=True)
+                                        else:
+                                            value = from_excel(value, epoch)
+                                    except (OverflowError, ValueError):
+                                        value = '#VALUE!'
+                            elif data_type == 's':
+                                value = shared_strings[int(value)]
+                            elif data_type == 'b':
+                                value = bool(int(value))
+                            elif data_type == 'd':
+                                value = from_ISO8601(value)
+                    if value is not None:
+                        cells[column] = value
+                yield row, cells, column
+
+    def iter_rows(self, min_row=1, max_row=None, min_col=1, max_col=None, values_only=True):
+        """
+        Yields the physical rows from min_row to max_row as tuples of the values from min_col to max_col, like
+        openpyxl's read-only worksheets with values_only=True: the rows are padded to max_col or the width of the
+        stored dimensions, and missing rows are yielded as empty rows. The rows end with the last row stored in the
+        sheet XML.
+        """
+        max_col = max_col or self.max_column
+        max_row = max_row or self.max_row
+        empty_row = () if max_col is None else (None,) * (max_col + 1 - min_col)
+        expected_row = min_row
+        for row, cells, last_column in self._iter_lines(min_row, min_col, max_col):
+            if row < min_row:
+                continue
+            if max_row is not None and row > max_row:
+                # Like openpyxl, the missing rows up to max_row are only filled if a row after it is stored
+                for _ in range(expected_row, max_row + 1):
+                    yield empty_row
+                break
+            for _ in range(expected_row, row):
+                yield empty_row
+            expected_row = row + 1
+            if max_col is None and not last_column:
+                yield ()
+            else:
+                yield tuple([cells.get(column) for column in range(min_col, (max_col or last_column) + 1)])
+
+    def reset_dimensions(self):
+        """
+        Removes the dimensions stored in the sheet XML, like openpyxl's read-only worksheets. They are not reliable,
+        as some applications write wrong dimensions.
+        """
+        self.max_row = self.max_column = None
+
+    def calculate_dimension(self, force=False):
+        """
+        Finds the last row and column with a stored cell. The row and cell references are searched in the sheet XML
+        without parsing it; only sheets with rows or cells without reference are parsed.
+        """
+        max_row = max_column = 0
+        chunks = self._iter_chunks()
+        next(chunks, None)
+        for chunk, last_row in chunks:
+            columns = CELL_COLUMN.findall(chunk)
+            if last_row is None or len(columns) != len(CELL_START.findall(chunk)):
+                max_row, max_column = self._parse_dimension()
+                break
+            max_row = last_row
+            for column in set(columns):
+                max_column = max(max_column, column_index_from_string(column.decode('ascii')))
+        self.max_row = max_row
+        self.max_column = max_column
+        return 'A1:{0}{1}'.format(get_column_letter(max(max_column, 1)), max(max_row, 1))
+
+    def _parse_dimension(self):
+        max_row = max_column = 0
+        for row, cells, last_column in self._iter_lines():
+            max_row = row
+            max_column = max(max_column, last_column)
+        return max_row, max_column
+
+
+class XlsxWorkbook(object):
+    """
+    A read-only xlsx workbook. Only the workbook, style and shared string parts are read when it is opened.
+    """
+
+    read_only = True
+
+    def __init__(self, path):
+        """
+        :param path: Path to the workbook file
+        """
+        self.archive = zipfile.ZipFile(path)
+        try:
+            relationships = _read_relationships(self.archive, '')
+            workbook_part = next((target for rel_type, target in relationships.values()
+                                  if rel_type == 'officeDocument'), 'xl/workbook.xml')
+            relationships = _read_relationships(self.archive, workbook_part)
+            workbook = fromstring(self.archive.read(workbook_part))
+
+            properties = workbook.find('{%s}workbookPr' % SHEET_MAIN_NS)
+            is_1904 = properties is not None and properties.get('date1904') in ('1', 'true')
+            self.epoch = CALENDAR_MAC_1904 if is_1904 else CALENDAR_WINDOWS_1900
+
+            self.worksheets = []
+            sheet_indices = []
+            for index, sheet in enumerate(workbook.iter('{%s}sheet' % SHEET_MAIN_NS)):
+                rel_type, target = relationships.get(sheet.get('{%s}id' % REL_NS), (None, None))
+                if rel_type == 'worksheet':
+                    self.worksheets.append(XlsxWorksheet(self, sheet.get('name'), target))
+                    sheet_indices.append(index)
+            view = workbook.find('{%s}bookViews/{%s}workbookView' % (SHEET_MAIN_NS, SHEET_MAIN_NS))
+            active_index = int(view.get('activeTab', 0)) if view is not None else 0
+            self._active = sheet_indices.index(active_index) if active_index in sheet_indices else 0
+
+            parts = {rel_type: target for rel_type, target in relationships.values()}
+            self.shared_strings = self._read_shared_strings(parts.get('sharedStrings'))
+            self.date_styles, self.timedelta_styles = self._read_date_styles(parts.get('styles'))
+        except Exception:
+            self.archive.close()
+            raise
+
+    def _read_shared_strings(self, part):
+        strings = []
+        if part is None or part not in self.archive.namelist():
+            return strings
+        parser = XMLPullParser(('end',))
+        with self.archive.open(part) as source:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if element.tag == SHARED_STRING_TAG:
+                        strings.append(_text_content(element).replace('x005F_', ''))
+                        element.clear()
+        parser.close()
+        return strings
+
+    def _read_date_styles(self, part):
+        """
+        :return: Tuple of the sets of cell style indices with date and with time delta number formats
+        """
+        date_styles = set()
+        timedelta_styles = set()
+        if part is None or part not in self.archive.namelist():
+            return date_styles, timedelta_styles
+        styles = fromstring(self.archive.read(part))
+        custom_formats = {int(x.get('numFmtId')): x.get('formatCode')
+                          for x in styles.iter('{%s}numFmt' % SHEET_MAIN_NS)}
+        cell_formats = styles.find('{%s}cellXfs' % SHEET_MAIN_NS)
+        for index, cell_format in enumerate([] if cell_formats is None else cell_formats):
+            number_format_id = int(cell_format.get('numFmtId', 0))
+            number_format = custom_formats.get(number_format_id, BUILTIN_FORMATS.get(number_format_id))
+            if number_format is None:
+                continue
+            if is_date_format(number_format):
+                date_styles.add(index)
+            if TIMEDELTA_DURATIONS and is_timedelta_format(number_format):
+                timedelta_styles.add(index)
+        return date_styles, timedelta_styles
+
+    @property
+    def active(self):
+        return self.worksheets[self._active] if self.worksheets else None
+
+    @property
+    def sheetnames(self):
+        return [x.title for x in self.worksheets]
+
+    def __getitem__(self, name):
+        for worksheet in self.worksheets:
+            if worksheet.title == name:
+                return worksheet
+        raise KeyError('Worksheet {0} does not exist.'.format(name))
+
+    def close(self):
+        self.archive.close()
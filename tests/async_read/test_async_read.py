@@ -0,0 +1,159 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from benchmarks.workbook_generator import generate_workbook
+from groundwork_spreadsheets import AsyncReader, RecordResult
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def collect_batches(batches):
+    return [batch async for batch in batches]
+
+
+@pytest.fixture
+def large_workbook(tmpdir):
+    path = str(tmpdir.join('large.xlsx'))
+    return generate_workbook(path, 5000, 6), path
+
+
+@pytest.fixture
+def copies(monkeypatch):
+    """
+    Records the copies of the plugins which run the asynchronous reads.
+    """
+    from groundwork_spreadsheets.patterns.ExcelValidationPattern.excel_validation_pattern import \
+        ExcelValidationPlugin
+    copies = []
+    async_copy = ExcelValidationPlugin._async_copy
+
+    def record_copy(self):
+        copies.append(async_copy(self))
+        return copies[-1]
+    monkeypatch.setattr(ExcelValidationPlugin, '_async_copy', record_copy)
+    return copies
+
+
+@pytest.mark.parametrize('result_format', ['dict', 'records'])
+def test_read_excel_async(empty_app, result_format):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('column_based.json', 'filtering')
+    path = get_test_data_path('column_based.xlsx', 'filtering')
+    data = run(plugin.excel_validation.read_excel_async(config_path, path, result_format=result_format))
+    assert data == plugin.excel_validation.read_excel(config_path, path)
+    assert isinstance(data, RecordResult) == (result_format == 'records')
+    assert plugin.excel_validation.excel_config['orientation'] == 'column_based'
+
+
+def test_read_excel_async_error(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    with pytest.raises(ValueError):
+        run(plugin.excel_validation.read_excel_async(config_path, path))
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel_async(config_path, path, engine='lxml').send(None)
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+def test_iter_excel_async(empty_app, read_only):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('row_based.json', 'filtering')
+    path = get_test_data_path('row_based.xlsx', 'filtering')
+    batches = run(collect_batches(plugin.excel_validation.iter_excel_async(config_path, path, read_only=read_only,
+                                                                           batch_size=2)))
+    assert [row for batch in batches for row in batch] == list(plugin.excel_validation.iter_excel(config_path, path))
+    assert all(1 <= len(batch) <= 2 for batch in batches)
+    with pytest.raises(ValueError):
+        plugin.excel_validation.iter_excel_async(config_path, path, engine='lxml')
+
+
+def test_concurrent_reads_are_limited():
+    async_reader = AsyncReader(concurrent.futures.ThreadPoolExecutor(4), max_reads=2)
+    running = []
+    counts = []
+    lock = threading.Lock()
+
+    def read():
+        with lock:
+            running.append(1)
+            counts.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+
+    async def limited_read():
+        async with async_reader.limit():
+            await async_reader.run(threading.Event(), read)
+
+    async def main():
+        await asyncio.gather(*[limited_read() for _ in range(6)])
+    run(main())
+    async_reader.executor.shutdown()
+    assert len(counts) == 6
+    assert max(counts) == 2
+
+
+def test_concurrent_reads_are_independent(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    reads = [(get_test_data_path(name + '.json', 'filtering'), get_test_data_path(name + '.xlsx', 'filtering'))
+             for name in ('column_based', 'row_based')] * 4
+
+    async def main():
+        return await asyncio.gather(*[plugin.excel_validation.read_excel_async(*x) for x in reads])
+    assert run(main()) == [plugin.excel_validation.read_excel(*x) for x in reads]
+
+
+def test_read_excel_async_cancel(empty_app, large_workbook, copies):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.collect_stats = True
+    executor = plugin.excel_validation.async_reader.executor = concurrent.futures.ThreadPoolExecutor(1)
+    config, path = large_workbook
+
+    async def main():
+        task = asyncio.ensure_future(plugin.excel_validation.read_excel_async(config, path, read_only=True))
+        while not copies or copies[0].last_stats is None or not copies[0].last_stats.rows_scanned:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    run(main())
+    executor.shutdown()
+    assert copies[0]._cancel_event.is_set()
+    assert copies[0].last_stats.rows_scanned < 5000
+
+
+def test_iter_excel_async_cancel(empty_app, large_workbook, copies):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.collect_stats = True
+    executor = plugin.excel_validation.async_reader.executor = concurrent.futures.ThreadPoolExecutor(1)
+    config, path = large_workbook
+    batches = []
+
+    async def consume():
+        async for batch in plugin.excel_validation.iter_excel_async(config, path, read_only=True, batch_size=10):
+            batches.append(batch)
+
+    async def main():
+        task = asyncio.ensure_future(consume())
+        while not batches:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    run(main())
+    executor.shutdown()
+    assert copies[0]._cancel_event.is_set()
+    assert copies[0].last_stats.rows_scanned < 5000
+    assert sum(len(batch) for batch in batches) < 5000
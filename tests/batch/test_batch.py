@@ -0,0 +1,59 @@
+
+import pytest
+
+from groundwork_spreadsheets import ColumnarResult
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+
+WORKBOOKS = [
+    get_test_data_path('data_types_libreoffice.xlsx', 'data_types'),
+    get_test_data_path('missing.xlsx', 'data_types'),
+    get_test_data_path('data_types_excel_2013.xlsx', 'data_types'),
+    get_test_data_path('data_types_excel_2013.xlsm', 'data_types'),
+]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_read_excel_many(empty_app, workers):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('config.json', 'data_types')
+    results = plugin.excel_validation.read_excel_many(config_path, WORKBOOKS, workers=workers)
+    assert [x.path for x in results] == WORKBOOKS
+    for result in results[:1] + results[2:]:
+        assert result.error is None
+        assert result.data == plugin.excel_validation.read_excel(config_path, result.path)
+    assert results[1].data is None
+    assert results[1].error.type == 'FileNotFoundError'
+    assert 'missing.xlsx' in results[1].error.traceback
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_read_excel_many_validation_error(empty_app, workers):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    workbooks = [get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering'),
+                 get_test_data_path('column_based.xlsx', 'filtering')]
+    results = plugin.excel_validation.read_excel_many(config_path, workbooks, workers=workers, read_only=True,
+                                                      result_format='columnar')
+    assert results[0].data is None
+    assert results[0].error.type == 'ValueError'
+    assert 'is of type' in results[0].error.message
+    assert isinstance(results[1].data, ColumnarResult)
+    assert results[1].error is None
+
+
+def test_read_excel_many_invalid_config(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    with pytest.raises(OSError):
+        plugin.excel_validation.read_excel_many(get_test_data_path('missing.json', 'data_types'), WORKBOOKS)
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel_many(get_test_data_path('config.json', 'data_types'), WORKBOOKS,
+                                                result_format='unknown')
+
+
+def test_read_excel_config_dict(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('config.json', 'data_types')
+    expected = plugin.excel_validation.read_excel(config_path, WORKBOOKS[0])
+    # The validated configuration can be passed again
+    assert plugin.excel_validation.read_excel(plugin.excel_validation.excel_config, WORKBOOKS[0]) == expected
@@ -0,0 +1,83 @@
+import gc
+import weakref
+
+import pytest
+
+from groundwork_spreadsheets import ColumnarResult, RecordResult, ResultCache
+from tests.conftest import EmptyPlugin, get_test_data_path, write_workbook
+
+CONFIG_PATH = get_test_data_path('config.json', 'data_types')
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+def test_read_excel_chunks(empty_app, tmpdir, read_only):
+    plugin = EmptyPlugin(empty_app)
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')))
+    chunks = []
+    count = plugin.excel_validation.read_excel(CONFIG_PATH, path, read_only=read_only, sink=chunks.append,
+                                               chunk_size=10)
+    assert count == 25
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[1].keys()) == list(range(12, 22))
+    data = {}
+    for chunk in chunks:
+        data.update(chunk)
+    assert data == plugin.excel_validation.read_excel(CONFIG_PATH, path, read_only=read_only)
+
+
+@pytest.mark.parametrize('result_format, result_class', [('columnar', ColumnarResult), ('records', RecordResult)])
+def test_read_excel_chunks_result_format(empty_app, tmpdir, result_format, result_class):
+    plugin = EmptyPlugin(empty_app)
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')))
+    chunks = []
+    plugin.excel_validation.read_excel(CONFIG_PATH, path, result_format=result_format, sink=chunks.append,
+                                       chunk_size=20)
+    assert [type(chunk) for chunk in chunks] == [result_class, result_class]
+    assert chunks[1].to_dict() == {row: plugin.excel_validation.read_excel(CONFIG_PATH, path)[row]
+                                   for row in range(22, 27)}
+    if result_format == 'columnar':
+        assert chunks[1].headers == ['Date', 'Enum', 'Float', 'Integer', 'Text']
+        assert list(chunks[1]['Integer']) == [20, 21, 22, 23, 24]
+
+
+def test_read_excel_chunks_are_released(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')))
+    references = []
+
+    def sink(chunk):
+        gc.collect()
+        # Only the current chunk is alive
+        assert [reference() for reference in references if reference() is not None] == []
+        references.append(weakref.ref(chunk))
+
+    assert plugin.excel_validation.read_excel(CONFIG_PATH, path, result_format='columnar', sink=sink,
+                                              chunk_size=3) == 25
+    assert len(references) == 9
+
+
+def test_read_excel_chunks_errors(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    workbook_path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    chunks = []
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel(config_path, workbook_path, sink=chunks.append, chunk_size=1)
+    assert [list(chunk.keys()) for chunk in chunks] == [[2]]
+
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')))
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=chunks.append, workers=2)
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=chunks.append, chunk_size=0)
+
+
+def test_read_excel_chunks_bypass_result_cache(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.result_cache = ResultCache(str(tmpdir.join('cache.sqlite')))
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')))
+    chunks = []
+    plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=chunks.append)
+    plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=chunks.append)
+    assert [len(chunk) for chunk in chunks] == [25, 25]
+    assert plugin.excel_validation.result_cache.info()['entries'] == 0
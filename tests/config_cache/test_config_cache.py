@@ -0,0 +1,77 @@
+import json
+import shutil
+
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.config_cache import ConfigCache
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+CONFIG_PATH = get_test_data_path('config.json', 'data_types')
+WORKBOOK_PATH = get_test_data_path('data_types_libreoffice.xlsx', 'data_types')
+
+
+def get_plugin(empty_app, maxsize=32):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.config_cache = ConfigCache(maxsize)
+    return plugin
+
+
+def test_config_cache_hits(empty_app):
+    plugin = get_plugin(empty_app)
+    for _ in range(3):
+        data = plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+        assert data[2]['Enum'] == 'ape'
+    assert plugin.excel_validation.config_cache.info() == {'hits': 2, 'misses': 1, 'size': 1, 'maxsize': 32}
+    # Defaults are part of the cached configuration
+    assert plugin.excel_validation.excel_config['filter_properties']['excluded_enable_logging'] is True
+    assert plugin.excel_validation.excel_config['read_only'] is False
+
+
+def test_config_cache_returns_copies(empty_app):
+    plugin = get_plugin(empty_app)
+    plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+    plugin.excel_validation.excel_config['data_type_config'][0]['header'] = 'Changed'
+    plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+    assert plugin.excel_validation.excel_config['data_type_config'][0]['header'] == 'Date'
+
+
+def test_config_cache_changed_file(empty_app, tmpdir):
+    plugin = get_plugin(empty_app)
+    config_path = str(tmpdir.join('config.json'))
+    shutil.copy(CONFIG_PATH, config_path)
+    plugin.excel_validation.read_excel(config_path, WORKBOOK_PATH)
+
+    with open(config_path) as file_pointer:
+        config = json.load(file_pointer)
+    config['read_only'] = True
+    with open(config_path, 'w') as file_pointer:
+        json.dump(config, file_pointer)
+    plugin.excel_validation.read_excel(config_path, WORKBOOK_PATH)
+
+    assert plugin.excel_validation.excel_config['read_only'] is True
+    assert plugin.excel_validation.config_cache.info() == {'hits': 0, 'misses': 2, 'size': 1, 'maxsize': 32}
+
+
+def test_config_cache_invalidate(empty_app):
+    plugin = get_plugin(empty_app)
+    cache = plugin.excel_validation.config_cache
+    plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+    cache.invalidate(CONFIG_PATH)
+    plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+    cache.invalidate()
+    plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_config_cache_bounded(empty_app, tmpdir):
+    plugin = get_plugin(empty_app, maxsize=2)
+    for index in range(4):
+        config_path = str(tmpdir.join('config_{0}.json'.format(index)))
+        shutil.copy(CONFIG_PATH, config_path)
+        plugin.excel_validation.read_excel(config_path, WORKBOOK_PATH)
+    assert plugin.excel_validation.config_cache.info()['size'] == 2
+
+
+def test_config_cache_disabled(empty_app):
+    plugin = get_plugin(empty_app, maxsize=0)
+    plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+    plugin.excel_validation.read_excel(CONFIG_PATH, WORKBOOK_PATH)
+    assert plugin.excel_validation.config_cache.info() == {'hits': 0, 'misses': 2, 'size': 0, 'maxsize': 0}
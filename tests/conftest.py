@@ -3,12 +3,17 @@ Fixtures for all tests.
 Mainly an empty groundwork app and a plugin that inherits from the ExcelValidationPattern.
 """
 
+import datetime
 import inspect
 import os
+
+import openpyxl
 import pytest
 
 from groundwork_spreadsheets import ExcelValidationPattern
 
+TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+
 
 @pytest.fixture
 def empty_app():
@@ -21,20 +26,130 @@ def empty_app():
     return app
 
 
-def get_test_data_path(filename):
+def get_test_data_path(filename, test_type=None):
     """
     Returns the path of a file in test_data folders.
     It's called from the test type directories (data_types, filtering, matrix, ...).
     To make it re-usable it must know who called it. It does so by inspecting the call stack.
+    Tests of other directories pass the test type of the file.
 
     :param filename: The name of the file to build the path for
+    :param test_type: Optional test type directory (data_types, filtering, matrix, ...) of the file.
+                      If None, the test_data folder next to the calling module is used.
     :return: The path to the file.
     """
+    if test_type is not None:
+        return os.path.join(TESTS_PATH, test_type, 'test_data', filename)
     frame = inspect.stack()[1]
     py_module = inspect.getmodule(frame[0])
     return os.path.join(os.path.dirname(py_module.__file__), 'test_data', filename)
 
 
+# Configurations and workbooks (test type, config, workbook) of the test types, which are read the same way by
+# all engines, modes and readers
+FIXTURES = [
+    ('data_types', 'config.json', 'data_types_libreoffice.xlsx'),
+    ('data_types', 'config.json', 'data_types_excel_2013.xlsx'),
+    ('data_types', 'config.json', 'data_types_excel_2013.xlsm'),
+    ('data_types', 'config.json', 'data_types_stale_dimension.xlsx'),
+    ('filtering', 'column_based.json', 'column_based.xlsx'),
+    ('filtering', 'row_based.json', 'row_based.xlsx'),
+    ('filtering', 'column_based_filter_pattern.json', 'column_based.xlsx'),
+    ('filtering', 'row_based_filter_pattern.json', 'row_based.xlsx'),
+    ('filtering', 'excluded_enable_logging.json', 'excluded_logging.xlsx'),
+    ('filtering', 'excluded_disable_logging.json', 'excluded_logging.xlsx'),
+    ('filtering', 'excluded_fail_on_type_error.json', 'excluded_fail_on_type_error.xlsx'),
+    ('filtering', 'excluded_fail_on_empty_cell.json', 'excluded_fail_on_empty_cell.xlsx'),
+    ('filtering', 'filter_check_failed.json', 'filter_check_failed.xlsx'),
+    ('matrix', 'config_column_based_position_mix.json', 'column_based_position_mix_1.xlsx'),
+    ('matrix', 'config_column_based_position_mix.json', 'column_based_position_mix_2.xlsx'),
+    ('matrix', 'config_column_based_position_mix.json', 'column_based_position_mix_3.xlsx'),
+    ('matrix', 'config_column_based_position_mix.json', 'column_based_position_mix_4.xlsx'),
+    ('matrix', 'config_column_based_errors_1.json', 'column_based.xlsx'),
+    ('matrix', 'config_column_based_errors_2.json', 'column_based.xlsx'),
+    ('matrix', 'config_column_based_errors_3.json', 'column_based.xlsx'),
+    ('matrix', 'config_column_based_errors_4.json', 'column_based.xlsx'),
+    ('matrix', 'config_row_based_position_mix.json', 'row_based_position_mix_1.xlsx'),
+    ('matrix', 'config_row_based_position_mix.json', 'row_based_position_mix_2.xlsx'),
+    ('matrix', 'config_row_based_position_mix.json', 'row_based_position_mix_3.xlsx'),
+    ('matrix', 'config_row_based_position_mix.json', 'row_based_position_mix_4.xlsx'),
+    ('sheet', 'config_sheet_active.json', 'sheets.xlsx'),
+    ('sheet', 'config_sheet_index.json', 'sheets.xlsx'),
+    ('sheet', 'config_sheet_index_out_of_range.json', 'sheets.xlsx'),
+    ('sheet', 'config_sheet_name.json', 'sheets.xlsx'),
+    ('sheet', 'config_sheet_name_not_exist.json', 'sheets.xlsx'),
+    ('sheet', 'config_sheet_first.json', 'sheets.xlsx'),
+    ('sheet', 'config_sheet_last.json', 'sheets.xlsx'),
+]
+
+
+# Headers of the data_types configuration (data_types/test_data/config.json)
+DATA_TYPES_HEADERS = ['Date', 'Enum', 'Float', 'Integer', 'Text']
+
+# Data rows of the data_types configuration with a row of invalid values and an empty cell, see workbook_path
+INVALID_DATA_ROWS = [
+    [datetime.datetime(2017, 8, 20), 'ape', 1.1, -2, 'Text 1'],
+    ['no date', 'cow', 1.1, 50, 'Text 2'],
+    [datetime.datetime(2018, 9, 21), 'dog', 22.22, 0, 'Text 3'],
+    [datetime.datetime(2019, 10, 22), 'cat', 0.5, 1, None],
+]
+
+
+def get_data_rows(count):
+    """
+    :param count: The number of rows
+    :return: List of valid data rows of the data_types configuration
+    """
+    return [[datetime.datetime(2017, 8, 20) + datetime.timedelta(days=index), ['ape', 'dog'][index % 2], index + 1.5,
+             index, 'Text {0}'.format(index % 10)] for index in range(count)]
+
+
+def write_workbook(path, rows=None, count=25):
+    """
+    Writes a workbook with the headers of the data_types configuration in the first row of the active sheet.
+
+    :param path: The path of the workbook
+    :param rows: The data rows below the headers. If None, count rows of get_data_rows are written.
+    :param count: The number of generated rows
+    :return: The path
+    """
+    workbook = openpyxl.Workbook()
+    workbook.active.append(DATA_TYPES_HEADERS)
+    for values in get_data_rows(count) if rows is None else rows:
+        workbook.active.append(values)
+    workbook.save(path)
+    return path
+
+
+@pytest.fixture
+def workbook_path(tmpdir):
+    """
+    Writes a workbook of the data_types configuration with INVALID_DATA_ROWS and returns its path.
+    """
+    return write_workbook(str(tmpdir.join('workbook.xlsx')), INVALID_DATA_ROWS)
+
+
+def read_excel_variants(plugin, config_path, workbook_path, variants, **kwargs):
+    """
+    Reads a workbook once for each variant of read_excel arguments (engine, read-only mode, workers, ...).
+
+    :param plugin: The plugin to read with
+    :param config_path: The configuration
+    :param workbook_path: The workbook
+    :param variants: List of dictionaries of keyword arguments of read_excel, one per read
+    :param kwargs: Keyword arguments of read_excel for all reads
+    :return: List of the data or the type and message of the raised exception, one per variant
+    """
+    results = []
+    for variant in variants:
+        arguments = dict(kwargs, **variant)
+        try:
+            results.append(plugin.excel_validation.read_excel(config_path, workbook_path, **arguments))
+        except Exception as exc:
+            results.append((type(exc), str(exc)))
+    return results
+
+
 class EmptyPlugin(ExcelValidationPattern):
     """
     A plugin that inherits from the ExcelValidationPattern.
@@ -0,0 +1,121 @@
+import csv
+import datetime
+
+import openpyxl
+import pytest
+
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.csv_reader import to_float, to_integer
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+
+def to_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(' ')
+    return str(value)
+
+
+def write_csv(workbook_path, csv_path, delimiter=','):
+    """
+    Writes the active sheet of a workbook as CSV file.
+    """
+    worksheet = openpyxl.load_workbook(workbook_path, data_only=True).active
+    with open(csv_path, 'w', newline='', encoding='utf-8') as file_pointer:
+        writer = csv.writer(file_pointer, delimiter=delimiter)
+        for line in worksheet.iter_rows(values_only=True):
+            writer.writerow([to_text(value) for value in line])
+    return csv_path
+
+
+@pytest.mark.parametrize('path, config', [
+    (get_test_data_path('column_based_position_mix_{0}.xlsx'.format(index), 'matrix'),
+     get_test_data_path('config_column_based_position_mix.json', 'matrix')) for index in range(1, 5)
+] + [
+    (get_test_data_path('row_based_position_mix_{0}.xlsx'.format(index), 'matrix'),
+     get_test_data_path('config_row_based_position_mix.json', 'matrix')) for index in range(1, 5)
+] + [
+    (get_test_data_path('column_based.xlsx', 'filtering'), get_test_data_path('column_based.json', 'filtering')),
+    (get_test_data_path('row_based.xlsx', 'filtering'), get_test_data_path('row_based.json', 'filtering')),
+])
+@pytest.mark.parametrize('extension, delimiter', [('.csv', ','), ('.tsv', '\t')])
+def test_csv_same_as_workbook(empty_app, tmpdir, path, config, extension, delimiter):
+    plugin = EmptyPlugin(empty_app)
+    csv_path = write_csv(path, str(tmpdir.join('data' + extension)), delimiter)
+    assert plugin.excel_validation.read_excel(config, csv_path) == plugin.excel_validation.read_excel(config, path)
+
+
+@pytest.mark.parametrize('path', ['data_types_excel_2013.xlsx', 'data_types_libreoffice.xlsx'])
+def test_csv_errors_same_as_workbook(empty_app, tmpdir, path):
+    plugin = EmptyPlugin(empty_app)
+    path = get_test_data_path(path, 'data_types')
+    config = get_test_data_path('config.json', 'data_types')
+    csv_path = write_csv(path, str(tmpdir.join('data.csv')))
+
+    expected = plugin.excel_validation.validate_excel(config, path)
+    report = plugin.excel_validation.validate_excel(config, csv_path)
+    assert report.data == expected.data
+    assert report.errors == expected.errors
+
+
+def test_csv_conversion(empty_app, tmpdir):
+    csv_path = str(tmpdir.join('data.csv'))
+    with open(csv_path, 'w', encoding='utf-8-sig') as file_pointer:
+        file_pointer.write('Date,Enum,Float,Integer,Text\n'
+                           '2017-08-20,ape,1.5,-2,Text 1\n'
+                           '2017-08-21T10:30:00,dog,2,3.0,Text 2\n'
+                           '21.08.2017,cat,two,3.5,Text 3\n')
+    plugin = EmptyPlugin(empty_app)
+    config = get_test_data_path('config.json', 'data_types')
+    report = plugin.excel_validation.validate_excel(config, csv_path)
+
+    assert report.data == {
+        2: {'Date': datetime.datetime(2017, 8, 20), 'Enum': 'ape', 'Float': 1.5, 'Integer': -2, 'Text': 'Text 1'},
+        3: {'Date': datetime.datetime(2017, 8, 21, 10, 30), 'Enum': 'dog', 'Float': 2.0, 'Integer': 3,
+            'Text': 'Text 2'},
+    }
+    assert [(x.coordinate, x.rule, x.value) for x in report.errors] == [
+        ('A4', 'type', '21.08.2017'), ('C4', 'type', 'two'), ('D4', 'type', 3.5)]
+
+
+@pytest.mark.parametrize('text, expected_float, expected_integer', [
+    ('1.5', 1.5, 1.5),
+    (' -2 ', -2.0, -2),
+    ('+.5e-3', 0.0005, 0.0005),
+    ('3.', 3.0, 3.0),
+    ('1e400', '1e400', '1e400'),
+    ('nan', 'nan', 'nan'),
+    ('-inf', '-inf', '-inf'),
+    ('Infinity', 'Infinity', 'Infinity'),
+    ('1_000', '1_000', '1_000'),
+    ('1_000.5', '1_000.5', '1_000.5'),
+    ('\u0661\u0662', '\u0661\u0662', '\u0661\u0662'),
+    ('0x10', '0x10', '0x10'),
+    ('', '', ''),
+])
+def test_csv_number_conversion(text, expected_float, expected_integer):
+    assert to_float(text) == expected_float and type(to_float(text)) is type(expected_float)
+    assert to_integer(text) == expected_integer and type(to_integer(text)) is type(expected_integer)
+
+
+def test_csv_non_finite_numbers(empty_app, tmpdir):
+    csv_path = str(tmpdir.join('data.csv'))
+    with open(csv_path, 'w', encoding='utf-8') as file_pointer:
+        file_pointer.write('Date,Enum,Float,Integer,Text\n'
+                           '2017-08-20,ape,nan,1_000,Text 1\n'
+                           '2017-08-21,dog,Infinity,-inf,Text 2\n')
+    plugin = EmptyPlugin(empty_app)
+    report = plugin.excel_validation.validate_excel(get_test_data_path('config.json', 'data_types'), csv_path)
+    assert report.data == {}
+    assert [(x.coordinate, x.rule, x.value) for x in report.errors] == [
+        ('C2', 'type', 'nan'), ('D2', 'type', '1_000'), ('C3', 'type', 'Infinity'), ('D3', 'type', '-inf')]
+
+
+def test_csv_sheet_name(empty_app, tmpdir):
+    csv_path = write_csv(get_test_data_path('data_types_excel_2013.xlsx', 'data_types'), str(tmpdir.join('data.csv')))
+    plugin = EmptyPlugin(empty_app)
+    config = get_test_data_path('config.json', 'data_types')
+    results = plugin.excel_validation.read_excel_sheets(config, csv_path, ['name:data'])
+    assert list(results.keys()) == ['data']
+    with pytest.raises(KeyError):
+        plugin.excel_validation.read_excel_sheets(config, csv_path, ['name:other'])
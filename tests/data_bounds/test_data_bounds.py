@@ -0,0 +1,73 @@
+import json
+import time
+
+import openpyxl
+import pytest
+from openpyxl.styles import Font
+
+from tests.conftest import EmptyPlugin
+
+# Values of the oriented rows; None is an empty cell
+ROWS = [
+    ['Text', 'Integer', 'Note'],
+    ['Text 1', 1, None],
+    ['Text 2', 2, None],
+    [None, None, None],
+    [None, 4, None],
+    [None, None, 'Not configured'],
+]
+
+
+def write_workbook(path, orientation):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    for row, values in enumerate(ROWS, 1):
+        for column, value in enumerate(values, 1):
+            if orientation == 'row_based':
+                worksheet.cell(row=column, column=row, value=value)
+            else:
+                worksheet.cell(row=row, column=column, value=value)
+    # Formatted but empty cells at the end of the sheet extend the worksheet dimensions
+    worksheet['A100000'].font = Font(bold=True)
+    worksheet['ZZ1'].font = Font(bold=True)
+    workbook.save(path)
+
+
+def write_config(path, orientation):
+    config = {
+        'sheet_config': 'first',
+        'orientation': orientation,
+        'headers_index_config': {
+            'row_index': {'first': 'automatic', 'last': 'automatic'},
+            'column_index': {'first': 'automatic', 'last': 'automatic'}
+        },
+        'data_index_config': {
+            'row_index': {'first': 'automatic', 'last': 'automatic'},
+            'column_index': {'first': 'automatic', 'last': 'automatic'}
+        },
+        'data_type_config': [
+            {'header': 'Text', 'type': {'base': 'string'}, 'fail_on_empty_cell': False},
+            {'header': 'Integer', 'type': {'base': 'integer'}, 'fail_on_empty_cell': False}
+        ]
+    }
+    with open(path, 'w') as file_pointer:
+        json.dump(config, file_pointer)
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_automatic_last_row(empty_app, tmpdir, orientation, read_only):
+    plugin = EmptyPlugin(empty_app)
+    config_path = str(tmpdir.join('config.json'))
+    workbook_path = str(tmpdir.join('workbook.xlsx'))
+    write_config(config_path, orientation)
+    write_workbook(workbook_path, orientation)
+
+    start = time.perf_counter()
+    data = plugin.excel_validation.read_excel(config_path, workbook_path, read_only=read_only)
+    # The worksheet dimensions are not used, so the empty formatted rows are not read
+    assert time.perf_counter() - start < 5
+    # The last row has a value in the last configured column only; the value in the not configured column is ignored
+    assert sorted(data.keys()) == [2, 3, 4, 5]
+    assert data[4] == {'Text': None, 'Integer': None}
+    assert data[5] == {'Text': None, 'Integer': 4}
@@ -64,3 +64,20 @@ def test_excluded_logging(empty_app, caplog, activation_state):
     else:
         assert msg1 not in caplog.text
         assert msg2 not in caplog.text
+
+
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_filter_pattern(empty_app, caplog, orientation):
+    plugin = EmptyPlugin(empty_app)
+    workbook_path = get_test_data_path(orientation + '.xlsx')
+    config_path = get_test_data_path(orientation + '_filter_pattern.json')
+    data = plugin.excel_validation.read_excel(config_path, workbook_path)
+    assert sorted(data.keys()) == [2, 4]
+    assert data[2]['Text'] == 'Text 1'
+    assert data[4]['Text'] == 'Text 3'
+    if orientation == 'column_based':
+        assert 'The row 3 was excluded due to an exclude filter on cell E3 (Text 2 does not follow ' \
+               '^Text [13]$)' in caplog.text
+    else:
+        assert 'The column 3 was excluded due to an exclude filter on cell C5 (Text 2 does not follow ' \
+               '^Text [13]$)' in caplog.text
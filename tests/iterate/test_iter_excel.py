@@ -0,0 +1,29 @@
+
+import pytest
+
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_iter_excel(empty_app, orientation, read_only):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path(orientation + '.json', 'filtering')
+    workbook_path = get_test_data_path(orientation + '.xlsx', 'filtering')
+    rows = list(plugin.excel_validation.iter_excel(config_path, workbook_path, read_only=read_only))
+    assert [row for row, _ in rows] == [2, 4]
+    assert rows[0][1]['Enum'] == 'ape'
+    assert dict(rows) == plugin.excel_validation.read_excel(config_path, workbook_path)
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+def test_iter_excel_lazy_errors(empty_app, read_only):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    workbook_path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    rows = plugin.excel_validation.iter_excel(config_path, workbook_path, read_only=read_only)
+    row, data = next(rows)
+    assert row == 2
+    assert data['Enum'] == 'ape'
+    with pytest.raises(ValueError):
+        next(rows)
@@ -0,0 +1,189 @@
+import logging
+
+import openpyxl
+import pytest
+
+from benchmarks.workbook_generator import generate_workbook
+from groundwork_spreadsheets.patterns.ExcelValidationPattern import partitions
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.partitions import SheetLayout, split_rows
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.sheet_readers import WorksheetReader
+from tests.conftest import FIXTURES, EmptyPlugin, get_test_data_path, read_excel_variants
+
+
+@pytest.fixture
+def small_partitions(monkeypatch):
+    monkeypatch.setattr(partitions, 'MIN_PARTITION_ROWS', 1)
+
+
+@pytest.mark.parametrize('test_type, config, path', FIXTURES)
+@pytest.mark.parametrize('engine', ['openpyxl', 'xml'])
+def test_partitioned_equals_serial(empty_app, small_partitions, caplog, test_type, config, path, engine):
+    plugin = EmptyPlugin(empty_app)
+    caplog.clear()
+    with caplog.at_level(logging.DEBUG):
+        serial, partitioned = read_excel_variants(plugin, get_test_data_path(config, test_type),
+                                                  get_test_data_path(path, test_type),
+                                                  [{'engine': engine}, {'workers': 3}])
+    assert serial == partitioned
+    messages = [(x.levelno, x.getMessage()) for x in caplog.records if x.name == plugin.log.name]
+    assert messages[:len(messages) // 2] == messages[len(messages) // 2:]
+
+
+def test_partitioned_filter_messages(empty_app, small_partitions, caplog):
+    plugin = EmptyPlugin(empty_app)
+    with caplog.at_level(logging.DEBUG):
+        plugin.excel_validation.read_excel(get_test_data_path('filter_check_failed.json', 'filtering'),
+                                           get_test_data_path('filter_check_failed.xlsx', 'filtering'), workers=3)
+    messages = [x.getMessage() for x in caplog.records]
+    assert 'Cannot apply enum filter to cell B3 because the enum values check failed.' in messages
+    assert 'Cannot apply string filter to cell E7 because the type check failed.' in messages
+    assert any(x.startswith('The row 8 was excluded due to an exclude filter') for x in messages)
+
+
+def read_stats(plugin, config_path, workbook_path, **kwargs):
+    """
+    Reads a workbook and returns the counters of its ReadStats
+    """
+    try:
+        plugin.excel_validation.validate_excel(config_path, workbook_path, **kwargs)
+    except Exception:
+        pass
+    stats = plugin.excel_validation.last_stats
+    return stats.rows_scanned, stats.rows_excluded, stats.rows_failed, stats.columns, stats.violations
+
+
+@pytest.mark.parametrize('test_type, config, path', FIXTURES)
+def test_partitioned_stats(empty_app, small_partitions, test_type, config, path):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.collect_stats = True
+    config_path, workbook_path = get_test_data_path(config, test_type), get_test_data_path(path, test_type)
+    assert read_stats(plugin, config_path, workbook_path) == read_stats(plugin, config_path, workbook_path,
+                                                                        workers=3)
+    if plugin.excel_validation.last_stats.rows_scanned:
+        assert list(plugin.excel_validation.last_stats.durations)[-1] == 'validation'
+
+
+def test_partitioned_stats_signal(empty_app, tmpdir, small_partitions):
+    plugin = EmptyPlugin(empty_app)
+    plugin.signals.register('excel_read_stats', 'Statistics of the Excel reads')
+    received = []
+    plugin.signals.connect('stats_receiver', 'excel_read_stats', lambda plugin, stats: received.append(stats),
+                           'Collects the statistics')
+    plugin.excel_validation.stats_signal = 'excel_read_stats'
+    path = str(tmpdir.join('generated.xlsx'))
+    config = generate_workbook(path, 300, 8, dirty_ratio=0.1)
+    for kwargs in [{}, {'max_errors': 5, 'stop_at_max_errors': True}]:
+        for workers in (None, 4):
+            plugin.excel_validation.validate_excel(config, path, workers=workers, **kwargs)
+        assert len(received) == 2
+        serial, partitioned = received
+        assert partitioned is plugin.excel_validation.last_stats
+        assert (serial.rows_scanned, serial.rows_excluded, serial.rows_failed, serial.violations) == \
+            (partitioned.rows_scanned, partitioned.rows_excluded, partitioned.rows_failed, partitioned.violations)
+        assert serial.rows_failed > 0
+        del received[:]
+
+
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+@pytest.mark.parametrize('result_format', ['dict', 'records'])
+def test_partitioned_report(empty_app, tmpdir, small_partitions, orientation, result_format):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('generated.xlsx'))
+    config = generate_workbook(path, 300, 8, orientation, dirty_ratio=0.1)
+    reports = [plugin.excel_validation.validate_excel(config, path, result_format=result_format, workers=workers)
+               for workers in (None, 4)]
+    assert reports[0].error_count > 0
+    assert reports[0].data == reports[1].data
+    assert [(x.row, x.column, x.rule, x.value) for x in reports[0].errors] == \
+        [(x.row, x.column, x.rule, x.value) for x in reports[1].errors]
+
+
+def test_partitioned_stop_at_max_errors(empty_app, tmpdir, small_partitions):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('generated.xlsx'))
+    config = generate_workbook(path, 300, 8, dirty_ratio=0.1)
+    reports = [plugin.excel_validation.validate_excel(config, path, max_errors=5, stop_at_max_errors=True,
+                                                      workers=workers)
+               for workers in (None, 4)]
+    assert not reports[0].complete and not reports[1].complete
+    assert reports[0].data == reports[1].data
+    assert reports[0].errors == reports[1].errors
+
+
+def gaps_workbook():
+    """
+    :return: Workbook with a 'Text' column with empty cells between the values of the rows 2 to 13
+    """
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(['Text'])
+    for row, text in enumerate(['a', 'b', None, 'c', None, None, 'd', 'e', None, None, None, 'f'], 2):
+        worksheet.cell(row=row, column=1, value=text)
+    # A formatted cell without a value extends the dimension
+    worksheet.cell(row=20, column=1).number_format = '0.00'
+    return workbook
+
+
+@pytest.mark.parametrize('last_data_row', ['automatic', 'severalEmptyCells:0', 'severalEmptyCells:1',
+                                           'severalEmptyCells:2', 'severalEmptyCells:9'])
+def test_partitioned_last_data_row(empty_app, tmpdir, small_partitions, caplog, last_data_row):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('gaps.xlsx'))
+    gaps_workbook().save(path)
+    config = {
+        'sheet_config': 'active',
+        'orientation': 'column_based',
+        'headers_index_config': {
+            'row_index': {'first': 1, 'last': 1},
+            'column_index': {'first': 1, 'last': 'automatic'},
+        },
+        'data_index_config': {
+            'row_index': {'first': 2, 'last': last_data_row},
+            'column_index': {'first': 1, 'last': 'automatic'},
+        },
+        'data_type_config': [{'header': 'Text', 'fail_on_empty_cell': False, 'type': {'base': 'string'}}],
+    }
+    with caplog.at_level(logging.DEBUG):
+        serial, partitioned = read_excel_variants(plugin, config, path, [{}, {'workers': 4}], engine='xml')
+    assert serial == partitioned
+    updates = [x.getMessage() for x in caplog.records if x.getMessage().startswith('Config update: Last data row')]
+    assert len(updates) == 2 and updates[0] == updates[1]
+
+
+def test_partitioned_openpyxl_engine(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('column_based.json', 'filtering')
+    path = get_test_data_path('column_based.xlsx', 'filtering')
+    with pytest.raises(ValueError, match="workers can only be used with the 'xml' engine"):
+        plugin.excel_validation.read_excel(config_path, path, engine='openpyxl', workers=2)
+    with pytest.raises(ValueError, match="workers can only be used with the 'xml' engine"):
+        plugin.excel_validation.validate_excel(config_path, path, engine='openpyxl', workers=2)
+    assert plugin.excel_validation.read_excel(config_path, path, engine='openpyxl', workers=1) == \
+        plugin.excel_validation.read_excel(config_path, path, workers=2)
+
+
+def test_partitioned_workbook_fallback(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('column_based.json', 'filtering')
+    path = get_test_data_path('column_based.xlsx', 'filtering')
+    with open(path, 'rb') as file_pointer:
+        assert plugin.excel_validation.read_excel(config_path, file_pointer, workers=2) == \
+            plugin.excel_validation.read_excel(config_path, path)
+
+
+def test_split_rows():
+    assert split_rows(2, 11, 3, min_rows=1) == [(2, 5), (6, 9), (10, 11)]
+    assert split_rows(2, 11, 3, min_rows=4) == [(2, 6), (7, 11)]
+    assert split_rows(2, 11, 3, min_rows=20) == [(2, 11)]
+    assert split_rows(5, 5, 4, min_rows=1) == [(5, 5)]
+    assert split_rows(5, 4, 4, min_rows=1) == [(5, 4)]
+
+
+def test_sheet_layout_row_span():
+    reader = WorksheetReader(gaps_workbook().active, 'column_based')
+    for row_last, expected in [(5, 5), ('automatic', 13), ('severalEmptyCells:0', 2), ('severalEmptyCells:1', 3),
+                               ('severalEmptyCells:2', 4), ('severalEmptyCells:4', 6), ('severalEmptyCells:9', 7)]:
+        layout = SheetLayout()
+        assert layout.start(reader, 2, row_last, [1]) is None
+        # The rows are bounded by the data, not by the dimension extended by the formatted cell
+        assert layout.row_span == (2, expected)
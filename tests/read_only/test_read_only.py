@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from tests.conftest import FIXTURES, EmptyPlugin, get_test_data_path, read_excel_variants
+
+MODES = [{'read_only': False}, {'read_only': True}]
+
+
+@pytest.mark.parametrize('test_type, config, path', FIXTURES)
+def test_read_only_equals_default(empty_app, test_type, config, path):
+    plugin = EmptyPlugin(empty_app)
+    default_result, read_only_result = read_excel_variants(plugin, get_test_data_path(config, test_type),
+                                                           get_test_data_path(path, test_type), MODES)
+    assert default_result == read_only_result
+
+
+@pytest.mark.parametrize('orientation, index_config, empty_cells', [
+    ('column_based', 'data_index_config', 1),
+    ('column_based', 'data_index_config', 3),
+    ('column_based', 'headers_index_config', 2),
+    ('row_based', 'data_index_config', 1),
+    ('row_based', 'data_index_config', 3),
+    ('row_based', 'headers_index_config', 2),
+])
+def test_read_only_several_empty_cells(empty_app, tmpdir, orientation, index_config, empty_cells):
+    plugin = EmptyPlugin(empty_app)
+    with open(get_test_data_path(orientation + '.json', 'filtering')) as file_pointer:
+        config = json.load(file_pointer)
+    # The last index of the data rows respectively the header columns
+    index = 'row_index' if (orientation == 'column_based') == (index_config == 'data_index_config') else 'column_index'
+    config[index_config][index]['last'] = 'severalEmptyCells:{0}'.format(empty_cells)
+    config_path = str(tmpdir.join('config.json'))
+    with open(config_path, 'w') as file_pointer:
+        json.dump(config, file_pointer)
+
+    workbook_path = get_test_data_path(orientation + '.xlsx', 'filtering')
+    default_result, read_only_result = read_excel_variants(plugin, config_path, workbook_path, MODES)
+    assert default_result == read_only_result
+    assert sorted(default_result.keys()) == [2, 4]
+
+
+def test_read_only_config(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    with open(get_test_data_path('config.json', 'data_types')) as file_pointer:
+        config = json.load(file_pointer)
+    config['read_only'] = True
+    config_path = str(tmpdir.join('config.json'))
+    with open(config_path, 'w') as file_pointer:
+        json.dump(config, file_pointer)
+
+    data = plugin.excel_validation.read_excel(config_path,
+                                              get_test_data_path('data_types_libreoffice.xlsx', 'data_types'))
+    assert data[2]['Enum'] == 'ape'
+    assert plugin.excel_validation.excel_config['read_only'] is True
+
+
+def test_read_only_stale_dimension(empty_app):
+    # The sheet XML stores the dimension A1:B2, but the data reaches to E4
+    plugin = EmptyPlugin(empty_app)
+    results = read_excel_variants(plugin, get_test_data_path('config.json', 'data_types'),
+                                  get_test_data_path('data_types_stale_dimension.xlsx', 'data_types'),
+                                  MODES + [{'read_only': True, 'engine': 'xml'}])
+    assert sorted(results[0].keys()) == [2, 3, 4]
+    assert results[1] == results[0] and results[2] == results[0]
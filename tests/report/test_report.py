@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from groundwork_spreadsheets import CellError
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+CONFIG_PATH = get_test_data_path('config.json', 'data_types')
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+def test_validate_excel(empty_app, workbook_path, read_only):
+    plugin = EmptyPlugin(empty_app)
+    report = plugin.excel_validation.validate_excel(CONFIG_PATH, workbook_path, read_only=read_only)
+    assert not report.is_valid
+    assert report.complete
+    # Only the rows without errors are returned
+    assert sorted(report.data.keys()) == [2, 4]
+    assert report.error_count == 5
+    assert [(x.row, x.column, x.coordinate, x.header, x.rule, x.value) for x in report.errors] == [
+        (3, 1, 'A3', 'Date', 'type', 'no date'),
+        (3, 2, 'B3', 'Enum', 'enum', 'cow'),
+        (3, 4, 'D3', 'Integer', 'maximum', 50),
+        (5, 5, 'E5', 'Text', 'empty_cell', None),
+        (5, 3, 'C5', 'Float', 'minimum', 0.5),
+    ]
+    assert report.errors[0].message == ("The value no date in cell A3 is of type <class 'str'>; "
+                                        "required by specification is datetime")
+
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel(CONFIG_PATH, workbook_path, read_only=read_only)
+
+
+def test_validate_excel_max_errors(empty_app, workbook_path):
+    plugin = EmptyPlugin(empty_app)
+    report = plugin.excel_validation.validate_excel(CONFIG_PATH, workbook_path, max_errors=2)
+    assert report.complete
+    assert report.error_count == 5
+    assert [x.coordinate for x in report.errors] == ['A3', 'B3']
+    assert sorted(report.data.keys()) == [2, 4]
+
+    report = plugin.excel_validation.validate_excel(CONFIG_PATH, workbook_path, max_errors=2,
+                                                    stop_at_max_errors=True, result_format='columnar')
+    assert not report.complete
+    # The row reaching the limit is completed
+    assert report.error_count == 3
+    assert len(report.errors) == 2
+    assert list(report.data.row_indices) == [2]
+
+
+def test_validate_excel_header_not_found(empty_app, workbook_path, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    with open(CONFIG_PATH) as file_pointer:
+        config = json.load(file_pointer)
+    config['data_type_config'].append({'header': 'Missing', 'type': {'base': 'automatic'}})
+    report = plugin.excel_validation.validate_excel(config, workbook_path)
+    assert report.errors[0] == CellError(None, None, 'Missing', 'header_not_found', None,
+                                         message="Config error: The header 'Missing' could not be found in "
+                                                 "the spreadsheet.")
+    assert report.errors[0].coordinate is None
+    assert report.error_count == 6
@@ -0,0 +1,202 @@
+import datetime
+import json
+import logging
+import pathlib
+import shutil
+
+import pytest
+
+from groundwork_spreadsheets import ResultCache
+from tests.conftest import DATA_TYPES_HEADERS, EmptyPlugin, get_data_rows, get_test_data_path, write_workbook
+
+CONFIG_PATH = get_test_data_path('config.json', 'data_types')
+
+
+@pytest.fixture
+def plugin(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.result_cache = ResultCache(str(tmpdir.join('cache.sqlite')))
+    return plugin
+
+
+def test_result_cache_hit(plugin, tmpdir, monkeypatch):
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=2)
+    excel_validation = plugin.excel_validation
+    data = excel_validation.read_excel(CONFIG_PATH, path)
+    assert excel_validation.result_cache.info()['misses'] == 1
+
+    # A hit does not open the workbook
+    monkeypatch.setattr(excel_validation, '_read_excel', None)
+    assert excel_validation.read_excel(CONFIG_PATH, path) == data
+    assert excel_validation.result_cache.info()['hits'] == 1
+    assert excel_validation.result_cache.info()['entries'] == 1
+
+
+def test_result_cache_hit_has_no_stats(plugin, tmpdir):
+    excel_validation = plugin.excel_validation
+    excel_validation.collect_stats = True
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=2)
+    excel_validation.read_excel(CONFIG_PATH, path)
+    other_path = write_workbook(str(tmpdir.join('other.xlsx')), count=1)
+    excel_validation.read_excel(CONFIG_PATH, other_path)
+    assert excel_validation.last_stats.rows_included == 1
+
+    # The stats of the read of the other workbook are not kept
+    excel_validation.read_excel(CONFIG_PATH, path)
+    assert excel_validation.result_cache.info()['hits'] == 1
+    assert excel_validation.last_stats is None
+
+
+def test_result_cache_is_shared(plugin, empty_app, tmpdir):
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=2)
+    data = plugin.excel_validation.read_excel(CONFIG_PATH, path)
+    other = EmptyPlugin(empty_app)
+    other.excel_validation.result_cache = ResultCache(plugin.excel_validation.result_cache.path)
+    assert other.excel_validation.read_excel(CONFIG_PATH, path) == data
+    assert other.excel_validation.result_cache.hits == 1
+
+
+def test_result_cache_keys(plugin, tmpdir):
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=2)
+    excel_validation = plugin.excel_validation
+    excel_validation.read_excel(CONFIG_PATH, path)
+
+    # A copy of the workbook has the same content
+    copied_path = str(tmpdir.join('copy.xlsx'))
+    shutil.copy(path, copied_path)
+    excel_validation.read_excel(CONFIG_PATH, copied_path)
+    assert excel_validation.result_cache.hits == 1
+
+    # Another result format, configuration or content is another entry
+    columnar = excel_validation.read_excel(CONFIG_PATH, path, result_format='columnar')
+    assert columnar.headers == DATA_TYPES_HEADERS
+    with open(CONFIG_PATH) as file_pointer:
+        config = json.load(file_pointer)
+    config['data_type_config'] = config['data_type_config'][:2]
+    assert list(excel_validation.read_excel(config, path)[2].keys()) == ['Date', 'Enum']
+    write_workbook(path, count=1)
+    assert len(excel_validation.read_excel(CONFIG_PATH, path)) == 1
+    assert excel_validation.result_cache.info()['hits'] == 1
+    assert excel_validation.result_cache.info()['entries'] == 4
+
+
+def test_result_cache_read_only_and_engine(plugin, tmpdir):
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=2)
+    excel_validation = plugin.excel_validation
+    data = excel_validation.read_excel(CONFIG_PATH, path)
+    assert excel_validation.read_excel(CONFIG_PATH, path, read_only=True) == data
+    assert excel_validation.read_excel(CONFIG_PATH, path, engine='xml') == data
+    assert excel_validation.result_cache.info()['entries'] == 3
+
+    # The arguments are keyed by their value after applying the configuration
+    excel_validation.read_excel(CONFIG_PATH, path, read_only=False, engine='openpyxl')
+    assert excel_validation.result_cache.hits == 1
+    assert excel_validation.result_cache.info()['entries'] == 3
+
+
+def test_result_cache_path_like(plugin, tmpdir):
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=2)
+    excel_validation = plugin.excel_validation
+    data = excel_validation.read_excel(CONFIG_PATH, path)
+    assert excel_validation.read_excel(CONFIG_PATH, pathlib.Path(path)) == data
+    assert excel_validation.result_cache.hits == 1
+
+    csv_path = tmpdir.join('workbook.csv')
+    csv_path.write('Date,Enum,Float,Integer,Text\n2017-08-20,ape,1.1,-2,Text 1\n')
+    csv_data = excel_validation.read_excel(CONFIG_PATH, pathlib.Path(str(csv_path)))
+    assert csv_data[2]['Enum'] == 'ape'
+    assert excel_validation.read_excel(CONFIG_PATH, str(csv_path)) == csv_data
+    assert excel_validation.result_cache.hits == 2
+
+
+def test_result_cache_validate_excel(plugin):
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    excel_validation = plugin.excel_validation
+    report = excel_validation.validate_excel(config_path, path)
+    cached_report = excel_validation.validate_excel(config_path, path)
+    assert excel_validation.result_cache.hits == 1
+    assert cached_report.errors == report.errors
+    assert cached_report.errors[0].coordinate == 'E3'
+    assert cached_report.data == report.data
+    excel_validation.validate_excel(config_path, path, max_errors=1)
+    assert excel_validation.result_cache.hits == 1
+
+
+def test_result_cache_replays_warnings(plugin, caplog):
+    config_path = get_test_data_path('excluded_enable_logging.json', 'filtering')
+    path = get_test_data_path('excluded_logging.xlsx', 'filtering')
+    excel_validation = plugin.excel_validation
+    with caplog.at_level(logging.WARNING):
+        data = excel_validation.read_excel(config_path, path)
+    warnings = [x.getMessage() for x in caplog.records if x.levelno == logging.WARNING]
+    assert warnings
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        assert excel_validation.read_excel(config_path, path) == data
+    assert excel_validation.result_cache.hits == 1
+    assert [x.getMessage() for x in caplog.records if x.levelno == logging.WARNING] == warnings
+
+
+def test_result_cache_bypass_and_clear(plugin, tmpdir):
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=2)
+    excel_validation = plugin.excel_validation
+    excel_validation.read_excel(CONFIG_PATH, path, use_cache=False)
+    assert excel_validation.result_cache.info()['entries'] == 0
+    excel_validation.read_excel(CONFIG_PATH, path)
+    excel_validation.read_excel(CONFIG_PATH, path, use_cache=False)
+    assert excel_validation.result_cache.hits == 0
+    excel_validation.result_cache.clear()
+    assert excel_validation.result_cache.info()['entries'] == 0
+    assert excel_validation.result_cache.info()['size'] == 0
+
+
+def test_result_cache_errors_are_not_cached(plugin):
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            plugin.excel_validation.read_excel(config_path, path)
+    assert plugin.excel_validation.result_cache.info()['entries'] == 0
+
+
+def test_result_cache_lru_eviction(tmpdir):
+    cache = ResultCache(str(tmpdir.join('cache.sqlite')), max_size=3500)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, 'x' * 1000, [])
+    assert cache.get('a') is not None
+    cache.put('d', 'x' * 1000, [])
+    assert cache.get('b') is None
+    assert cache.get('a') == ('x' * 1000, [])
+    assert cache.get('d') is not None
+    assert cache.info()['size'] <= 3500
+    cache.put('e', 'x' * 5000, [])
+    assert cache.get('e') is None
+
+
+def test_result_cache_replays_all_messages(plugin, tmpdir, caplog):
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')),
+                          get_data_rows(2) + [[datetime.datetime(2019, 1, 1), 'cow', 3.3, 1, 'Text 4']])
+    with open(CONFIG_PATH) as file_pointer:
+        config = json.load(file_pointer)
+    for data_type_config in config['data_type_config']:
+        if data_type_config['header'] == 'Enum':
+            data_type_config['type']['filter'] = {'whitelist_values': ['ape']}
+            data_type_config['fail_on_type_error'] = False
+    config['data_type_config'].append({'header': 'Missing', 'type': {'base': 'string'},
+                                       'fail_on_header_not_found': False})
+    excel_validation = plugin.excel_validation
+
+    def read_messages():
+        caplog.clear()
+        with caplog.at_level(logging.DEBUG):
+            data = excel_validation.read_excel(config, path)
+        return data, [(x.levelno, x.getMessage()) for x in caplog.records if x.name == plugin.log.name]
+
+    data, messages = read_messages()
+    assert (logging.ERROR, "Config error: The header 'Missing' could not be found in the spreadsheet.") in messages
+    assert (logging.ERROR, 'Cannot apply enum filter to cell B4 because the enum values check failed.') in messages
+    assert (logging.DEBUG, 'The row 3 was excluded due to an exclude filter on cell B3 (dog not in [ape]).') \
+        in messages
+    assert read_messages() == (data, messages)
+    assert excel_validation.result_cache.hits == 1
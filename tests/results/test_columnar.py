@@ -0,0 +1,60 @@
+import datetime
+
+import pytest
+
+from groundwork_spreadsheets import ColumnarResult
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.results import DateColumn, FloatColumn, IntegerColumn
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+def test_columnar_result(empty_app, read_only):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('column_based.json', 'filtering')
+    workbook_path = get_test_data_path('column_based.xlsx', 'filtering')
+    result = plugin.excel_validation.read_excel(config_path, workbook_path, read_only=read_only,
+                                                result_format='columnar')
+    assert isinstance(result, ColumnarResult)
+    assert len(result) == 2
+    assert list(result.row_indices) == [2, 4]
+    assert result.headers == ['Date', 'Enum', 'Float', 'Integer', 'Text']
+    assert list(result['Enum']) == ['ape', 'cat']
+    assert result['Integer'].data.typecode == 'q'
+    assert result['Float'].data.typecode == 'd'
+    assert result['Date'].data.typecode == 'q'
+    assert result['Date'][1] == datetime.datetime(2019, 10, 22)
+    assert result['Float'][:] == [1.1, 333.333]
+    assert result.to_dict() == plugin.excel_validation.read_excel(config_path, workbook_path)
+
+
+def test_columnar_unknown_format(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel(get_test_data_path('column_based.json', 'filtering'),
+                                           get_test_data_path('column_based.xlsx', 'filtering'),
+                                           result_format='unknown')
+
+
+@pytest.mark.parametrize('column_class, values', [
+    (IntegerColumn, [1, 2, None, 4]),
+    (IntegerColumn, [1, 2 ** 70]),
+    (IntegerColumn, [1, True]),
+    (FloatColumn, [1.5, 2]),
+    (DateColumn, [datetime.datetime(2017, 8, 20, 12, 30, 15, 7), 'Text']),
+])
+def test_column_falls_back_to_list(column_class, values):
+    column = column_class()
+    for value in values:
+        column.append(value)
+    assert not column.is_typed
+    assert list(column) == values
+    assert [type(x) for x in column] == [type(x) for x in values]
+
+
+def test_column_typed():
+    column = DateColumn()
+    values = [datetime.datetime(1899, 12, 30), datetime.datetime(2017, 8, 20, 12, 30, 15, 7)]
+    for value in values:
+        column.append(value)
+    assert column.is_typed
+    assert list(column) == values
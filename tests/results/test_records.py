@@ -0,0 +1,67 @@
+import pickle
+
+import pytest
+
+from groundwork_spreadsheets import RecordResult
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.results import get_record_class
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+def test_record_result(empty_app, read_only):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('column_based.json', 'filtering')
+    workbook_path = get_test_data_path('column_based.xlsx', 'filtering')
+    result = plugin.excel_validation.read_excel(config_path, workbook_path, read_only=read_only,
+                                                result_format='records')
+    expected = plugin.excel_validation.read_excel(config_path, workbook_path)
+    assert isinstance(result, RecordResult)
+    assert result == expected
+    assert result.to_dict() == expected
+    assert result.headers == ('Date', 'Enum', 'Float', 'Integer', 'Text')
+    assert list(result[2].keys()) == list(expected[2].keys())
+    assert result[4]['Enum'] == 'cat'
+    assert not hasattr(result[2], '__dict__')
+    assert type(result[2]) is type(result[4])
+
+
+def test_record_result_validate_excel(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    workbook_path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    report = plugin.excel_validation.validate_excel(config_path, workbook_path, result_format='records')
+    assert isinstance(report.data, RecordResult)
+    assert report.data == plugin.excel_validation.validate_excel(config_path, workbook_path).data
+
+
+def test_record_strings_are_interned():
+    result = RecordResult(['Enum', 'Number'])
+    result.append(1, {'Enum': ''.join(['d', 'og']), 'Number': 1})
+    result.append(2, {'Enum': ''.join(['do', 'g']), 'Number': 2})
+    assert result[1]['Enum'] is result[2]['Enum']
+
+
+def test_record_class_is_generated_once():
+    assert get_record_class(('A', 'B')) is get_record_class(('A', 'B'))
+    assert get_record_class(('A', 'B')) is not get_record_class(('B', 'A'))
+
+
+def test_record():
+    record = get_record_class(('Text', 'Enum value'))(['Text 1', 'ape'])
+    assert record['Enum value'] == 'ape'
+    assert record.get('Missing') is None
+    assert dict(record) == {'Text': 'Text 1', 'Enum value': 'ape'}
+    with pytest.raises(KeyError):
+        record['Missing']
+    with pytest.raises(AttributeError):
+        record.text = 'Text 2'
+
+
+def test_record_result_pickle():
+    result = RecordResult(['Text', 'Float'])
+    result.append(3, {'Text': 'Text 1', 'Float': 1.5})
+    copied = pickle.loads(pickle.dumps(result))
+    assert copied == result
+    assert copied.headers == result.headers
+    copied.append(4, {'Text': 'Text 2', 'Float': 2.5})
+    assert copied[4]['Float'] == 2.5
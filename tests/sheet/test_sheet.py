@@ -57,3 +57,48 @@ def test_sheet_last(empty_app):
     config_path = get_test_data_path('config_sheet_last.json')
     data = plugin.excel_validation.read_excel(config_path, workbook_path)
     assert data[2]['Text'] == "sheet_last"
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+@pytest.mark.parametrize('workers', [None, 2])
+def test_read_excel_sheets(empty_app, read_only, workers):
+    plugin = EmptyPlugin(empty_app)
+    workbook_path = get_test_data_path('sheets.xlsx')
+    config_path = get_test_data_path('config_sheet_first.json')
+    results = plugin.excel_validation.read_excel_sheets(config_path, workbook_path, ['last', 'active', 1],
+                                                        read_only=read_only, workers=workers)
+    assert list(results) == ['sheet_last', 'sheet_middle_active', 'sheet_first']
+    for title, data in results.items():
+        assert data[2]['Text'] == title
+
+
+def test_read_excel_sheets_all(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    workbook_path = get_test_data_path('sheets.xlsx')
+    config_path = get_test_data_path('config_sheet_first.json')
+    results = plugin.excel_validation.read_excel_sheets(config_path, workbook_path, result_format='columnar')
+    assert list(results) == ['sheet_first', 'sheet_middle_active', 'sheet_last']
+    assert list(results['sheet_last']['Text']) == ['sheet_last'] * 3
+
+
+def test_read_excel_sheets_mapping(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    workbook_path = get_test_data_path('sheets.xlsx')
+    sheets = {
+        'name:sheet_middle_active': get_test_data_path('config_sheet_first.json'),
+        'last': None,
+    }
+    results = plugin.excel_validation.read_excel_sheets(get_test_data_path('config_sheet_active.json'), workbook_path,
+                                                        sheets)
+    assert list(results) == ['sheet_middle_active', 'sheet_last']
+    assert results['sheet_last'][2]['Text'] == 'sheet_last'
+
+
+def test_read_excel_sheets_errors(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    workbook_path = get_test_data_path('sheets.xlsx')
+    config_path = get_test_data_path('config_sheet_first.json')
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel_sheets(config_path, workbook_path, ['first', 1])
+    with pytest.raises(KeyError):
+        plugin.excel_validation.read_excel_sheets(config_path, workbook_path, ['name:sheet_not_exist'])
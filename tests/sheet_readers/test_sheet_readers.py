@@ -0,0 +1,90 @@
+import itertools
+
+import openpyxl
+import pytest
+
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.sheet_readers import (ReadOnlyWorksheetReader,
+                                                                                   WorksheetReader)
+from tests.conftest import get_test_data_path
+
+
+def read(reader):
+    line = list(itertools.islice(reader.iter_line(1, 1), 20))
+    rows = list(itertools.islice(reader.iter_rows(2, None, [1, 2, 3]), 20))
+    return line, rows
+
+
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_probing_creates_no_cells(orientation):
+    path = get_test_data_path(orientation + '.xlsx', 'filtering')
+    worksheet = openpyxl.load_workbook(path, data_only=True).active
+    cell_count = len(worksheet._cells)
+    dimensions = worksheet.dimensions
+
+    line, rows = read(WorksheetReader(worksheet, orientation))
+    # Far beyond the end of the worksheet
+    assert line[-1] is None
+    assert rows[-1] == (21, (None, None, None))
+    assert len(worksheet._cells) == cell_count
+    assert worksheet.dimensions == dimensions
+
+    read_only_workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        assert read(ReadOnlyWorksheetReader(read_only_workbook.active, orientation)) == (line, rows)
+    finally:
+        read_only_workbook.close()
+
+
+def write_row_based_workbook(path):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    # Headers in the first column, lines of different lengths and gaps
+    worksheet.append(['A'] + list(range(1, 21)))
+    worksheet.append(['B'] + ['b{0}'.format(x) if x % 3 else None for x in range(1, 21)])
+    worksheet.append([None])
+    worksheet.append(['D'] + list(range(100, 108)))
+    workbook.save(path)
+    return path
+
+
+@pytest.mark.parametrize('block_rows', [3, 1024])
+def test_row_based_read_only_single_pass(tmpdir, monkeypatch, block_rows):
+    from groundwork_spreadsheets.patterns.ExcelValidationPattern import sheet_readers
+    monkeypatch.setattr(sheet_readers, 'TRANSPOSE_BLOCK_ROWS', block_rows)
+    path = write_row_based_workbook(str(tmpdir.join('row_based.xlsx')))
+    worksheet = openpyxl.load_workbook(path, data_only=True).active
+    expected_reader = WorksheetReader(worksheet, 'row_based')
+    expected_line = list(itertools.islice(expected_reader.iter_line(1, 1), 6))
+    expected_rows = list(expected_reader.iter_rows(2, 25, [1, 2, 4]))
+    expected_populated = list(expected_reader.iter_populated_rows(2, [1, 2, 4]))
+    assert expected_rows[8] == (10, (9, None, None))
+    assert expected_rows[-1] == (25, (None, None, None))
+
+    read_only_workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        read_only_worksheet = read_only_workbook.active
+        passes = []
+        iter_rows = read_only_worksheet.iter_rows
+
+        def counting_iter_rows(*args, **kwargs):
+            passes.append(kwargs)
+            return iter_rows(*args, **kwargs)
+
+        monkeypatch.setattr(read_only_worksheet, 'iter_rows', counting_iter_rows)
+        reader = ReadOnlyWorksheetReader(read_only_worksheet, 'row_based')
+        assert list(itertools.islice(reader.iter_line(1, 1), 6)) == expected_line
+        assert reader.last_column(1) == 4
+        assert list(reader.iter_rows(2, 25, [1, 2, 4])) == expected_rows
+        assert len(passes) == 1
+
+        reader = ReadOnlyWorksheetReader(read_only_worksheet, 'row_based')
+        next(reader.iter_line(1, 1))
+        assert list(reader.iter_populated_rows(2, [1, 2, 4])) == expected_populated
+        assert len(passes) == 2
+
+        # Without the lines of the header row the data rows are read by another pass
+        rows = ReadOnlyWorksheetReader(read_only_worksheet, 'row_based').iter_rows(2, None, [1, 2, 4])
+        assert list(itertools.islice(rows, 24)) == expected_rows
+        assert len(passes) == 3
+    finally:
+        read_only_workbook.close()
@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from groundwork_spreadsheets import JsonLinesSink, SqliteSink
+from groundwork_spreadsheets.patterns.ExcelValidationPattern import sinks
+from tests.conftest import EmptyPlugin, get_test_data_path, write_workbook
+
+CONFIG_PATH = get_test_data_path('config.json', 'data_types')
+
+
+def read_table(path, table):
+    connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+    try:
+        return connection.execute('SELECT * FROM "{0}"'.format(table)).fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize('result_format', ['dict', 'columnar', 'records'])
+def test_sqlite_sink(empty_app, tmpdir, result_format):
+    plugin = EmptyPlugin(empty_app)
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')))
+    database = str(tmpdir.join('export.sqlite'))
+    with SqliteSink(database, 'my "items"', row_column='row') as sink:
+        count = plugin.excel_validation.read_excel(CONFIG_PATH, path, result_format=result_format, sink=sink,
+                                                   chunk_size=10)
+    assert count == sink.count == 25
+
+    data = plugin.excel_validation.read_excel(CONFIG_PATH, path)
+    expected = [(row,) + tuple(values.values()) for row, values in data.items()]
+    assert read_table(database, 'my ""items""') == expected
+    connection = sqlite3.connect(database)
+    try:
+        columns = connection.execute('PRAGMA table_info("my ""items""")').fetchall()
+    finally:
+        connection.close()
+    assert [(x[1], x[2]) for x in columns] == [('row', 'INTEGER'), ('Date', 'TIMESTAMP'), ('Enum', 'TEXT'),
+                                               ('Float', 'REAL'), ('Integer', 'INTEGER'), ('Text', 'TEXT')]
+
+
+def test_sqlite_sink_if_exists(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')), count=3)
+    database = str(tmpdir.join('export.sqlite'))
+    # Several reads into one sink
+    with SqliteSink(database, 'items') as sink:
+        plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=sink)
+        plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=sink)
+    assert len(read_table(database, 'items')) == 6
+
+    with pytest.raises(sqlite3.OperationalError):
+        with SqliteSink(database, 'items') as sink:
+            plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=sink)
+    with SqliteSink(database, 'items', if_exists='append') as sink:
+        plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=sink)
+    assert len(read_table(database, 'items')) == 9
+    with SqliteSink(database, 'items', if_exists='replace') as sink:
+        plugin.excel_validation.read_excel(CONFIG_PATH, path, sink=sink)
+    assert len(read_table(database, 'items')) == 3
+    with pytest.raises(ValueError):
+        SqliteSink(database, 'items', if_exists='truncate')
+
+
+def test_sqlite_sink_rollback(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    workbook_path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    database = str(tmpdir.join('export.sqlite'))
+    with pytest.raises(ValueError):
+        with SqliteSink(database, 'items') as sink:
+            plugin.excel_validation.read_excel(config_path, workbook_path, sink=sink, chunk_size=1)
+    # A chunk was written before the error, but neither the table nor the rows were committed
+    assert sink.count == 1
+    connection = sqlite3.connect(database)
+    try:
+        assert connection.execute('SELECT name FROM sqlite_master').fetchall() == []
+    finally:
+        connection.close()
+
+
+def test_json_lines_sink(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    path = write_workbook(str(tmpdir.join('workbook.xlsx')))
+    json_path = str(tmpdir.join('export.jsonl'))
+    with JsonLinesSink(json_path, row_key='row') as sink:
+        plugin.excel_validation.read_excel(CONFIG_PATH, path, result_format='columnar', sink=sink, chunk_size=7)
+    with open(json_path, encoding='utf-8') as file_pointer:
+        lines = file_pointer.read().split('\n')
+    assert len(lines) == 26 and lines[-1] == ''
+    assert lines[0] == '{"row":2,"Date":"2017-08-20 00:00:00","Enum":"ape","Float":1.5,"Integer":0,"Text":"Text 0"}'
+
+    data = plugin.excel_validation.read_excel(CONFIG_PATH, path)
+    for line, (row, values) in zip(lines, data.items()):
+        values = dict(values, Date=values['Date'].isoformat(' '))
+        assert json.loads(line) == dict(row=row, **values)
+
+
+def test_json_lines_sink_errors(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('excluded_fail_on_type_error.json', 'filtering')
+    workbook_path = get_test_data_path('excluded_fail_on_type_error.xlsx', 'filtering')
+    json_path = str(tmpdir.join('export.jsonl'))
+    with pytest.raises(ValueError):
+        with JsonLinesSink(json_path) as sink:
+            plugin.excel_validation.read_excel(config_path, workbook_path, sink=sink, chunk_size=1)
+    assert not os.path.exists(json_path)
+
+    # The headers are only known from read_excel
+    with pytest.raises(ValueError):
+        JsonLinesSink(json_path)({2: {'Enum': 'ape'}})
+
+
+def test_sink_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        sinks._Sink()
+
+    class TextSink(sinks._Sink):
+        def _open(self, data_type_configs):
+            self.lines = []
+
+        def _write(self, rows):
+            self.lines.extend(rows)
+
+    # close is not implemented
+    with pytest.raises(TypeError):
+        TextSink()
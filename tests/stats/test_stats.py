@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+CONFIG_PATH = get_test_data_path('config.json', 'data_types')
+
+
+def test_stats_disabled(empty_app, workbook_path):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.validate_excel(CONFIG_PATH, workbook_path)
+    assert plugin.excel_validation.last_stats is None
+
+
+@pytest.mark.parametrize('read_only', [False, True])
+def test_stats(empty_app, workbook_path, read_only):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.collect_stats = True
+    report = plugin.excel_validation.validate_excel(CONFIG_PATH, workbook_path, read_only=read_only)
+    stats = plugin.excel_validation.last_stats
+
+    assert list(stats.durations.keys()) == ['config', 'load_workbook', 'headers', 'last_row', 'validation']
+    assert all(x >= 0 for x in stats.durations.values())
+    assert stats.duration == pytest.approx(sum(stats.durations.values()))
+    assert stats.path == workbook_path
+    assert stats.sheet == 'Sheet'
+    assert stats.workbook_size == os.path.getsize(workbook_path)
+    assert stats.rows_scanned == 4
+    assert stats.rows_failed == len({x.row for x in report.errors})
+    assert stats.rows_included == len(report.data)
+    assert stats.rows_excluded == 0
+    assert stats.cells_validated == 20
+    assert sum(stats.violations.values()) >= report.error_count
+    assert stats.as_dict()['violations'] == dict(stats.violations)
+
+
+def test_stats_excluded_rows(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    plugin.excel_validation.collect_stats = True
+    data = plugin.excel_validation.read_excel(get_test_data_path('column_based.json', 'filtering'),
+                                              get_test_data_path('column_based.xlsx', 'filtering'))
+    stats = plugin.excel_validation.last_stats
+    assert stats.rows_excluded == 1
+    assert stats.rows_included == len(data)
+
+
+def test_stats_signal(empty_app, workbook_path):
+    plugin = EmptyPlugin(empty_app)
+    plugin.signals.register('excel_read_stats', 'Statistics of the Excel reads')
+    received = []
+    plugin.signals.connect('stats_receiver', 'excel_read_stats', lambda plugin, stats: received.append(stats),
+                           'Collects the statistics')
+    plugin.excel_validation.stats_signal = 'excel_read_stats'
+
+    plugin.excel_validation.validate_excel(CONFIG_PATH, workbook_path)
+    assert received == [plugin.excel_validation.last_stats]
+    assert received[0].rows_scanned == 4
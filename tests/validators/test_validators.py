@@ -0,0 +1,112 @@
+import datetime
+import logging
+import re
+
+import pytest
+
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.validators import compile_pattern, compile_validator
+
+LOG = logging.getLogger('test_validators')
+
+
+def get_validator(type_config, fail_on_type_error=True, fail_on_empty_cell=True):
+    return compile_validator({'header': 'Header', 'type': type_config, 'fail_on_type_error': fail_on_type_error,
+                              'fail_on_empty_cell': fail_on_empty_cell, 'fail_on_header_not_found': True},
+                             LOG.log, 'column_based')
+
+
+@pytest.mark.parametrize('type_config, value, expected_value, error_count', [
+    ({'base': 'automatic'}, 'anything', 'anything', 0),
+    ({'base': 'date'}, datetime.datetime(2017, 8, 20), datetime.datetime(2017, 8, 20), 0),
+    ({'base': 'date'}, 'Text', 'Text', 1),
+    ({'base': 'enum', 'enum_values': ['ape', 'dog']}, 'dog', 'dog', 0),
+    ({'base': 'enum', 'enum_values': ['ape', 'dog']}, 'cat', 'cat', 1),
+    ({'base': 'enum', 'enum_values': ['ape', 'dog']}, 3, 3, 1),
+    ({'base': 'float', 'minimum': 0, 'maximum': 1}, 0.5, 0.5, 0),
+    ({'base': 'float', 'minimum': 0, 'maximum': 1}, -0.5, -0.5, 1),
+    ({'base': 'float', 'minimum': 0, 'maximum': 1}, 1.5, 1.5, 1),
+    ({'base': 'float'}, 1, 1, 1),
+    ({'base': 'integer', 'minimum': 0}, 3.0, 3, 0),
+    ({'base': 'integer', 'minimum': 0}, -3.0, -3, 1),
+    ({'base': 'integer'}, 3.5, 3.5, 1),
+    ({'base': 'string', 'pattern': '^Text [0-9]$'}, 'Text 1', 'Text 1', 0),
+    ({'base': 'string', 'pattern': '^Text [0-9]$'}, 'Text 10', 'Text 10', 1),
+    ({'base': 'string'}, 12, 12, 1),
+    ({'base': 'string', 'convert_numbers': True}, 12, '12', 0),
+])
+def test_validator_values(type_config, value, expected_value, error_count):
+    errors = []
+    validated_value, is_excluded = get_validator(type_config)(value, 2, 1, errors)
+    assert validated_value == expected_value
+    assert type(validated_value) is type(expected_value)
+    assert not is_excluded
+    assert len(errors) == error_count
+    assert all(x.check == 'fail_on_type_error' and x.fatal for x in errors)
+
+
+@pytest.mark.parametrize('fail', [True, False])
+def test_validator_error_routing(fail):
+    validator = get_validator({'base': 'date'}, fail_on_type_error=fail, fail_on_empty_cell=fail)
+    errors = []
+    validator('Text', 2, 1, errors)
+    validator(None, 3, 1, errors)
+    assert [(x.check, x.fatal, x.message) for x in errors] == [
+        ('fail_on_type_error', fail,
+         "The value Text in cell A2 is of type <class 'str'>; required by specification is datetime"),
+        ('fail_on_empty_cell', fail, "The 'Header' in cell A3 is empty")]
+
+
+def test_validator_enum_filter():
+    validator = get_validator({'base': 'enum', 'enum_values': ['ape', 'dog', 'cat'],
+                               'filter': {'whitelist_values': ['ape', 'cat']}})
+    assert validator('ape', 2, 2, []) == ('ape', False)
+    assert validator('dog', 3, 2, []) == ('dog', True)
+
+
+@pytest.mark.parametrize('pattern', [
+    '^Text [0-9]$', '^Text', '^Text$', '^Te*xt', '^Text\\.[0-9]+', '^\\d+', '^Text|^Other', 'Text', '^$', '^',
+])
+@pytest.mark.parametrize('value', ['Text 1', 'Text 10', 'Text', 'Text\n', 'Tet', 'Text.12', '12', 'Other', ''])
+def test_pattern_matcher(pattern, value):
+    assert compile_pattern(pattern)(value) is (re.search(pattern, value) is not None)
+
+
+def test_validator_filter_pattern():
+    validator = get_validator({'base': 'string', 'pattern': '^Text', 'filter_pattern': '^Text [13]$'})
+    assert validator('Text 1', 2, 5, []) == ('Text 1', False)
+    assert validator('Text 2', 3, 5, []) == ('Text 2', True)
+
+
+def test_validator_coordinates():
+    validator = compile_validator({'header': 'Header', 'type': {'base': 'date'}, 'fail_on_type_error': True,
+                                   'fail_on_empty_cell': True, 'fail_on_header_not_found': True}, LOG.log, 'row_based')
+    errors = []
+    validator(None, 2, 3, errors)
+    # Oriented row 2 is the physical column B
+    error, = errors
+    assert error.message == "The 'Header' in cell B3 is empty"
+    assert (error.row, error.column, error.coordinate, error.header, error.rule) == (2, 3, 'B3', 'Header', 'empty_cell')
+
+
+def test_validator_lazy_message():
+    errors = []
+    get_validator({'base': 'enum', 'enum_values': ['ape', 'dog']})('cat', 2, 1, errors)
+    error, = errors
+    # The message is built on first access only
+    assert error._message is None
+    assert error.message == 'The value cat in cell A2 is not contained in the given enum [ape, dog]'
+    assert error._message is error.message
+
+
+def test_validator_lazy_filter_message():
+    calls = []
+    validator = compile_validator({'header': 'Header', 'type': {'base': 'enum', 'enum_values': ['ape', 'dog', 'cat'],
+                                                                'filter': {'whitelist_values': ['ape', 'cat']}},
+                                   'fail_on_type_error': True, 'fail_on_empty_cell': True,
+                                   'fail_on_header_not_found': True},
+                                  lambda level, msg, *args: calls.append((level, msg, args)), 'column_based')
+    assert validator('dog', 3, 2, []) == ('dog', True)
+    (level, msg, args), = calls
+    # The template is formatted by the logger only if the message is emitted
+    assert level == logging.DEBUG
+    assert msg % args == 'The row 3 was excluded due to an exclude filter on cell B3 (dog not in [ape, cat]).'
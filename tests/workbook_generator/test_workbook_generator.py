@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks.workbook_generator import count_dirty_rows, generate_workbook, get_config
+from tests.conftest import EmptyPlugin
+
+
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_generated_workbook(empty_app, tmpdir, orientation):
+    path = str(tmpdir.join('generated.xlsx'))
+    config = generate_workbook(path, 200, 7, orientation, dirty_ratio=0.2, seed=1)
+    plugin = EmptyPlugin(empty_app)
+
+    report = plugin.excel_validation.validate_excel(config, path)
+    dirty_rows = count_dirty_rows(200, 7, dirty_ratio=0.2, seed=1)
+    assert 0 < dirty_rows < 200
+    assert report.error_count == dirty_rows
+    assert sorted(report.data.keys()) == sorted(set(range(2, 202)) - {x.row for x in report.errors})
+    assert {x.rule for x in report.errors} == {'type', 'enum', 'minimum', 'pattern', 'empty_cell'}
+
+
+def test_row_based_limit(tmpdir):
+    with pytest.raises(ValueError):
+        generate_workbook(str(tmpdir.join('generated.xlsx')), 20000, orientation='row_based')
+
+
+def test_config_index_entries_are_independent():
+    config = get_config()
+    config['data_index_config']['row_index']['first'] = 3
+    assert config['headers_index_config']['row_index']['first'] == 'automatic'
+    assert config['data_index_config']['column_index']['first'] == 'automatic'
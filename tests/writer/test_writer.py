@@ -0,0 +1,181 @@
+import datetime
+import json
+import os
+
+import openpyxl
+import pytest
+
+from tests.conftest import EmptyPlugin, get_test_data_path
+
+CONFIG_PATH = get_test_data_path('config.json', 'data_types')
+
+ROWS = [
+    {'Date': datetime.datetime(2017, 8, 20), 'Enum': 'ape', 'Float': 1.1, 'Integer': -2, 'Text': 'Text 1'},
+    {'Date': datetime.datetime(2018, 9, 21, 13, 45), 'Enum': 'dog', 'Float': 22.22, 'Integer': 0, 'Text': 'Text 3'},
+    {'Date': datetime.datetime(2019, 1, 2), 'Enum': 'cat', 'Float': 333.0, 'Integer': 30, 'Text': 'Text 5'},
+]
+
+
+def get_config(**changes):
+    with open(CONFIG_PATH) as file_pointer:
+        config = json.load(file_pointer)
+    config.update(changes)
+    return config
+
+
+@pytest.mark.parametrize('test_type, config, path', [
+    ('data_types', 'config.json', 'data_types_excel_2013.xlsx'),
+    ('filtering', 'column_based.json', 'column_based.xlsx'),
+    ('filtering', 'row_based.json', 'row_based.xlsx'),
+    ('matrix', 'config_column_based_position_mix.json', 'column_based_position_mix_2.xlsx'),
+    ('matrix', 'config_row_based_position_mix.json', 'row_based_position_mix_3.xlsx'),
+])
+def test_write_excel_round_trip(empty_app, tmpdir, test_type, config, path):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path(config, test_type)
+    data = plugin.excel_validation.read_excel(config_path, get_test_data_path(path, test_type))
+    path = str(tmpdir.join('written.xlsx'))
+    assert plugin.excel_validation.write_excel(config_path, data, path) == len(data)
+    assert list(plugin.excel_validation.read_excel(config_path, path).values()) == list(data.values())
+
+
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_write_excel_layout(empty_app, tmpdir, orientation):
+    plugin = EmptyPlugin(empty_app)
+    config = get_config(orientation=orientation, sheet_config=2)
+    config['headers_index_config']['row_index']['first'] = 3
+    config['headers_index_config']['column_index']['first'] = 2
+    config['data_index_config']['row_index']['first'] = 5
+    config['data_index_config']['column_index']['first'] = 5
+    if orientation == 'column_based':
+        config['data_index_config']['column_index']['first'] = 2
+    else:
+        config['data_index_config']['row_index']['first'] = 3
+    path = str(tmpdir.join('written.xlsx'))
+    plugin.excel_validation.write_excel(config, ROWS, path)
+
+    workbook = openpyxl.load_workbook(path)
+    assert workbook.sheetnames == ['Sheet1', 'Sheet2']
+    worksheet = workbook['Sheet2']
+    if orientation == 'column_based':
+        assert [x.value for x in worksheet[3]] == [None, 'Date', 'Enum', 'Float', 'Integer', 'Text']
+        assert [x.value for x in worksheet[5][1:]] == list(ROWS[0].values())
+        assert worksheet['E7'].value == 30
+    else:
+        assert [x.value for x in worksheet['B']] == [None, None, 'Date', 'Enum', 'Float', 'Integer', 'Text']
+        assert [x.value for x in worksheet['E'][2:]] == list(ROWS[0].values())
+        assert worksheet['G6'].value == 30
+    data = plugin.excel_validation.read_excel(config, path)
+    assert list(data.keys()) == [5, 6, 7]
+    assert list(data.values()) == ROWS
+
+
+def test_write_excel_float_values(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('written.xlsx'))
+    values = [2.0, 1.1 + 2.2, 10.1 + 0.2, 1.2345678901234567, 300.0000000000001, 333.99999999999994]
+    plugin.excel_validation.write_excel(CONFIG_PATH, [dict(ROWS[0], Float=value) for value in values], path)
+    for engine in ('openpyxl', 'xml'):
+        data = plugin.excel_validation.read_excel(CONFIG_PATH, path, engine=engine)
+        # Whole floats stay floats and all digits are kept
+        assert [x['Float'] for x in data.values()] == values
+        assert all(type(x['Float']) is float for x in data.values())
+
+
+@pytest.mark.parametrize('config', [CONFIG_PATH, get_test_data_path('row_based.json', 'filtering')])
+def test_write_excel_invalid_value(empty_app, tmpdir, config):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('written.xlsx'))
+    with pytest.raises(ValueError):
+        plugin.excel_validation.write_excel(config, ROWS + [dict(ROWS[0], Float=object())], path)
+    assert not os.path.exists(path)
+
+
+def test_write_excel_number_formats(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('written.xlsx'))
+    plugin.excel_validation.write_excel(CONFIG_PATH, ROWS, path)
+    worksheet = openpyxl.load_workbook(path).active
+    assert [x.number_format for x in worksheet[2]] == ['yyyy-mm-dd h:mm:ss', '@', 'General', '0', '@']
+    assert worksheet['A1'].number_format == 'General'
+
+
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_write_excel_mixed_column(empty_app, tmpdir, orientation):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('written.xlsx'))
+    config = get_config(orientation=orientation)
+    config['data_type_config'].append({'header': 'Mixed', 'type': {'base': 'automatic'}})
+    values = [datetime.datetime(2017, 8, 20, 13, 45), 5, 2.5, datetime.datetime(2019, 1, 2), 'Text', 7]
+    plugin.excel_validation.write_excel(config, [dict(ROWS[0], Mixed=value) for value in values], path)
+    # The date format of a date does not stay for the next values of the column
+    assert [x['Mixed'] for x in plugin.excel_validation.read_excel(config, path).values()] == values
+
+
+def test_write_excel_inputs(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('column_based.json', 'filtering')
+    workbook_path = get_test_data_path('column_based.xlsx', 'filtering')
+    expected = list(plugin.excel_validation.read_excel(config_path, workbook_path).values())
+    path = str(tmpdir.join('written.xlsx'))
+    for rows in (plugin.excel_validation.iter_excel(config_path, workbook_path),
+                 plugin.excel_validation.read_excel(config_path, workbook_path, result_format='columnar'),
+                 plugin.excel_validation.read_excel(config_path, workbook_path, result_format='records'),
+                 iter(expected)):
+        plugin.excel_validation.write_excel(config_path, rows, path)
+        assert list(plugin.excel_validation.read_excel(config_path, path).values()) == expected
+
+
+@pytest.mark.parametrize('extension', ['csv', 'tsv'])
+def test_write_excel_csv(empty_app, tmpdir, extension):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('written.' + extension))
+    plugin.excel_validation.write_excel(get_config(sheet_config='name:Data'), ROWS, path)
+    with open(path, encoding='utf-8') as file_pointer:
+        assert file_pointer.readline().rstrip('\n') == ('\t' if extension == 'tsv' else ',').join(ROWS[0].keys())
+    assert list(plugin.excel_validation.read_excel(CONFIG_PATH, path).values()) == ROWS
+
+
+@pytest.mark.parametrize('path', ['written.xlsx', 'written.csv'])
+def test_write_excel_too_many_rows(empty_app, tmpdir, path):
+    plugin = EmptyPlugin(empty_app)
+    config = get_config()
+    config['data_index_config']['row_index']['last'] = 3
+    path = str(tmpdir.join(path))
+    with pytest.raises(ValueError):
+        plugin.excel_validation.write_excel(config, ROWS, path)
+    assert not os.path.exists(path)
+    assert plugin.excel_validation.write_excel(config, ROWS[:2], path) == 2
+    assert list(plugin.excel_validation.read_excel(config, path).values()) == ROWS[:2]
+
+
+def test_write_excel_csv_keeps_existing_file(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    path = tmpdir.join('written.csv')
+    path.write('Existing content\n')
+    config = get_config()
+    config['data_index_config']['row_index']['last'] = 3
+    with pytest.raises(ValueError):
+        plugin.excel_validation.write_excel(config, ROWS, str(path))
+    # The failed write only removes its temporary file
+    assert path.read() == 'Existing content\n'
+    assert tmpdir.listdir() == [path]
+
+
+def test_write_excel_csv_not_created(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    with pytest.raises(FileNotFoundError) as exc_info:
+        plugin.excel_validation.write_excel(CONFIG_PATH, ROWS, str(tmpdir.join('missing', 'written.csv')))
+    # Only the failed open is raised, no file is removed
+    assert exc_info.value.__context__ is None
+
+
+def test_write_excel_sheet_name(empty_app, tmpdir):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('written.xlsx'))
+    config = get_config(sheet_config='name:Validated data')
+    assert plugin.excel_validation.write_excel(config, [], path) == 0
+    workbook = openpyxl.load_workbook(path)
+    assert workbook.sheetnames == ['Validated data']
+    assert [x.value for x in workbook.active[1]] == list(ROWS[0].keys())
+    assert workbook.active.max_row == 1
@@ -0,0 +1,118 @@
+import datetime
+import json
+import re
+import zipfile
+
+import openpyxl
+import pytest
+
+from benchmarks.workbook_generator import generate_workbook
+from groundwork_spreadsheets.patterns.ExcelValidationPattern.xlsx_reader import XlsxWorkbook
+from tests.conftest import FIXTURES, EmptyPlugin, get_test_data_path, read_excel_variants
+
+ENGINES = [{'engine': 'openpyxl'}, {'engine': 'xml'}]
+
+
+@pytest.mark.parametrize('test_type, config, path', FIXTURES)
+def test_xml_engine_equals_openpyxl(empty_app, test_type, config, path):
+    plugin = EmptyPlugin(empty_app)
+    openpyxl_result, xml_result = read_excel_variants(plugin, get_test_data_path(config, test_type),
+                                                      get_test_data_path(path, test_type), ENGINES)
+    assert openpyxl_result == xml_result
+
+
+@pytest.mark.parametrize('test_type, config, path', FIXTURES)
+def test_xml_engine_equals_openpyxl_read_only(empty_app, test_type, config, path):
+    plugin = EmptyPlugin(empty_app)
+    openpyxl_result, xml_result = read_excel_variants(plugin, get_test_data_path(config, test_type),
+                                                      get_test_data_path(path, test_type), ENGINES, read_only=True)
+    assert openpyxl_result == xml_result
+
+
+@pytest.mark.parametrize('orientation', ['column_based', 'row_based'])
+def test_xml_engine_report(empty_app, tmpdir, orientation):
+    plugin = EmptyPlugin(empty_app)
+    path = str(tmpdir.join('generated.xlsx'))
+    config = generate_workbook(path, 200, 12, orientation, dirty_ratio=0.2)
+    reports = [plugin.excel_validation.validate_excel(config, path, engine=engine) for engine in ('openpyxl', 'xml')]
+    assert reports[0].error_count > 0
+    assert reports[0].data == reports[1].data
+    assert [(x.row, x.column, x.rule, x.value) for x in reports[0].errors] == \
+        [(x.row, x.column, x.rule, x.value) for x in reports[1].errors]
+
+
+def test_xml_engine_config_key(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    with open(get_test_data_path('config.json', 'data_types')) as file_pointer:
+        config = json.load(file_pointer)
+    config['engine'] = 'xml'
+    path = get_test_data_path('data_types_excel_2013.xlsx', 'data_types')
+    assert plugin.excel_validation.read_excel(config, path) == \
+        plugin.excel_validation.read_excel(config, path, engine='openpyxl')
+    assert plugin.excel_validation.excel_config['engine'] == 'xml'
+
+
+def test_xml_engine_unknown(empty_app):
+    plugin = EmptyPlugin(empty_app)
+    config_path = get_test_data_path('config.json', 'data_types')
+    path = get_test_data_path('data_types_excel_2013.xlsx', 'data_types')
+    with pytest.raises(ValueError):
+        plugin.excel_validation.read_excel(config_path, path, engine='lxml')
+    with pytest.raises(ValueError):
+        plugin.excel_validation.iter_excel(config_path, path, engine='lxml')
+
+
+def test_xml_engine_cell_values(tmpdir):
+    path = str(tmpdir.join('values.xlsx'))
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = 'Values'
+    worksheet.append(['text', 1, 2.5, True, datetime.datetime(2017, 8, 20, 13, 45), datetime.time(6, 30)])
+    worksheet['B3'] = 'after an empty row'
+    worksheet['C3'] = '=1/0'
+    worksheet['E3'] = datetime.timedelta(hours=30)
+    workbook.create_sheet('Other')
+    workbook.save(path)
+
+    expected = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    xml_workbook = XlsxWorkbook(path)
+    try:
+        assert xml_workbook.sheetnames == expected.sheetnames
+        assert xml_workbook.active.title == 'Values'
+        assert (xml_workbook['Values'].max_row, xml_workbook['Values'].max_column) == (3, 6)
+        for kwargs in ({}, {'max_col': 8}, {'min_row': 2, 'min_col': 2, 'max_col': 3}, {'max_row': 2}):
+            assert list(xml_workbook['Values'].iter_rows(**kwargs)) == \
+                list(expected['Values'].iter_rows(values_only=True, **kwargs))
+        assert list(xml_workbook['Values'].iter_rows(min_row=3, max_col=2)) == [(None, 'after an empty row')]
+        with pytest.raises(KeyError):
+            xml_workbook['Missing']
+    finally:
+        xml_workbook.close()
+        expected.close()
+
+
+@pytest.mark.parametrize('references', [True, False])
+def test_xml_engine_calculate_dimension(tmpdir, references):
+    path = str(tmpdir.join('dimension.xlsx'))
+    workbook = openpyxl.Workbook()
+    workbook.active.append(['a', 'b'])
+    workbook.active['C4'] = 1
+    workbook.save(path)
+
+    # Remove the stored dimension and optionally the cell references
+    stripped_path = str(tmpdir.join('stripped.xlsx'))
+    with zipfile.ZipFile(path) as source, zipfile.ZipFile(stripped_path, 'w') as target:
+        for name in source.namelist():
+            data = source.read(name)
+            if name == 'xl/worksheets/sheet1.xml':
+                data = re.sub(br'<dimension [^>]*/>', b'', data)
+                if not references:
+                    data = re.sub(br' r="[A-Z]+\d+"', b'', data)
+            target.writestr(name, data)
+    xml_workbook = XlsxWorkbook(stripped_path)
+    try:
+        assert xml_workbook.active.max_row is None
+        assert xml_workbook.active.calculate_dimension() == ('A1:C4' if references else 'A1:B4')
+        assert (xml_workbook.active.max_row, xml_workbook.active.max_column) == ((4, 3) if references else (4, 2))
+    finally:
+        xml_workbook.close()